@@ -1,6 +1,19 @@
 import { useState, useEffect, useRef } from 'react'
 import './App.css'
 
+// One recognition session per browser tab, kept across reloads
+const getSessionId = () => {
+  let id = sessionStorage.getItem('voxoraSession')
+  if (!id) {
+    id = Math.random().toString(36).slice(2) + Date.now().toString(36)
+    sessionStorage.setItem('voxoraSession', id)
+  }
+  return id
+}
+
+const SESSION_ID = getSessionId()
+const api = (path) => `http://localhost:5000${path}?session=${SESSION_ID}`
+
 function App() {
   const videoRef = useRef(null)
   const [currentWord, setCurrentWord] = useState('')
@@ -44,28 +57,28 @@ function App() {
     }
   }, [isProduction])
 
-  // Update text from backend (only on localhost)
+  // Text updates pushed by the backend (only on localhost)
+  // EventSource reconnects on its own and resumes from the last event ID
   useEffect(() => {
     if (isProduction) return
 
-    const interval = setInterval(async () => {
-      try {
-        const response = await fetch('http://localhost:5000/get_text')
-        const data = await response.json()
-        setCurrentWord(data.word || '')
-        setCurrentSentence(data.sentence || '')
-      } catch (error) {
-        console.error('Error fetching text:', error)
-      }
-    }, 300)
+    const events = new EventSource(api('/text_events'))
+    events.addEventListener('text', (event) => {
+      const data = JSON.parse(event.data)
+      setCurrentWord(data.word || '')
+      setCurrentSentence(data.sentence || '')
+    })
+    events.onerror = () => {
+      console.error('Text stream disconnected, reconnecting...')
+    }
 
-    return () => clearInterval(interval)
+    return () => events.close()
   }, [isProduction])
 
   const addSpace = async () => {
     if (isProduction) return
     try {
-      await fetch('http://localhost:5000/add_space', { method: 'POST' })
+      await fetch(api('/add_space'), { method: 'POST' })
     } catch (error) {
       console.error('Error:', error)
     }
@@ -74,7 +87,7 @@ function App() {
   const deleteLetter = async () => {
     if (isProduction) return
     try {
-      await fetch('http://localhost:5000/delete_letter', { method: 'POST' })
+      await fetch(api('/delete_letter'), { method: 'POST' })
     } catch (error) {
       console.error('Error:', error)
     }
@@ -84,7 +97,7 @@ function App() {
     if (isProduction) return
     setIsLoading(true)
     try {
-      const response = await fetch('http://localhost:5000/correct', { method: 'POST' })
+      const response = await fetch(api('/correct'), { method: 'POST' })
       const data = await response.json()
       if (data.corrected) {
         setCorrectedText(data)
@@ -102,7 +115,7 @@ function App() {
     if (isProduction) return
     if (window.confirm('Reset all text?')) {
       try {
-        await fetch('http://localhost:5000/reset', { method: 'POST' })
+        await fetch(api('/reset'), { method: 'POST' })
         setCorrectedText(null)
       } catch (error) {
         console.error('Error:', error)
@@ -226,7 +239,7 @@ function App() {
               </>
             ) : (
               <img 
-                src="http://localhost:5000/video_feed" 
+                src={api('/video_feed')} 
                 alt="Video Stream" 
                 className="video-feed"
               />
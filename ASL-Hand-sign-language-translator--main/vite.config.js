@@ -8,7 +8,10 @@ export default defineConfig({
     port: 3000,
     proxy: {
       '/video_feed': 'http://localhost:5000',
+      '/landmark_feed': 'http://localhost:5000',
       '/get_text': 'http://localhost:5000',
+      '/text_events': 'http://localhost:5000',
+      '/classify': 'http://localhost:5000',
       '/reset': 'http://localhost:5000',
       '/correct': 'http://localhost:5000',
       '/add_space': 'http://localhost:5000',
@@ -0,0 +1,180 @@
+"""
+Voxora.AI - Batch Classification Module
+Decoding and one-call classification of landmark batches sent by clients
+that run hand tracking themselves (POST /classify)
+"""
+
+import json
+import os
+import time
+import numpy as np
+from config import NUM_LANDMARKS, LANDMARK_DIMS
+
+LANDMARK_SIZE = NUM_LANDMARKS * LANDMARK_DIMS
+MAX_BATCH = 256
+MIN_FRAME_GAP = 1e-3  # seconds between frames forced apart by FrameClock
+
+
+def decode_landmark_batch(body, content_type):
+    """(frames (N, 63) float32 with NaN rows for "no hand", timestamps or None).
+
+    application/octet-stream: little-endian float32, 63 values per frame.
+    application/json: {"landmarks": [[63 floats] | null, ...], "timestamps": [...]},
+    timestamps in seconds (e.g. performance.now() / 1000), one per frame.
+    Raises ValueError for malformed or oversized batches.
+    """
+    timestamps = None
+    if content_type and content_type.startswith('application/octet-stream'):
+        if len(body) % (LANDMARK_SIZE * 4):
+            raise ValueError(f"Binary body must hold a multiple of {LANDMARK_SIZE} float32 values")
+        frames = np.frombuffer(body, dtype='<f4').reshape(-1, LANDMARK_SIZE).astype(np.float32)
+    else:
+        try:
+            payload = json.loads(body)
+        except (TypeError, ValueError):
+            raise ValueError("Body must be JSON or application/octet-stream float32")
+        rows = payload.get('landmarks') if isinstance(payload, dict) else payload
+        if not isinstance(rows, list):
+            raise ValueError("JSON body needs a 'landmarks' list")
+        frames = np.full((len(rows), LANDMARK_SIZE), np.nan, dtype=np.float32)
+        for i, row in enumerate(rows):
+            if row is None:
+                continue
+            try:
+                values = np.asarray(row, dtype=np.float32).reshape(-1)
+            except (TypeError, ValueError):
+                raise ValueError(f"Frame {i} must be a list of numbers or null")
+            if values.size != LANDMARK_SIZE:
+                raise ValueError(f"Frame {i} has {values.size} values, expected {LANDMARK_SIZE}")
+            frames[i] = values
+        if isinstance(payload, dict) and payload.get('timestamps') is not None:
+            try:
+                timestamps = np.asarray(payload['timestamps'], dtype=np.float64)
+            except (TypeError, ValueError):
+                raise ValueError("'timestamps' must be a list of numbers")
+            if timestamps.shape != (len(frames),):
+                raise ValueError("'timestamps' must have one entry per frame")
+            if not np.isfinite(timestamps).all():
+                raise ValueError("'timestamps' must be finite")
+
+    if len(frames) == 0:
+        raise ValueError("Empty batch")
+    if len(frames) > MAX_BATCH:
+        raise ValueError(f"Batch of {len(frames)} frames exceeds the limit of {MAX_BATCH}")
+    return frames, timestamps
+
+
+def classify_frames(serving, frames):
+    """(probabilities (N, classes), hand mask) with one model call for the whole batch.
+
+    Rows without a hand are not sent to the model and get all-zero
+    probabilities.
+    """
+    hand = ~np.isnan(frames).any(axis=1)
+    if hand.any():
+        landmarks = frames[hand]
+        predicted = np.asarray(serving.classifier.predict(landmarks, verbose=0))
+        if serving.confusion_resolver is not None:
+            predicted = serving.confusion_resolver.resolve_batch(predicted, landmarks)
+        probabilities = np.zeros((len(frames), predicted.shape[1]), dtype=np.float32)
+        probabilities[hand] = predicted
+    else:
+        probabilities = np.zeros((len(frames), len(serving.class_mapping) or 1), dtype=np.float32)
+    return probabilities, hand
+
+
+class FrameClock:
+    """Letter-clock times for one session's /classify frames.
+
+    Client timestamps (e.g. performance.now() / 1000) have their own epoch;
+    they are moved onto time.time(), the clock /video_feed frames use, by
+    an offset taken from the first timestamped batch and taken again when
+    the client clock jumps back (a page reload). Batches without timestamps
+    are spaced at fps, ending now. Either way the times are strictly
+    increasing and later than after, the session's last frame, so
+    consecutive batches never overlap.
+    """
+
+    def __init__(self):
+        self.offset = None
+        self._last_timestamp = None
+
+    def times(self, count, timestamps=None, fps=30.0, after=None, now=None):
+        now = time.time() if now is None else now
+        if timestamps is not None:
+            if self.offset is None or timestamps[0] <= self._last_timestamp:
+                self.offset = now - timestamps[-1]
+            self._last_timestamp = timestamps[-1]
+            times = timestamps + self.offset
+        else:
+            times = now - (count - 1 - np.arange(count)) / fps
+
+        # t[i] = max(t[i], t[i-1] + gap) with t[-1] = after
+        steps = np.arange(count) * MIN_FRAME_GAP
+        floor = -np.inf if after is None else after + MIN_FRAME_GAP
+        return np.maximum.accumulate(np.maximum(times - steps, floor)) + steps
+
+
+def stabilize_batch(session, probabilities, hand, class_mapping, times):
+    """Feed the batch through a RecognitionSession; per-frame letters"""
+    letters = []
+    class_idx = probabilities.argmax(axis=1)
+    for i in range(len(probabilities)):
+        if hand[i]:
+            predicted_class = class_mapping.get(str(class_idx[i]), f"Unknown_{class_idx[i]}")
+            state = session.update(predicted_class, float(probabilities[i, class_idx[i]]), now=float(times[i]),
+                                   probabilities=probabilities[i], class_mapping=class_mapping)
+        else:
+            state = session.update(None, 0.0, now=float(times[i]))
+        letters.append(state['pred'])
+    return letters
+
+
+def main():
+    """Server-side latency and throughput of /classify for batch sizes 1-256"""
+    import argparse
+    from numpy_inference import load_classifier
+    from model_registry import ServingModel
+    from recognition_session import RecognitionSession
+
+    parser = argparse.ArgumentParser(description="/classify latency vs batch size")
+    parser.add_argument('--model', default=os.path.join('models', 'signity_custom_model.h5'))
+    parser.add_argument('--class-mapping', default=os.path.join('models', 'custom_class_mapping.json'))
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 4, 16, 64, 128, 256])
+    parser.add_argument('--runs', type=int, default=200)
+    args = parser.parse_args()
+
+    with open(args.class_mapping, 'r') as f:
+        class_mapping = json.load(f)['model_to_class']
+    serving = ServingModel(load_classifier(args.model), class_mapping)
+    rng = np.random.default_rng(0)
+
+    print("\n" + "="*70)
+    print("  /classify BATCH LATENCY (decode + model + stabilization, binary body)")
+    print("="*70)
+    print(f"\n{'Batch':<8} {'p50':>10} {'p95':>10} {'per frame':>11} {'frames/s':>11}")
+    print("-" * 54)
+
+    for batch_size in args.batch_sizes:
+        body = rng.random((batch_size, LANDMARK_SIZE), dtype=np.float32).astype('<f4').tobytes()
+        session = RecognitionSession('benchmark')
+        clock = FrameClock()
+        latencies = []
+        for run in range(args.runs + 5):
+            start = time.perf_counter()
+            frames, timestamps = decode_landmark_batch(body, 'application/octet-stream')
+            probabilities, hand = classify_frames(serving, frames)
+            times = clock.times(len(frames), timestamps, after=session.last_time)
+            stabilize_batch(session, probabilities, hand, class_mapping, times)
+            if run >= 5:  # warm-up
+                latencies.append((time.perf_counter() - start) * 1000)
+        p50 = np.percentile(latencies, 50)
+        print(f"{batch_size:<8} {p50:>8.3f}ms {np.percentile(latencies, 95):>8.3f}ms "
+              f"{p50 / batch_size * 1000:>9.1f}µs {batch_size / p50 * 1000:>11.0f}")
+
+    print("\n   HTTP framing adds roughly a constant per request on top of these numbers")
+    print("="*70)
+
+
+if __name__ == "__main__":
+    main()
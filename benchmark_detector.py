@@ -0,0 +1,109 @@
+"""
+Voxora.AI - Detector Benchmark
+Detection latency and landmark agreement of the HandDetector modes on a
+recorded video or image directory
+"""
+
+import os
+import time
+import numpy as np
+from frame_sources import open_source
+from hand_detector import HandDetector
+
+DETECTOR_MODES = {
+    'full-frame': lambda: HandDetector(),
+    'reinit-100': lambda: HandDetector(reinit_interval=100),  # the old periodic rebuild
+    'roi-tracking': lambda: HandDetector(tracking=True),
+    'skip-2': lambda: HandDetector(skip_frames=2),
+    'skip-4': lambda: HandDetector(skip_frames=4),
+    'roi+skip-2': lambda: HandDetector(tracking=True, skip_frames=2),
+}
+
+
+def run_detector(detector, source_spec, max_frames):
+    """Per-frame latency (ms), CPU ms per frame and landmarks (None when no hand)"""
+    import cv2
+
+    source = open_source(source_spec, realtime=False)
+    latencies = []
+    results = []
+    cpu_start = time.process_time()
+    try:
+        for frame in source:
+            frame = cv2.flip(frame, 1)
+            start = time.perf_counter()
+            _, landmarks, _ = detector.detect_hand(frame)
+            latencies.append((time.perf_counter() - start) * 1000)
+            results.append(None if landmarks is None else landmarks.copy())  # detector reuses its buffers
+            if len(results) >= max_frames:
+                break
+    finally:
+        source.release()
+    # Includes MediaPipe's worker threads, and frame decoding (same for every mode)
+    cpu_ms = (time.process_time() - cpu_start) * 1000 / max(len(results), 1)
+    return np.asarray(latencies), cpu_ms, results
+
+
+def landmark_agreement(reference, results, width=640):
+    """(fraction of frames with the same hand/no-hand, mean landmark offset in pixels)"""
+    same = [(a is None) == (b is None) for a, b in zip(reference, results)]
+    offsets = [np.abs(a.reshape(-1, 3)[:, :2] - b.reshape(-1, 3)[:, :2]).mean() * width
+               for a, b in zip(reference, results) if a is not None and b is not None]
+    return float(np.mean(same)), float(np.mean(offsets)) if offsets else 0.0
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="HandDetector mode latency report")
+    parser.add_argument('source', help="Video file or image directory")
+    parser.add_argument('--modes', nargs='+', default=list(DETECTOR_MODES), choices=list(DETECTOR_MODES))
+    parser.add_argument('--frames', type=int, default=300)
+    parser.add_argument('--trace', default=None, help="Write per-frame latencies of every mode to this CSV")
+    args = parser.parse_args()
+
+    print("\n" + "="*70)
+    print(f"  DETECTOR BENCHMARK - {os.path.basename(args.source)}")
+    print("="*70)
+    print(f"\n{'Mode':<16} {'mean':>9} {'p95':>9} {'max':>9} {'spikes':>7} {'CPU/frame':>10} "
+          f"{'hands':>7} {'agree':>7} {'drift':>8}")
+    print("-" * 90)
+
+    reference = None
+    traces = {}
+    for mode in args.modes:
+        detector = DETECTOR_MODES[mode]()
+        try:
+            latencies, cpu_ms, results = run_detector(detector, args.source, args.frames)
+        finally:
+            detector.close()
+        if reference is None:
+            reference = results
+        agree, offset = landmark_agreement(reference, results)
+        hands = sum(r is not None for r in results)
+        # The first frame builds the detector in every mode; spikes are counted after it
+        steady = latencies[1:] if len(latencies) > 1 else latencies
+        spikes = int(np.sum(steady > 3 * np.median(steady)))
+        traces[mode] = latencies
+        print(f"{mode:<16} {latencies.mean():>7.2f}ms {np.percentile(latencies, 95):>7.2f}ms "
+              f"{steady.max():>7.1f}ms {spikes:>7} {cpu_ms:>8.2f}ms {hands:>7} {agree*100:>6.1f}% {offset:>6.1f}px")
+        if detector.tracking or detector.skip_frames:
+            print(f"{'':<16} {detector.stats()}")
+
+    print("\n   spikes = frames slower than 3x the median (first frame excluded)")
+    print("   agree = same hand/no-hand decision, drift = mean landmark offset,")
+    print(f"   both relative to the first mode ({args.modes[0]})")
+
+    if args.trace:
+        length = max(len(trace) for trace in traces.values())
+        with open(args.trace, 'w') as f:
+            f.write('frame,' + ','.join(traces) + '\n')
+            for i in range(length):
+                f.write(f"{i}," + ','.join(f"{trace[i]:.3f}" if i < len(trace) else ''
+                                           for trace in traces.values()) + '\n')
+        print(f"\n💾 Latency trace saved: {args.trace}")
+    print("="*70)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Voxora.AI - Cascade Classifier Module
+Runs a tiny MLP on every frame and escalates to the heavy CNN only when
+the MLP is not confident enough
+"""
+
+import os
+import time
+import numpy as np
+
+
+class CascadeClassifier:
+    """Two-stage classifier with a keras-like predict().
+
+    Rows where the fast model's max probability clears the margin keep the
+    fast prediction; the rest are re-run through the heavy model.
+    """
+
+    def __init__(self, fast_model, heavy_model, margin=0.9):
+        self.fast_model = fast_model
+        self.heavy_model = heavy_model
+        self.margin = margin
+
+        # Stats
+        self.frames = 0
+        self.escalated = 0
+
+    def predict(self, x, verbose=0, batch_size=None):
+        x = np.asarray(x, dtype=np.float32)
+        if x.ndim == 1:
+            x = x[None]
+
+        probabilities = np.array(self.fast_model.predict(x, verbose=0), dtype=np.float32)
+        uncertain = probabilities.max(axis=1) < self.margin
+        if uncertain.any():
+            probabilities[uncertain] = self.heavy_model.predict(x[uncertain], verbose=0)
+
+        self.frames += len(x)
+        self.escalated += int(uncertain.sum())
+        return probabilities
+
+    def stats(self):
+        return {
+            'margin': self.margin,
+            'frames': self.frames,
+            'escalated': self.escalated,
+            'escalation_rate': self.escalated / self.frames if self.frames else 0.0
+        }
+
+
+def output_size(model, input_size):
+    """Number of classes a model predicts, from one probe row"""
+    probe = np.zeros((1, input_size), dtype=np.float32)
+    return np.asarray(model.predict(probe, verbose=0)).shape[-1]
+
+
+def check_cascade(fast_model, heavy_model, fast_mapping, heavy_mapping, input_size):
+    """Raise ValueError unless both stages predict the same classes in the same order"""
+    fast_classes = output_size(fast_model, input_size)
+    heavy_classes = output_size(heavy_model, input_size)
+    if fast_classes != heavy_classes:
+        raise ValueError(f"Fast model has {fast_classes} classes, heavy model {heavy_classes}")
+    if fast_mapping != heavy_mapping:
+        raise ValueError("Fast and heavy models use different class mappings")
+    if len(heavy_mapping) != heavy_classes:
+        raise ValueError(f"Class mapping has {len(heavy_mapping)} classes, models {heavy_classes}")
+
+
+def _per_frame_ms(predict, samples):
+    """Mean latency of single-frame calls over samples"""
+    start = time.perf_counter()
+    for sample in samples:
+        predict(sample[None])
+    return (time.perf_counter() - start) * 1000 / len(samples)
+
+
+def evaluate_cascade(fast_model, heavy_model, x, y, margins=(0.8, 0.9, 0.95, 0.99), latency_samples=200):
+    """Escalation rate, mean per-frame latency and accuracy vs the heavy model alone"""
+    x = np.asarray(x, dtype=np.float32)
+    timing_set = x[:latency_samples]
+
+    heavy_accuracy = float(np.mean(heavy_model.predict(x, verbose=0).argmax(axis=1) == y))
+    heavy_ms = _per_frame_ms(lambda s: heavy_model.predict(s, verbose=0), timing_set)
+
+    results = [{'mode': 'heavy only', 'margin': None, 'escalation_rate': 1.0,
+                'accuracy': heavy_accuracy, 'latency_ms': heavy_ms}]
+    for margin in margins:
+        cascade = CascadeClassifier(fast_model, heavy_model, margin)
+        accuracy = float(np.mean(cascade.predict(x).argmax(axis=1) == y))
+        escalation_rate = cascade.stats()['escalation_rate']
+        latency_ms = _per_frame_ms(cascade.predict, timing_set)
+        results.append({'mode': 'cascade', 'margin': margin, 'escalation_rate': escalation_rate,
+                        'accuracy': accuracy, 'latency_ms': latency_ms})
+    return results
+
+
+def print_cascade_report(results):
+    print(f"\n{'Mode':<12} {'Margin':>7} {'Escalated':>10} {'Accuracy':>9} {'Latency':>10}")
+    print("-" * 52)
+    for row in results:
+        margin = f"{row['margin']:.2f}" if row['margin'] is not None else "-"
+        print(f"{row['mode']:<12} {margin:>7} {row['escalation_rate']*100:>9.1f}% "
+              f"{row['accuracy']*100:>8.2f}% {row['latency_ms']:>8.3f}ms")
+
+
+def main():
+    """Evaluate a trained fast/heavy pair on the custom dataset"""
+    import argparse
+    from numpy_inference import load_classifier
+    from train_custom_model import CustomModelTrainer
+
+    parser = argparse.ArgumentParser(description="Cascade classifier evaluation")
+    parser.add_argument('--fast', default=os.path.join('models', 'signity_fast_model.h5'))
+    parser.add_argument('--heavy', default=os.path.join('models', 'signity_custom_model.h5'))
+    parser.add_argument('--margins', type=float, nargs='+', default=[0.8, 0.9, 0.95, 0.99])
+    args = parser.parse_args()
+
+    sequences, labels = CustomModelTrainer().load_custom_dataset()
+    if len(sequences) == 0:
+        print("\n❌ No data found! Run create_custom_dataset.py first")
+        return
+
+    fast_model = load_classifier(args.fast)
+    heavy_model = load_classifier(args.heavy)
+
+    print("\n" + "="*70)
+    print("  CASCADE EVALUATION")
+    print("="*70)
+    print_cascade_report(evaluate_cascade(fast_model, heavy_model, sequences, labels, args.margins))
+    print("="*70)
+
+
+if __name__ == "__main__":
+    main()
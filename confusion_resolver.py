@@ -0,0 +1,249 @@
+"""
+Voxora.AI - Confusion Resolver Module
+Second-stage O/C, E/S and N/M pair classifiers applied only when the main
+model's top-2 classes form a known confusable pair
+"""
+
+import os
+import json
+import numpy as np
+
+CONFUSION_DIR = 'confusion_correction'
+PICKLE_PATH = os.path.join(CONFUSION_DIR, 'confusion_classifiers.pkl')
+FORESTS_PATH = os.path.join(CONFUSION_DIR, 'confusion_forests.npz')
+
+
+class PairForest:
+    """Vectorized evaluation of a flattened random forest.
+
+    All trees are padded to the same node count so one array lookup per
+    depth level advances every (sample, tree) pair at once.
+    """
+
+    def __init__(self, left, right, feature, threshold, value, classes, max_depth):
+        self.left = left            # (trees, nodes) int32, -1 at leaves
+        self.right = right
+        self.feature = feature      # (trees, nodes) int32
+        self.threshold = threshold  # (trees, nodes) float32
+        self.value = value          # (trees, nodes, classes) float32 leaf probabilities
+        self.classes = list(classes)
+        self.max_depth = int(max_depth)
+        self._tree_idx = np.arange(left.shape[0])[None, :]
+
+    def predict_proba(self, x):
+        x = np.asarray(x, dtype=np.float32)
+        if x.ndim == 1:
+            x = x[None]
+        n = x.shape[0]
+        sample_idx = np.arange(n)[:, None]
+        node = np.zeros((n, self.left.shape[0]), dtype=np.int32)
+
+        for _ in range(self.max_depth):
+            left = self.left[self._tree_idx, node]
+            is_leaf = left < 0
+            if is_leaf.all():
+                break
+            feature = self.feature[self._tree_idx, node]
+            go_left = x[sample_idx, feature] <= self.threshold[self._tree_idx, node]
+            node = np.where(is_leaf, node, np.where(go_left, left, self.right[self._tree_idx, node]))
+
+        return self.value[self._tree_idx, node].mean(axis=1)
+
+
+def convert_pickle(pickle_path=PICKLE_PATH, output_path=FORESTS_PATH):
+    """Flatten the sklearn pair forests into a compact .npz (needs sklearn once)"""
+    import pickle
+
+    with open(pickle_path, 'rb') as f:
+        pairs = pickle.load(f)
+
+    arrays = {}
+    meta = {}
+    for name, entry in pairs.items():
+        forest = entry['classifier']
+        trees = [estimator.tree_ for estimator in forest.estimators_]
+        max_nodes = max(tree.node_count for tree in trees)
+        n_classes = len(forest.classes_)
+
+        left = np.full((len(trees), max_nodes), -1, dtype=np.int32)
+        right = np.full((len(trees), max_nodes), -1, dtype=np.int32)
+        feature = np.zeros((len(trees), max_nodes), dtype=np.int32)
+        threshold = np.zeros((len(trees), max_nodes), dtype=np.float32)
+        value = np.zeros((len(trees), max_nodes, n_classes), dtype=np.float32)
+
+        for t, tree in enumerate(trees):
+            count = tree.node_count
+            left[t, :count] = tree.children_left
+            right[t, :count] = tree.children_right
+            feature[t, :count] = np.maximum(tree.feature, 0)
+            threshold[t, :count] = tree.threshold
+            node_values = tree.value[:, 0, :]
+            value[t, :count] = node_values / np.maximum(node_values.sum(axis=1, keepdims=True), 1e-12)
+
+        for key, array in (('left', left), ('right', right), ('feature', feature),
+                           ('threshold', threshold), ('value', value)):
+            arrays[f"{name}_{key}"] = array
+        meta[name] = {
+            'letters': list(entry.get('letters', [])),
+            'classes': [str(c) for c in forest.classes_],
+            'max_depth': int(max(tree.max_depth for tree in trees)) + 1,
+            'accuracy': float(entry.get('accuracy', 0.0))
+        }
+
+    np.savez_compressed(output_path, meta=np.array(json.dumps(meta)), **arrays)
+    return output_path
+
+
+def load_forests(forests_path=FORESTS_PATH):
+    """name -> (PairForest, metadata) from the compact .npz"""
+    forests = {}
+    with np.load(forests_path, allow_pickle=False) as data:
+        meta = json.loads(str(data['meta']))
+        for name, info in meta.items():
+            forests[name] = (PairForest(
+                data[f"{name}_left"], data[f"{name}_right"], data[f"{name}_feature"],
+                data[f"{name}_threshold"], data[f"{name}_value"],
+                info['classes'], info['max_depth']
+            ), info)
+    return forests
+
+
+class ConfusionResolver:
+    """Re-splits the probability mass of a confusable top-2 pair.
+
+    When the top-2 classes are e.g. O and C, their combined probability is
+    redistributed according to the dedicated O/C classifier. Frames whose
+    top-2 is not a known pair only pay for an argpartition and a dict lookup.
+    """
+
+    def __init__(self, forests, class_mapping):
+        class_to_idx = {name: int(idx) for idx, name in class_mapping.items()}
+        self._pairs = {}
+        for name, (forest, info) in forests.items():
+            indices = [class_to_idx.get(letter) for letter in forest.classes]
+            if None in indices:
+                continue
+            self._pairs[frozenset(indices)] = (name, forest, np.array(indices))
+
+        # Stats
+        self.frames = 0
+        self.fired = 0
+        self.changed = 0
+
+    @classmethod
+    def from_files(cls, class_mapping, forests_path=FORESTS_PATH, pickle_path=PICKLE_PATH):
+        """Load the compact forests, converting the pickle on first use"""
+        if not os.path.exists(forests_path):
+            if not os.path.exists(pickle_path):
+                return None
+            convert_pickle(pickle_path, forests_path)
+            print(f"💾 Pair classifiers converted: {forests_path}")
+        return cls(load_forests(forests_path), class_mapping)
+
+    @property
+    def pairs(self):
+        return [name for name, _, _ in self._pairs.values()]
+
+    def resolve(self, probabilities, landmarks):
+        """Single-frame resolve; returns a (possibly new) probability vector"""
+        self.frames += 1
+        top2 = np.argpartition(probabilities, -2)[-2:]
+        entry = self._pairs.get(frozenset(top2.tolist()))
+        if entry is None:
+            return probabilities
+
+        _, forest, indices = entry
+        self.fired += 1
+        pair_probs = forest.predict_proba(landmarks)[0]
+        resolved = np.array(probabilities, copy=True)
+        mass = resolved[indices].sum()
+        resolved[indices] = mass * pair_probs
+        if np.argmax(resolved) != np.argmax(probabilities):
+            self.changed += 1
+        return resolved
+
+    def resolve_batch(self, probabilities, landmarks):
+        """Vectorized resolve for a batch of frames"""
+        resolved = np.array(probabilities, copy=True)
+        top2 = np.sort(np.argpartition(resolved, -2, axis=1)[:, -2:], axis=1)
+        self.frames += len(resolved)
+
+        for pair, (_, forest, indices) in self._pairs.items():
+            low, high = sorted(pair)
+            mask = (top2[:, 0] == low) & (top2[:, 1] == high)
+            if not mask.any():
+                continue
+            self.fired += int(mask.sum())
+            pair_probs = forest.predict_proba(landmarks[mask])
+            mass = resolved[mask][:, indices].sum(axis=1, keepdims=True)
+            before = resolved[mask].argmax(axis=1)
+            rows = resolved[mask]
+            rows[:, indices] = mass * pair_probs
+            resolved[mask] = rows
+            self.changed += int(np.sum(rows.argmax(axis=1) != before))
+        return resolved
+
+    def stats(self):
+        return {
+            'pairs': self.pairs,
+            'frames': self.frames,
+            'fired': self.fired,
+            'changed': self.changed,
+            'fire_ratio': self.fired / self.frames if self.frames else 0.0
+        }
+
+
+def main():
+    """Accuracy with and without the second stage on the calibration set"""
+    import argparse
+    from numpy_inference import load_classifier
+    from quantize_model import load_calibration_data
+
+    parser = argparse.ArgumentParser(description="Evaluate the confusion resolver")
+    parser.add_argument('--model', default=os.path.join('models', 'signity_model.h5'))
+    parser.add_argument('--mapping', default=os.path.join('processed_data', 'class_mapping.json'))
+    parser.add_argument('--max-samples', type=int, default=None)
+    args = parser.parse_args()
+
+    with open(args.mapping, 'r') as f:
+        mapping = json.load(f)
+    class_mapping = mapping['model_to_class']
+
+    resolver = ConfusionResolver.from_files(class_mapping)
+    if resolver is None:
+        print(f"❌ No pair classifiers found in {CONFUSION_DIR}")
+        return
+
+    model = load_classifier(args.model)
+    sequences, labels, label_mapping = load_calibration_data(args.max_samples)
+    if label_mapping and label_mapping != class_mapping:
+        print(f"⚠️  Calibration labels use a different class mapping than {args.mapping}")
+
+    probabilities = model.predict(sequences, verbose=0)
+    resolved = resolver.resolve_batch(probabilities, sequences)
+
+    before = probabilities.argmax(axis=1) == labels
+    after = resolved.argmax(axis=1) == labels
+
+    print("\n" + "="*70)
+    print("  CONFUSION RESOLVER - CALIBRATION SET")
+    print("="*70)
+    print(f"\n{'Pair':<8} {'Samples':>8} {'Before':>9} {'After':>9}")
+    print("-" * 37)
+    class_to_idx = {name: int(idx) for idx, name in class_mapping.items()}
+    for name in resolver.pairs:
+        letters = name.split('_')
+        mask = np.isin(labels, [class_to_idx[l] for l in letters if l in class_to_idx])
+        if mask.any():
+            print(f"{name:<8} {int(mask.sum()):>8} {before[mask].mean()*100:>8.2f}% {after[mask].mean()*100:>8.2f}%")
+
+    print("-" * 37)
+    print(f"{'Overall':<8} {len(labels):>8} {before.mean()*100:>8.2f}% {after.mean()*100:>8.2f}%")
+    stats = resolver.stats()
+    print(f"\n🔀 Second stage fired on {stats['fire_ratio']*100:.1f}% of frames, "
+          f"changed the top-1 class on {stats['changed']}")
+    print("="*70)
+
+
+if __name__ == "__main__":
+    main()
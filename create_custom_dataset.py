@@ -10,10 +10,12 @@ import time
 from datetime import datetime
 import shutil
 from hand_detector import HandDetector
+from frame_sources import open_source
 
 class CustomDatasetCreator:
     def __init__(self):
         self.hand_detector = HandDetector()
+        self.frame_source = 'camera:0'  # or a video file / image directory to collect from
         
         # Dataset configuration
         self.base_dir = "my_custom_dataset"
@@ -98,9 +100,7 @@ class CustomDatasetCreator:
         
         input("Press ENTER when ready to start...")
         
-        cap = cv2.VideoCapture(0)
-        cap.set(cv2.CAP_PROP_FRAME_WIDTH, 1280)
-        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 720)
+        cap = open_source(self.frame_source, width=1280, height=720)
         
         samples_collected = 0
         last_capture_time = 0
@@ -0,0 +1,363 @@
+"""
+Voxora.AI - Detector Worker Pool
+Runs HandDetector in separate processes so hand detection for several
+streams (or a fast offline job) uses all cores. Frames travel through a
+shared-memory ring of slots instead of being pickled; workers write the
+landmarks back into shared memory and only send slot numbers over queues.
+"""
+
+import os
+import time
+import threading
+import multiprocessing as mp
+from multiprocessing import shared_memory
+import numpy as np
+import cv2
+from config import NUM_LANDMARKS, LANDMARK_DIMS
+
+LANDMARK_SIZE = NUM_LANDMARKS * LANDMARK_DIMS
+
+
+def _worker_main(worker_id, frame_name, landmark_name, slots, frame_shape, tasks, results, detector_kwargs):
+    """Worker process: one HandDetector, frames read and annotated in place"""
+    from hand_detector import HandDetector
+
+    frame_shm = shared_memory.SharedMemory(name=frame_name)
+    landmark_shm = shared_memory.SharedMemory(name=landmark_name)
+    frames = np.ndarray((slots,) + frame_shape, dtype=np.uint8, buffer=frame_shm.buf)
+    landmarks_out = np.ndarray((slots, LANDMARK_SIZE + 1), dtype=np.float64, buffer=landmark_shm.buf)
+    detector = HandDetector(**detector_kwargs)
+    results.put(('ready', worker_id))
+
+    try:
+        while True:
+            task = tasks.get()
+            if task is None:
+                break
+            slot, h, w, ticket = task
+            try:
+                _, landmarks, hand_present = detector.detect_hand(frames[slot, :h, :w])
+                if hand_present:
+                    landmarks_out[slot, :LANDMARK_SIZE] = landmarks
+                landmarks_out[slot, LANDMARK_SIZE] = 1.0 if hand_present else 0.0
+                results.put((slot, ticket, None))
+            except Exception as e:
+                results.put((slot, ticket, str(e)))
+    finally:
+        detector.close()
+        del frames, landmarks_out
+        frame_shm.close()
+        landmark_shm.close()
+
+
+class DetectorWorkerPool:
+    """HandDetector processes fed through a shared-memory frame ring.
+
+    detect_hand(frame, stream) has the same contract as HandDetector and
+    blocks until a worker is done. Frames of the same stream always go to
+    the same worker, so MediaPipe's tracking and the detector's ROI /
+    frame-skipping state stay per stream; stream=None spreads frames
+    round-robin for offline jobs where tracking does not matter.
+
+    A worker that dies or takes longer than task_timeout on one frame is
+    restarted and that frame raises RuntimeError, so a crashed MediaPipe
+    process ends one stream's pipeline instead of hanging it.
+    """
+
+    def __init__(self, num_workers=None, slots_per_worker=4, frame_shape=(480, 640, 3),
+                 detector_kwargs=None, start_timeout=60.0, task_timeout=10.0):
+        self.num_workers = num_workers or os.cpu_count() or 1
+        self.start_timeout = start_timeout
+        self.task_timeout = task_timeout
+        self._detector_kwargs = detector_kwargs or {}
+        self.slots = self.num_workers * slots_per_worker
+        self.frame_shape = tuple(frame_shape)
+        self._context = mp.get_context('spawn')  # no fork: the server has threads running
+
+        frame_bytes = int(np.prod(self.frame_shape)) * self.slots
+        self._frame_shm = shared_memory.SharedMemory(create=True, size=frame_bytes)
+        self._landmark_shm = shared_memory.SharedMemory(create=True, size=self.slots * (LANDMARK_SIZE + 1) * 8)
+        self._frames = np.ndarray((self.slots,) + self.frame_shape, dtype=np.uint8, buffer=self._frame_shm.buf)
+        self._landmarks = np.ndarray((self.slots, LANDMARK_SIZE + 1), dtype=np.float64,
+                                     buffer=self._landmark_shm.buf)
+
+        self._free_slots = list(range(self.slots))
+        self._slot_condition = threading.Condition()
+        self._done = [threading.Event() for _ in range(self.slots)]
+        self._errors = [None] * self.slots
+        self._tickets = [0] * self.slots  # results of an abandoned task must not complete a reused slot
+        self._next_ticket = 0
+        self._streams = {}
+        self._next_worker = 0
+        self._lock = threading.Lock()
+
+        self._results = self._context.Queue()
+        self._tasks = [self._context.Queue() for _ in range(self.num_workers)]
+        self._ready = [threading.Event() for _ in range(self.num_workers)]
+        self._workers = [self._start_worker(i) for i in range(self.num_workers)]
+
+        deadline = time.time() + start_timeout
+        ready = 0
+        while ready < self.num_workers:
+            message = self._results.get(timeout=max(0.1, deadline - time.time()))
+            if message[0] == 'ready':
+                self._ready[message[1]].set()
+                ready += 1
+
+        self._running = True
+        self._dispatcher = threading.Thread(target=self._dispatch, name='detector-results', daemon=True)
+        self._dispatcher.start()
+
+        self.frames = 0
+        self.busy_waits = 0
+        self.restarts = 0
+
+    def _start_worker(self, index):
+        worker = self._context.Process(
+            target=_worker_main,
+            args=(index, self._frame_shm.name, self._landmark_shm.name, self.slots, self.frame_shape,
+                  self._tasks[index], self._results, self._detector_kwargs),
+            name=f"detector-worker-{index}", daemon=True
+        )
+        worker.start()
+        return worker
+
+    def _restart_worker(self, index, worker):
+        """Replace a dead or hung worker (no-op if another thread already did)"""
+        with self._lock:
+            if self._workers[index] is not worker or not self._running:
+                return
+            if worker.is_alive():
+                worker.terminate()
+            # Tasks queued for the old worker belong to frames that already failed
+            self._tasks[index] = self._context.Queue()
+            self._ready[index] = threading.Event()
+            self._workers[index] = self._start_worker(index)
+            self.restarts += 1
+        print(f"⚠️  Detector worker {index} restarted")
+
+    def _dispatch(self):
+        while self._running:
+            try:
+                message = self._results.get(timeout=0.5)
+            except Exception:
+                continue
+            if message is None:
+                break
+            if message[0] == 'ready':
+                self._ready[message[1]].set()  # a restarted worker
+                continue
+            slot, ticket, error = message
+            if ticket != self._tickets[slot]:
+                continue
+            self._errors[slot] = error
+            self._done[slot].set()
+
+    def _worker_for(self, stream):
+        with self._lock:
+            if stream is None:
+                worker = self._next_worker
+                self._next_worker = (self._next_worker + 1) % self.num_workers
+                return worker
+            if stream not in self._streams:
+                self._streams[stream] = len(self._streams) % self.num_workers
+            return self._streams[stream]
+
+    def _acquire_slot(self):
+        with self._slot_condition:
+            if not self._free_slots:
+                self.busy_waits += 1
+            while not self._free_slots:
+                self._slot_condition.wait()
+            return self._free_slots.pop()
+
+    def _release_slot(self, slot):
+        with self._slot_condition:
+            self._free_slots.append(slot)
+            self._slot_condition.notify()
+
+    def detect_hand(self, frame, stream=None):
+        """(annotated frame, landmarks or None, hand_present), like HandDetector
+
+        Frames larger than the slots are downscaled to fit for detection
+        (landmarks are normalized, so they are unaffected) and the annotated
+        frame is scaled back to the caller's size.
+        """
+        original_size = None
+        h, w = frame.shape[:2]
+        if h > self.frame_shape[0] or w > self.frame_shape[1]:
+            original_size = (w, h)
+            scale = min(self.frame_shape[0] / h, self.frame_shape[1] / w)
+            w, h = min(int(w * scale), self.frame_shape[1]), min(int(h * scale), self.frame_shape[0])
+            frame = cv2.resize(frame, (w, h), interpolation=cv2.INTER_AREA)
+
+        slot = self._acquire_slot()
+        try:
+            self._frames[slot, :h, :w] = frame
+            self._done[slot].clear()
+            index = self._worker_for(stream)
+            # Same lock as _restart_worker, so the task never lands on a replaced queue
+            with self._lock:
+                self._next_ticket += 1
+                self._tickets[slot] = self._next_ticket
+                worker, ready = self._workers[index], self._ready[index]
+                self._tasks[index].put((slot, h, w, self._tickets[slot]))
+            self._wait(slot, index, worker, ready)
+            if self._errors[slot] is not None:
+                raise RuntimeError(f"Detector worker failed: {self._errors[slot]}")
+
+            annotated = self._frames[slot, :h, :w].copy()
+            hand_present = self._landmarks[slot, LANDMARK_SIZE] > 0
+            landmarks = self._landmarks[slot, :LANDMARK_SIZE].copy() if hand_present else None
+        finally:
+            self._release_slot(slot)
+        if original_size is not None:
+            annotated = cv2.resize(annotated, original_size)
+        self.frames += 1
+        return annotated, landmarks, bool(hand_present)
+
+    def _wait(self, slot, index, worker, ready):
+        start = time.perf_counter()
+        while not self._done[slot].wait(0.5):
+            if not worker.is_alive():
+                self._tickets[slot] = 0
+                self._restart_worker(index, worker)
+                raise RuntimeError(f"Detector worker {index} died (exit code {worker.exitcode})")
+            # A restarted worker is still loading MediaPipe
+            timeout = self.task_timeout if ready.is_set() else self.start_timeout
+            if time.perf_counter() - start > timeout:
+                self._tickets[slot] = 0
+                self._restart_worker(index, worker)
+                raise RuntimeError(f"Detector worker {index} did not answer within {timeout:.0f}s")
+
+    def client(self, stream):
+        """HandDetector-compatible handle bound to one stream"""
+        return _StreamDetector(self, stream)
+
+    def stats(self):
+        with self._slot_condition:
+            free = len(self._free_slots)
+        return {
+            'workers': self.num_workers,
+            'slots': self.slots,
+            'slots_in_use': self.slots - free,
+            'frames': self.frames,
+            'busy_waits': self.busy_waits,
+            'restarts': self.restarts,
+            'streams': len(self._streams)
+        }
+
+    def close(self):
+        if not getattr(self, '_running', False):
+            return
+        self._running = False
+        for tasks in self._tasks:
+            tasks.put(None)
+        for worker in self._workers:
+            worker.join(timeout=5.0)
+            if worker.is_alive():
+                worker.terminate()
+        self._results.put(None)
+        self._dispatcher.join(timeout=2.0)
+        del self._frames, self._landmarks
+        self._frame_shm.close()
+        self._frame_shm.unlink()
+        self._landmark_shm.close()
+        self._landmark_shm.unlink()
+
+
+class _StreamDetector:
+    def __init__(self, pool, stream):
+        self.pool = pool
+        self.stream = stream
+
+    def detect_hand(self, frame):
+        return self.pool.detect_hand(frame, self.stream)
+
+    def close(self):
+        pass  # the pool outlives individual streams
+
+
+def main():
+    """Detection throughput with 1..N worker processes and several streams"""
+    import argparse
+    from frame_sources import open_source
+
+    parser = argparse.ArgumentParser(description="Multi-process hand detection scaling")
+    parser.add_argument('source', help="Video file or image directory")
+    parser.add_argument('--workers', type=int, nargs='+', default=None,
+                        help="Worker counts to test (default: 1, 2, 4, ... up to the core count)")
+    parser.add_argument('--streams', type=int, default=4, help="Concurrent streams replaying the source")
+    parser.add_argument('--frames', type=int, default=150, help="Frames per stream")
+    args = parser.parse_args()
+
+    source = open_source(args.source, realtime=False)
+    frames = []
+    try:
+        for frame in source:
+            frames.append(cv2.resize(cv2.flip(frame, 1), (640, 480)))
+            if len(frames) >= args.frames:
+                break
+    finally:
+        source.release()
+    if not frames:
+        print("❌ Source produced no frames")
+        return
+
+    worker_counts = args.workers
+    if worker_counts is None:
+        cores = os.cpu_count() or 1
+        worker_counts = sorted({min(2 ** i, cores) for i in range(8) if 2 ** i <= cores * 2})
+
+    def run_streams(detect_for_stream):
+        latencies = [[] for _ in range(args.streams)]
+
+        def stream(idx):
+            detect = detect_for_stream(idx)
+            for frame in frames:
+                start = time.perf_counter()
+                detect(frame.copy())
+                latencies[idx].append((time.perf_counter() - start) * 1000)
+
+        threads = [threading.Thread(target=stream, args=(i,)) for i in range(args.streams)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        all_latencies = np.concatenate([np.asarray(l) for l in latencies])
+        return len(all_latencies) / elapsed, float(np.percentile(all_latencies, 95))
+
+    print("\n" + "="*70)
+    print(f"  DETECTOR WORKER SCALING - {args.streams} streams x {len(frames)} frames")
+    print("="*70)
+    print(f"\n{'Workers':<14} {'frames/s':>10} {'p95':>10} {'speedup':>9}")
+    print("-" * 46)
+
+    from hand_detector import HandDetector
+    in_process = [HandDetector() for _ in range(args.streams)]
+    try:
+        baseline, p95 = run_streams(lambda idx: in_process[idx].detect_hand)
+    finally:
+        for detector in in_process:
+            detector.close()
+    print(f"{'in-process':<14} {baseline:>10.1f} {p95:>8.1f}ms {1.0:>8.2f}x")
+
+    for num_workers in worker_counts:
+        pool = DetectorWorkerPool(num_workers)
+        try:
+            # Warm every worker's MediaPipe graph before timing
+            for idx in range(args.streams):
+                pool.detect_hand(frames[0].copy(), stream=idx)
+            throughput, p95 = run_streams(lambda idx: pool.client(idx).detect_hand)
+        finally:
+            pool.close()
+        print(f"{num_workers:<14} {throughput:>10.1f} {p95:>8.1f}ms {throughput / baseline:>8.2f}x")
+
+    print("\n   in-process = one HandDetector per stream on threads (today's server)")
+    print("="*70)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""
+Voxora.AI - Knowledge Distillation Module
+Trains a compact real-time student from the advanced custom CNN using the
+teacher's soft targets on the same (augmented) landmark data
+"""
+
+import os
+import time
+import tempfile
+import numpy as np
+import tensorflow as tf
+from tensorflow import keras
+from sklearn.model_selection import train_test_split
+from train_custom_model import CustomModelTrainer
+from scaler_folding import bake_scaler, has_baked_scaler, load_scaler
+from numpy_inference import export_model, load_bundle, bundle_path_for
+
+
+class ModelDistiller:
+    def __init__(self, temperature=4.0, alpha=0.3):
+        self.temperature = temperature
+        self.alpha = alpha  # weight of the hard-label loss
+        self.trainer = CustomModelTrainer()
+        self.model_dir = self.trainer.model_dir
+        self.teacher_path = os.path.join(self.model_dir, 'signity_custom_model.h5')
+        self.student_path = os.path.join(self.model_dir, 'signity_student_model.h5')
+
+    def load_teacher(self):
+        """Load the teacher; older models without a baked scaler get it baked now"""
+        teacher = keras.models.load_model(self.teacher_path)
+        scaler_path = os.path.join(self.model_dir, 'scaler.pkl')
+        if not has_baked_scaler(teacher) and os.path.exists(scaler_path):
+            teacher = bake_scaler(teacher, load_scaler(scaler_path))
+            print("🔗 Baked models/scaler.pkl into the teacher")
+        print(f"📂 Teacher loaded: {self.teacher_path}")
+        return teacher
+
+    def soft_targets(self, teacher, x):
+        """Teacher probabilities softened with the distillation temperature"""
+        probabilities = teacher.predict(x, verbose=0, batch_size=512)
+        logits = np.log(np.clip(probabilities, 1e-8, 1.0)) / self.temperature
+        logits -= logits.max(axis=1, keepdims=True)
+        soft = np.exp(logits)
+        return soft / soft.sum(axis=1, keepdims=True)
+
+    def create_student_model(self, x_train, num_classes):
+        """Compact student: input normalization + two small Dense layers.
+
+        The last layer outputs logits for training; build_serving_model()
+        appends the softmax.
+        """
+        normalization = keras.layers.Normalization(axis=-1, name='input_scaler')
+        normalization.adapt(x_train)
+
+        model = keras.Sequential([
+            keras.layers.Input(shape=(x_train.shape[1],)),
+            normalization,
+            keras.layers.Dense(256, activation='relu'),
+            keras.layers.Dropout(0.2),
+            keras.layers.Dense(128, activation='relu'),
+            keras.layers.Dense(num_classes, name='logits')
+        ])
+        print(f"✅ Student created ({model.count_params():,} parameters)")
+        return model
+
+    def distillation_loss(self, num_classes):
+        """Targets are [one-hot labels | teacher soft targets] concatenated"""
+        temperature = self.temperature
+        alpha = self.alpha
+
+        def loss(y_true, logits):
+            hard, soft = y_true[:, :num_classes], y_true[:, num_classes:]
+            hard_loss = keras.losses.categorical_crossentropy(hard, logits, from_logits=True)
+            soft_loss = keras.losses.kl_divergence(soft, tf.nn.softmax(logits / temperature))
+            return alpha * hard_loss + (1 - alpha) * soft_loss * temperature ** 2
+
+        return loss
+
+    @staticmethod
+    def build_serving_model(student):
+        """Student with a softmax head, in the format web_app.load_model consumes"""
+        return keras.Sequential(
+            [keras.layers.Input(shape=student.input_shape[1:])] +
+            list(student.layers) +
+            [keras.layers.Activation('softmax')]
+        )
+
+    def train(self, x_train, y_train, x_val, y_val, teacher):
+        num_classes = len(self.trainer.classes)
+        student = self.create_student_model(x_train, num_classes)
+
+        def targets(x, y):
+            return np.hstack([keras.utils.to_categorical(y, num_classes), self.soft_targets(teacher, x)])
+
+        student.compile(
+            optimizer=keras.optimizers.Adam(learning_rate=0.001),
+            loss=self.distillation_loss(num_classes)
+        )
+
+        print(f"\n🚀 Distilling (T={self.temperature}, alpha={self.alpha})...")
+        student.fit(
+            x_train, targets(x_train, y_train),
+            validation_data=(x_val, targets(x_val, y_val)),
+            epochs=100,
+            batch_size=64,
+            callbacks=[
+                keras.callbacks.EarlyStopping(monitor='val_loss', patience=10,
+                                              restore_best_weights=True, verbose=1),
+                keras.callbacks.ReduceLROnPlateau(monitor='val_loss', factor=0.5,
+                                                  patience=4, min_lr=1e-6, verbose=1)
+            ],
+            verbose=2
+        )
+        return self.build_serving_model(student)
+
+    @staticmethod
+    def single_sample_latency(predict, sample, runs=300):
+        sample = sample.reshape(1, -1)
+        for _ in range(10):
+            predict(sample)
+        start = time.perf_counter()
+        for _ in range(runs):
+            predict(sample)
+        return (time.perf_counter() - start) * 1000 / runs
+
+    def report(self, teacher, student, x_test, y_test):
+        """Accuracy, parameter count and single-sample CPU latency side by side.
+
+        The student's NumPy bundle is saved next to it for serving; the
+        teacher's is only timed, from a temporary file, so the production
+        teacher bundle is left alone.
+        """
+        print(f"\n{'Model':<10} {'Accuracy':>9} {'Params':>12} {'Keras':>10} {'NumPy':>10}")
+        print("-" * 55)
+
+        with tempfile.TemporaryDirectory() as scratch:
+            for name, model, bundle_path in (('teacher*', teacher, os.path.join(scratch, 'teacher.npz')),
+                                             ('student', student, bundle_path_for(self.student_path))):
+                accuracy = float(np.mean(model.predict(x_test, verbose=0).argmax(axis=1) == y_test))
+                keras_ms = self.single_sample_latency(lambda s: model.predict(s, verbose=0), x_test[0])
+
+                export_model(model, bundle_path)
+                numpy_ms = self.single_sample_latency(load_bundle(bundle_path).predict, x_test[0])
+
+                print(f"{name:<10} {accuracy*100:>8.2f}% {model.count_params():>12,} "
+                      f"{keras_ms:>8.3f}ms {numpy_ms:>8.3f}ms")
+
+        print("\n* train_custom_model augments before splitting, so the teacher has trained on")
+        print("  augmented copies of most test samples; its accuracy here is optimistic")
+
+    def run(self):
+        print("\n" + "="*70)
+        print("  KNOWLEDGE DISTILLATION")
+        print("="*70)
+
+        sequences, labels = self.trainer.load_custom_dataset()
+        if len(sequences) == 0:
+            print("\n❌ No data found! Run create_custom_dataset.py first")
+            return
+
+        teacher = self.load_teacher()
+
+        # Split the original samples and augment only the training rows, so
+        # no copy of a validation or test sample reaches the student
+        x_train, x_temp, y_train, y_temp = train_test_split(
+            sequences, labels, test_size=0.3, random_state=42, stratify=labels
+        )
+        x_val, x_test, y_val, y_test = train_test_split(
+            x_temp, y_temp, test_size=0.5, random_state=42, stratify=y_temp
+        )
+        x_train, y_train = self.trainer.augment_data(x_train, y_train, augmentation_factor=3)
+
+        student = self.train(x_train, y_train, x_val, y_val, teacher)
+        student.save(self.student_path)
+        print(f"\n💾 Student saved: {self.student_path}")
+
+        self.report(teacher, student, x_test, y_test)
+        print(f"\n🚀 Serve it: set model_path = '{self.student_path}' and")
+        print("   class_mapping_path = 'models/custom_class_mapping.json' in web_app.py")
+        print("="*70)
+
+
+def main():
+    ModelDistiller().run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,299 @@
+"""
+Voxora.AI - Frame Pipeline Module
+Runs capture -> detect -> classify -> encode as separate worker threads
+joined by small bounded queues that drop the oldest frame when a stage
+falls behind, so end-to-end latency stays bounded
+"""
+
+import time
+import threading
+from collections import deque
+
+_END = object()  # end-of-stream marker passed down the pipeline
+
+
+class DropOldestQueue:
+    """Bounded FIFO that discards its oldest item instead of blocking"""
+
+    def __init__(self, maxsize=2):
+        self.maxsize = maxsize
+        self._items = deque()
+        self._condition = threading.Condition()
+        self._closed = False
+        self.dropped = 0
+
+    def put(self, item):
+        with self._condition:
+            if len(self._items) >= self.maxsize and item is not _END:
+                self._items.popleft()
+                self.dropped += 1
+            self._items.append(item)
+            self._condition.notify()
+
+    def get(self, timeout=None):
+        """Next item, or None on timeout / after close()"""
+        with self._condition:
+            if not self._items and not self._closed:
+                self._condition.wait(timeout)
+            if not self._items:
+                return None
+            return self._items.popleft()
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    def __len__(self):
+        return len(self._items)
+
+
+class FramePacket:
+    """One frame travelling through the pipeline"""
+
+    __slots__ = ('frame', 'recorded', 'landmarks', 'hand_present', 'prediction', 'confidence',
+                 'probabilities', 'class_mapping', 'jpeg', 'captured_at', 'extra')
+
+    def __init__(self, frame, recorded=None):
+        self.frame = frame
+        self.recorded = recorded  # landmark row of a replayed recording
+        self.landmarks = None
+        self.hand_present = False
+        self.prediction = None
+        self.confidence = 0.0
+        self.probabilities = None
+        self.class_mapping = None
+        self.jpeg = None
+        self.captured_at = time.perf_counter()
+        self.extra = None
+
+
+class _StageStats:
+    def __init__(self, window=256):
+        self.processed = 0
+        self._latencies = deque(maxlen=window)
+
+    def record(self, ms):
+        self.processed += 1
+        self._latencies.append(ms)
+
+    def summary(self):
+        if not self._latencies:
+            return {'processed': self.processed, 'mean_ms': 0.0, 'p95_ms': 0.0}
+        ordered = sorted(self._latencies)
+        return {
+            'processed': self.processed,
+            'mean_ms': sum(ordered) / len(ordered),
+            'p95_ms': ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+        }
+
+
+class FramePipeline:
+    """Staged frame processing with one worker thread per stage.
+
+    source() returns the next FramePacket (or None at end of stream); each
+    stage function takes a packet and returns it (or None to drop it).
+    Iterate the pipeline to consume packets that made it through every
+    stage. Each stage keeps its own state on its own thread, so stateful
+    components such as the MediaPipe tracker are never shared.
+    """
+
+    def __init__(self, source, stages, queue_size=2, name='pipeline'):
+        self.name = name
+        self._source = source
+        self._stage_names = ['capture'] + [stage_name for stage_name, _ in stages]
+        self._stage_fns = [fn for _, fn in stages]
+        self._queues = [DropOldestQueue(queue_size) for _ in range(len(stages) + 1)]
+        self._stats = {stage_name: _StageStats() for stage_name in self._stage_names}
+        self._end_to_end = _StageStats()
+        self._running = False
+        self._threads = []
+        self.error = None
+
+    def start(self):
+        self._running = True
+        self._threads = [threading.Thread(target=self._run_source, name=f"{self.name}-capture", daemon=True)]
+        for i, fn in enumerate(self._stage_fns):
+            self._threads.append(threading.Thread(
+                target=self._run_stage, args=(self._stage_names[i + 1], fn, self._queues[i], self._queues[i + 1]),
+                name=f"{self.name}-{self._stage_names[i + 1]}", daemon=True
+            ))
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def stop(self):
+        self._running = False
+        for queue in self._queues:
+            queue.close()
+        current = threading.current_thread()
+        for thread in self._threads:
+            if thread is not current:
+                thread.join(timeout=2.0)
+
+    def _fail(self, e):
+        if self.error is None:
+            self.error = e
+            print(f"❌ Pipeline error: {e}")
+        self._queues[-1].put(_END)
+
+    def _run_source(self):
+        stats = self._stats['capture']
+        output = self._queues[0]
+        try:
+            while self._running:
+                start = time.perf_counter()
+                packet = self._source()
+                if packet is None:
+                    break
+                stats.record((time.perf_counter() - start) * 1000)
+                output.put(packet)
+        except Exception as e:
+            self._fail(e)
+        output.put(_END)
+
+    def _run_stage(self, stage_name, fn, input_queue, output_queue):
+        stats = self._stats[stage_name]
+        while self._running:
+            packet = input_queue.get(timeout=0.5)
+            if packet is None:
+                continue
+            if packet is _END:
+                output_queue.put(_END)
+                return
+
+            start = time.perf_counter()
+            try:
+                packet = fn(packet)
+            except Exception as e:
+                self._fail(e)
+                return
+            stats.record((time.perf_counter() - start) * 1000)
+            if packet is not None:
+                output_queue.put(packet)
+
+    def __iter__(self):
+        output = self._queues[-1]
+        while self._running:
+            packet = output.get(timeout=0.5)
+            if packet is None:
+                continue
+            if packet is _END:
+                return
+            self._end_to_end.record((time.perf_counter() - packet.captured_at) * 1000)
+            yield packet
+
+    def stats(self):
+        """Per-stage latency, queue depth and drops"""
+        stages = {}
+        for i, stage_name in enumerate(self._stage_names):
+            summary = self._stats[stage_name].summary()
+            # Queue i feeds stage i + 1; report it on the stage that fills it
+            summary['queue_depth'] = len(self._queues[i])
+            summary['dropped'] = self._queues[i].dropped
+            stages[stage_name] = summary
+        return {
+            'name': self.name,
+            'stages': stages,
+            'end_to_end': self._end_to_end.summary()
+        }
+
+
+class FrameBroadcaster:
+    """Fans one producer's packets out to any number of subscribers.
+
+    produce() returns an iterator of finished packets (e.g. a generator
+    driving a FramePipeline); it is started by the first subscriber and
+    closed once the last one leaves. Every subscriber has its own
+    drop-oldest queue, so a slow client only drops frames for itself.
+    Subscribers may tag themselves with a kind (e.g. 'mjpeg') so stages
+    can skip work nobody is consuming.
+    """
+
+    def __init__(self, produce, queue_size=2, name='broadcast'):
+        self._produce = produce
+        self.queue_size = queue_size
+        self.name = name
+        self._subscribers = {}  # queue -> kind
+        self._lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._thread = None
+        self._stopping = True
+        self.broadcast = 0
+
+    def subscribe(self, kind=None):
+        queue = DropOldestQueue(self.queue_size)
+        with self._start_lock:
+            with self._lock:
+                self._subscribers[queue] = kind
+                running = not self._stopping
+            if not running:
+                if self._thread is not None:
+                    self._thread.join()  # previous loop still releasing the camera
+                with self._lock:
+                    self._stopping = False
+                self._thread = threading.Thread(target=self._run, name=f"{self.name}-broadcast", daemon=True)
+                self._thread.start()
+        return queue
+
+    def unsubscribe(self, queue):
+        with self._lock:
+            self._subscribers.pop(queue, None)
+
+    def _run(self):
+        iterator = self._produce()
+        try:
+            for packet in iterator:
+                with self._lock:
+                    if not self._subscribers:
+                        # Anyone subscribing from here on starts a fresh loop
+                        self._stopping = True
+                        return
+                    for queue in self._subscribers:
+                        queue.put(packet)
+                    self.broadcast += 1
+        except Exception as e:
+            print(f"❌ Broadcast error: {e}")
+        finally:
+            close = getattr(iterator, 'close', None)
+            if close is not None:
+                close()
+        # The source ended on its own: end every current stream
+        with self._lock:
+            self._stopping = True
+            for queue in self._subscribers:
+                queue.put(_END)
+            self._subscribers.clear()
+
+    def subscriber_count(self, kind=None):
+        with self._lock:
+            if kind is None:
+                return len(self._subscribers)
+            return sum(1 for subscriber_kind in self._subscribers.values() if subscriber_kind == kind)
+
+    def stream(self, kind=None):
+        """Packets for one subscriber until it disconnects or the source ends"""
+        queue = self.subscribe(kind)
+        try:
+            while True:
+                packet = queue.get(timeout=0.5)
+                if packet is None:
+                    continue
+                if packet is _END:
+                    return
+                yield packet
+        finally:
+            self.unsubscribe(queue)
+
+    def stats(self):
+        with self._lock:
+            kinds = {}
+            for kind in self._subscribers.values():
+                kinds[kind or 'other'] = kinds.get(kind or 'other', 0) + 1
+            return {
+                'name': self.name,
+                'running': not self._stopping,
+                'subscribers': kinds,
+                'broadcast': self.broadcast,
+                'dropped': [queue.dropped for queue in self._subscribers]
+            }
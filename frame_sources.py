@@ -0,0 +1,343 @@
+"""
+Voxora.AI - Frame Source Module
+Pluggable frame sources (live camera, video file, image directory,
+recorded landmark stream) so the recognition pipeline can run and be
+benchmarked deterministically without a webcam
+"""
+
+import os
+import time
+import numpy as np
+import cv2
+from config import FPS_TARGET, NUM_LANDMARKS, LANDMARK_DIMS
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp')
+
+
+class FrameSource:
+    """Base class with the cv2.VideoCapture read()/release() interface.
+
+    realtime=True paces frames at the source fps; realtime=False returns
+    them as fast as the consumer asks for them.
+    """
+
+    def __init__(self, fps=FPS_TARGET, realtime=True):
+        self.fps = fps
+        self.realtime = realtime
+        self.frame_index = 0
+        self._start_time = None
+
+    def _pace(self):
+        if not self.realtime or not self.fps:
+            return
+        now = time.perf_counter()
+        if self._start_time is None:
+            self._start_time = now
+            return
+        due = self._start_time + self.frame_index / self.fps
+        if due > now:
+            time.sleep(due - now)
+
+    def _next_frame(self, frame=None):
+        raise NotImplementedError
+
+    def read(self, frame=None):
+        """(success, frame) like cv2.VideoCapture.read()
+
+        Camera and video sources decode into frame when it is given and has
+        the right shape, instead of allocating a new image.
+        """
+        self._pace()
+        success, frame = self._next_frame(frame)
+        if success:
+            self.frame_index += 1
+        return success, frame
+
+    def read_recorded(self, frame=None):
+        """(success, frame, recorded landmarks row); the row is None except for landmark recordings"""
+        success, frame = self.read(frame)
+        return success, frame, None
+
+    def create_detector(self):
+        """Detector to pair with this source (None = use HandDetector)"""
+        return None
+
+    def release(self):
+        pass
+
+    def __iter__(self):
+        while True:
+            success, frame = self.read()
+            if not success:
+                return
+            yield frame
+
+    def iter_recorded(self):
+        """(frame, recorded row) pairs, see read_recorded()"""
+        while True:
+            success, frame, recorded = self.read_recorded()
+            if not success:
+                return
+            yield frame, recorded
+
+
+class CameraSource(FrameSource):
+    """Live camera; the camera itself sets the pace"""
+
+    def __init__(self, index=0, width=640, height=480, fps=FPS_TARGET):
+        super().__init__(fps=fps, realtime=False)
+        self.capture = cv2.VideoCapture(index)
+        self.capture.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        self.capture.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+        self.capture.set(cv2.CAP_PROP_FPS, fps)
+        self.capture.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+    def _next_frame(self, frame=None):
+        return self.capture.read(frame)
+
+    def release(self):
+        self.capture.release()
+
+
+class VideoFileSource(FrameSource):
+    """Recorded video file, optionally looped"""
+
+    def __init__(self, path, realtime=True, loop=False):
+        self.capture = cv2.VideoCapture(path)
+        if not self.capture.isOpened():
+            raise IOError(f"Cannot open video: {path}")
+        fps = self.capture.get(cv2.CAP_PROP_FPS) or FPS_TARGET
+        super().__init__(fps=fps, realtime=realtime)
+        self.loop = loop
+
+    def _next_frame(self, frame=None):
+        success, image = self.capture.read(frame)
+        if not success and self.loop:
+            self.capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            success, image = self.capture.read(frame)
+        return success, image
+
+    def release(self):
+        self.capture.release()
+
+
+class ImageDirectorySource(FrameSource):
+    """Sorted images from a directory, played back as a video"""
+
+    def __init__(self, path, fps=FPS_TARGET, realtime=True, loop=False):
+        super().__init__(fps=fps, realtime=realtime)
+        self.paths = [os.path.join(path, f) for f in sorted(os.listdir(path))
+                      if f.lower().endswith(IMAGE_EXTENSIONS)]
+        if not self.paths:
+            raise IOError(f"No images found in {path}")
+        self.loop = loop
+        self._position = 0
+
+    def _next_frame(self, frame=None):
+        if self._position >= len(self.paths):
+            if not self.loop:
+                return False, None
+            self._position = 0
+        frame = cv2.imread(self.paths[self._position])
+        self._position += 1
+        return frame is not None, frame
+
+
+def load_landmark_recording(path):
+    """(landmarks (frames, 63) with NaN rows for "no hand", timestamps or None)"""
+    if path.endswith('.npz'):
+        with np.load(path) as data:
+            landmarks = data['landmarks'].astype(np.float32)
+            timestamps = data['timestamps'] if 'timestamps' in data else None
+        return landmarks, timestamps
+    landmarks = np.load(path).astype(np.float32)
+    return landmarks.reshape(len(landmarks), -1), None
+
+
+class LandmarkRecordingSource(FrameSource):
+    """Recorded landmark stream; frames are blank canvases.
+
+    read_recorded() returns each frame together with its recorded row (NaN
+    for "no hand"); pass both to the create_detector() detector, which
+    returns that row instead of running MediaPipe. Recordings with
+    timestamps are replayed with their original timing; looping keeps the
+    pace continuous across the wrap. Every frame is the same preallocated
+    blank canvas: flip or copy it before drawing on it, as the detection
+    paths do.
+    """
+
+    def __init__(self, path, realtime=True, loop=False, frame_size=(480, 640)):
+        self.landmarks, self.timestamps = load_landmark_recording(path)
+        fps = FPS_TARGET
+        if self.timestamps is not None and len(self.timestamps) > 1:
+            fps = (len(self.timestamps) - 1) / max(self.timestamps[-1] - self.timestamps[0], 1e-6)
+        super().__init__(fps=fps, realtime=realtime)
+        self.loop = loop
+        self.frame_size = frame_size
+        self._canvas = np.zeros(frame_size + (3,), dtype=np.uint8)
+        self._position = 0
+
+    def _pace(self):
+        if self.realtime and self.timestamps is not None:
+            now = time.perf_counter()
+            offset = self.timestamps[self._position] - self.timestamps[0]
+            if self._start_time is None:
+                self._start_time = now - offset
+            due = self._start_time + offset
+            if due > now:
+                time.sleep(due - now)
+            return
+        super()._pace()
+
+    def read_recorded(self, frame=None):
+        if self._position >= len(self.landmarks):
+            if not self.loop:
+                return False, None, None
+            # The next lap starts one frame interval after the last frame
+            if self._start_time is not None and self.fps:
+                self._start_time += len(self.landmarks) / self.fps
+            self._position = 0
+            self.frame_index = 0
+        self._pace()
+        row = self.landmarks[self._position]
+        self._position += 1
+        self.frame_index += 1
+        return True, self._canvas, row
+
+    def read(self, frame=None):
+        success, frame, _ = self.read_recorded(frame)
+        return success, frame
+
+    def create_detector(self):
+        return ReplayHandDetector()
+
+
+class ReplayHandDetector:
+    """HandDetector stand-in that returns the recorded landmarks it is given.
+
+    The row travels with its frame (read_recorded(), FramePacket.recorded),
+    so replay is deterministic when detection runs on another thread.
+    """
+
+    def detect_hand(self, frame, recorded=None):
+        if recorded is None or np.isnan(recorded).any():
+            return frame, None, False
+
+        h, w = frame.shape[:2]
+        for x, y, _ in recorded.reshape(NUM_LANDMARKS, LANDMARK_DIMS):
+            cv2.circle(frame, (int(x * w), int(y * h)), 3, (0, 255, 0), -1)
+        return frame, recorded.copy(), True
+
+    def close(self):
+        pass
+
+
+def detect_recorded(detector, frame, recorded):
+    """detect_hand() for a frame from read_recorded(): recorded rows go to the replay detector"""
+    if recorded is not None:
+        return detector.detect_hand(frame, recorded)
+    return detector.detect_hand(frame)
+
+
+class LandmarkRecorder:
+    """Records a landmark stream to .npz for later replay"""
+
+    def __init__(self, path):
+        self.path = path
+        self._rows = []
+        self._timestamps = []
+
+    def add(self, landmarks, timestamp=None):
+        row = np.full(NUM_LANDMARKS * LANDMARK_DIMS, np.nan, dtype=np.float32)
+        if landmarks is not None:
+            row[:] = np.asarray(landmarks, dtype=np.float32).reshape(-1)
+        self._rows.append(row)
+        self._timestamps.append(time.time() if timestamp is None else timestamp)
+
+    def save(self):
+        np.savez_compressed(self.path, landmarks=np.stack(self._rows),
+                            timestamps=np.asarray(self._timestamps, dtype=np.float64))
+        return self.path
+
+
+def open_source(spec, realtime=True, loop=False, width=640, height=480):
+    """Create a source from a spec: 'camera:0', a video file, an image
+    directory, or a landmark recording (.npz / .npy)"""
+    if spec.startswith('camera'):
+        index = int(spec.split(':', 1)[1]) if ':' in spec else 0
+        return CameraSource(index, width=width, height=height)
+    if os.path.isdir(spec):
+        return ImageDirectorySource(spec, realtime=realtime, loop=loop)
+    if spec.endswith(('.npz', '.npy')):
+        return LandmarkRecordingSource(spec, realtime=realtime, loop=loop)
+    return VideoFileSource(spec, realtime=realtime, loop=loop)
+
+
+def main():
+    """Run detection + classification over a source and report throughput"""
+    import argparse
+    from numpy_inference import load_classifier
+
+    parser = argparse.ArgumentParser(description="Deterministic recognition pipeline benchmark")
+    parser.add_argument('source', help="camera:0, video file, image directory or landmark recording")
+    parser.add_argument('--model', default=os.path.join('models', 'signity_model.h5'))
+    parser.add_argument('--realtime', action='store_true', help="Pace frames at the source fps")
+    parser.add_argument('--record', default=None, help="Save detected landmarks to this .npz")
+    parser.add_argument('--max-frames', type=int, default=None)
+    args = parser.parse_args()
+
+    source = open_source(args.source, realtime=args.realtime)
+    detector = source.create_detector()
+    if detector is None:
+        from hand_detector import HandDetector
+        detector = HandDetector()
+    model = load_classifier(args.model)
+    recorder = LandmarkRecorder(args.record) if args.record else None
+
+    detect_ms = []
+    classify_ms = []
+    frames = 0
+    start = time.perf_counter()
+
+    try:
+        for frame, recorded in source.iter_recorded():
+            # Mirrored like every other detection path, so recordings match what the server sees
+            frame = cv2.flip(frame, 1)
+            t0 = time.perf_counter()
+            _, landmarks, _ = detect_recorded(detector, frame, recorded)
+            t1 = time.perf_counter()
+            if landmarks is not None:
+                model.predict(landmarks.reshape(1, -1), verbose=0)
+            t2 = time.perf_counter()
+
+            detect_ms.append((t1 - t0) * 1000)
+            if landmarks is not None:
+                classify_ms.append((t2 - t1) * 1000)
+            if recorder is not None:
+                recorder.add(landmarks)
+
+            frames += 1
+            if args.max_frames and frames >= args.max_frames:
+                break
+    finally:
+        source.release()
+        detector.close()
+
+    elapsed = time.perf_counter() - start
+
+    print("\n" + "="*70)
+    print(f"  PIPELINE BENCHMARK - {args.source}")
+    print("="*70)
+    print(f"\n   Frames: {frames} in {elapsed:.2f}s ({frames / max(elapsed, 1e-9):.1f} FPS)")
+    if detect_ms:
+        print(f"   Detect:   mean {np.mean(detect_ms):.2f}ms  p95 {np.percentile(detect_ms, 95):.2f}ms")
+    if classify_ms:
+        print(f"   Classify: mean {np.mean(classify_ms):.3f}ms  p95 {np.percentile(classify_ms, 95):.3f}ms "
+              f"({len(classify_ms)} frames with a hand)")
+    if recorder is not None:
+        print(f"\n💾 Landmarks recorded: {recorder.save()}")
+    print("="*70)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,9 +3,12 @@ Signity.AI - Hand Detection Module
 Real-time hand detection and landmark extraction using MediaPipe
 """
 
+import os
+import threading
 import cv2
 import numpy as np
 from config import *
+from frame_buffers import FrameRing
 
 # Handle MediaPipe import compatibility
 try:
@@ -32,51 +35,425 @@ except AttributeError:
         mp_drawing = mp.solutions.drawing_utils
         mp_drawing_styles = mp.solutions.drawing_styles
 
+def landmarks_into(hand_landmarks, out):
+    """Write a MediaPipe landmark list into a preallocated (63,) array"""
+    view = out.data  # memoryview item assignment is cheaper than NumPy's
+    for i, landmark in enumerate(hand_landmarks.landmark):
+        view[3 * i] = landmark.x
+        view[3 * i + 1] = landmark.y
+        view[3 * i + 2] = landmark.z
+    return out
+
+
+def hand_bbox(landmarks_raw, w, h, margin=0):
+    """Pixel bounding box (x_min, y_min, x_max, y_max) of flat landmarks, clipped to the frame"""
+    x_coords = landmarks_raw[0::3]
+    y_coords = landmarks_raw[1::3]
+    x_min = max(0, int(min(x_coords) * w) - margin)
+    x_max = min(w, int(max(x_coords) * w) + margin)
+    y_min = max(0, int(min(y_coords) * h) - margin)
+    y_max = min(h, int(max(y_coords) * h) + margin)
+    return x_min, y_min, x_max, y_max
+
+
+class LandmarkPredictor:
+    """Constant-velocity alpha-beta filter over all 63 landmark coordinates.
+
+    Time is counted in frames. update() takes a detector measurement and
+    returns the prediction error for that frame (mean absolute x/y
+    difference in normalized units, None until a velocity is known);
+    predict() extrapolates to any frame.
+    """
+
+    def __init__(self, alpha=0.85, beta=0.5):
+        self.alpha = alpha
+        self.beta = beta
+        self.reset()
+
+    def reset(self):
+        self.position = None
+        self.velocity = None
+        self.frame = None
+
+    def predict(self, frame, out=None):
+        """Extrapolated landmarks (float32), written into out when given"""
+        if self.velocity is None:
+            return None
+        if out is None:
+            return self.position + self.velocity * (frame - self.frame)
+        np.multiply(self.velocity, frame - self.frame, out=out)
+        out += self.position
+        return out
+
+    def update(self, measurement, frame):
+        measurement = np.asarray(measurement, dtype=np.float32)
+        if self.position is None:
+            self.position = measurement.copy()  # the detector reuses its landmark buffers
+            self.velocity = None
+            self.frame = frame
+            return None
+
+        dt = max(frame - self.frame, 1)
+        if self.velocity is None:
+            # Second measurement: initialise the velocity from the first two
+            self.velocity = (measurement - self.position) / dt
+            self.position = measurement.copy()
+            self.frame = frame
+            return None
+
+        predicted = self.position + self.velocity * dt
+        residual = measurement - predicted
+        error = float(np.abs(residual.reshape(-1, 3)[:, :2]).mean())
+
+        self.position = predicted + self.alpha * residual
+        self.velocity = self.velocity + self.beta * residual / dt
+        self.frame = frame
+        return error
+
+    def speed(self):
+        """Mean x/y landmark displacement per frame"""
+        if self.velocity is None:
+            return 0.0
+        return float(np.abs(self.velocity.reshape(-1, 3)[:, :2]).mean())
+
+
+def process_handles():
+    """(open file descriptors, resident memory in MB) where /proc exposes them"""
+    fds = rss_mb = None
+    try:
+        fds = len(os.listdir('/proc/self/fd'))
+    except OSError:
+        pass
+    try:
+        with open('/proc/self/statm') as f:
+            rss_mb = int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2**20
+    except (OSError, ValueError, AttributeError):
+        pass
+    return fds, rss_mb
+
+
+class HandsPool:
+    """Warm mp Hands instances with health-checked, stall-free replacement.
+
+    process() always runs on the active instance. Every sample_interval-th
+    call is bracketed by handle / memory readings; the instance's growth
+    is estimated as the average growth of those sampled calls times the
+    calls it has served. /proc only has whole-process readings, so growth
+    on other threads during a sampled call (HTTP connections, SSE clients,
+    a model preload) still counts; averaging keeps one such call from
+    dominating, and memory freed meanwhile is not credited to the
+    instance. Every check_interval frames the estimate is compared with
+    max_fd_growth / max_rss_growth_mb; past them the active instance is
+    swapped for a pre-warmed spare between two frames. Closing the old
+    instance and warming the next spare happen on a background thread.
+    """
+
+    def __init__(self, factory, spares=1, check_interval=100, max_fd_growth=32,
+                 max_rss_growth_mb=64.0, sample_interval=10):
+        self.factory = factory
+        self.spares = spares
+        self.check_interval = check_interval
+        self.max_fd_growth = max_fd_growth
+        self.max_rss_growth_mb = max_rss_growth_mb
+        self.sample_interval = sample_interval  # reading /proc costs ~0.1ms, so not every frame
+
+        self._active = None
+        self._spares = []
+        self._lock = threading.Lock()
+        self._maintenance = None
+        self._building = 0
+        self._sampled = [0, 0.0, 0]  # fds / MB added by the active instance's sampled calls, samples
+        self._served = 0  # process() calls on the active instance
+        self._frames = 0
+        self._replace_pending = False
+        self._closed = False
+
+        self.swaps = 0
+        self.health_checks = 0
+        self.last_growth = (0, 0.0)
+
+    def _build(self):
+        """New instance with its graph initialised on a blank image"""
+        hands = self.factory()
+        hands.process(np.zeros((256, 256, 3), dtype=np.uint8))
+        return hands
+
+    def _maintain(self, retired):
+        """Background: close the retired instance, warm spares, re-baseline"""
+        if retired is not None:
+            retired.close()
+        while not self._closed:
+            with self._lock:
+                if len(self._spares) + self._building >= self.spares:
+                    break
+                self._building += 1
+            spare = self._build()
+            with self._lock:
+                self._building -= 1
+                if self._closed:
+                    spare.close()
+                    return
+                self._spares.append(spare)
+
+    def _start_maintenance(self, retired=None):
+        if self._maintenance is not None and self._maintenance.is_alive() and retired is None:
+            return
+        self._maintenance = threading.Thread(target=self._maintain, args=(retired,),
+                                             name='hands-pool', daemon=True)
+        self._maintenance.start()
+
+    def _unhealthy(self):
+        self.health_checks += 1
+        fds, rss_mb, samples = self._sampled
+        fd_growth = rss_growth = 0
+        if samples:
+            fd_growth = fds / samples * self._served
+            rss_growth = rss_mb / samples * self._served
+        self.last_growth = (fd_growth, rss_growth)
+        return fd_growth > self.max_fd_growth or rss_growth > self.max_rss_growth_mb
+
+    def _sampled_process(self, hands, image):
+        """process() with the handles and memory it added sampled for the instance"""
+        fds, rss_mb = process_handles()
+        result = hands.process(image)
+        fds_after, rss_after = process_handles()
+        if fds is not None and fds_after is not None:
+            self._sampled[0] += max(fds_after - fds, 0)
+        if rss_mb is not None and rss_after is not None:
+            self._sampled[1] += max(rss_after - rss_mb, 0.0)
+        self._sampled[2] += 1
+        return result
+
+    def _swap(self):
+        with self._lock:
+            if not self._spares:
+                return False
+            retired, self._active = self._active, self._spares.pop(0)
+        self._sampled = [0, 0.0, 0]
+        self._served = 0
+        self.swaps += 1
+        self._replace_pending = False
+        self._start_maintenance(retired)
+        return True
+
+    def process(self, image):
+        if self._active is None:
+            self._active = self._build()  # first frame only
+            if self.spares:
+                self._start_maintenance()
+
+        self._frames += 1
+        if self.spares and self._frames % self.check_interval == 0 and self._unhealthy():
+            self._replace_pending = True
+        if self._replace_pending and not self._swap():
+            self._start_maintenance()  # no spare warm yet: keep serving, swap when it is
+
+        self._served += 1
+        if self.spares and self._frames % self.sample_interval == 0:
+            return self._sampled_process(self._active, image)
+        return self._active.process(image)
+
+    def stats(self):
+        with self._lock:
+            spares = len(self._spares)
+        return {
+            'swaps': self.swaps,
+            'health_checks': self.health_checks,
+            'spares_ready': spares,
+            'fd_growth': round(self.last_growth[0]),
+            'rss_growth_mb': round(self.last_growth[1], 1)
+        }
+
+    def close(self):
+        self._closed = True
+        with self._lock:
+            instances = [self._active] + self._spares
+            self._active = None
+            self._spares = []
+        for hands in instances:
+            if hands is not None:
+                hands.close()
+
+
 class HandDetector:
-    def __init__(self):
+    """MediaPipe hand detector.
+
+    With tracking=True the next frame is searched only in a square region
+    of roi_scale times the previous hand's size, downsized to at most
+    roi_size pixels; landmarks are mapped back to full-frame coordinates.
+    When the hand is lost in the crop the same frame is searched in full.
+
+    With skip_frames=N the detector runs at most every N+1 frames and the
+    frames in between get landmarks extrapolated by a LandmarkPredictor.
+    Fewer frames are skipped while the hand moves fast (so the expected
+    drift stays under max_drift), and none after a detection that
+    disagreed with the prediction by more than max_drift.
+
+    MediaPipe instances live in a HandsPool and are only replaced when the
+    pool's health check fails. reinit_interval=N restores the old rebuild
+    every N frames (kept for latency comparisons).
+
+    Per-frame scratch images and landmark vectors come from FrameRings, so
+    steady-state frames allocate no arrays. Returned landmarks are float32
+    views that stay valid for landmark_buffers frames; copy them to keep
+    them longer.
+    """
+
+    def __init__(self, tracking=False, roi_scale=2.0, roi_size=256, min_roi=96,
+                 skip_frames=0, max_drift=0.01, reinit_interval=None, landmark_buffers=64):
         self.mp_hands = mp_hands
         self.mp_drawing = mp_drawing
         self.mp_drawing_styles = mp_drawing_styles
         
-        # Initialize hands on first use to avoid handle issues
+        # Pools are created on first use
         self.hands = None
+        self.roi_hands = None
         self._frame_count = 0
-        self._reinit_interval = 100  # Reinitialize every 100 frames
+        self._reinit_interval = reinit_interval
+        
+        self.tracking = tracking
+        self.roi_scale = roi_scale
+        self.roi_size = roi_size
+        self.min_roi = min_roi
+        self._roi = None  # (x0, y0, x1, y1) around the last detected hand
+        self.roi_frames = 0
+        self.full_frames = 0
+        self.tracking_lost = 0
         
+        self.skip_frames = skip_frames
+        self.max_drift = max_drift
+        self.predictor = LandmarkPredictor()
+        self._frame_index = 0
+        self._skip_budget = 0
+        self.predicted_frames = 0
+        self.forced_detections = 0
+        
+        self._rgb = FrameRing(1)
+        self._crops = FrameRing(1)
+        self._landmarks = FrameRing(landmark_buffers, dtype=np.float32)
+    
+    def _create_hands(self):
+        return self.mp_hands.Hands(
+            static_image_mode=False,
+            max_num_hands=1,
+            min_detection_confidence=0.7,
+            min_tracking_confidence=0.5
+        )
+    
+    def _next_roi(self, landmarks, w, h):
+        """Square search region around the hand for the next frame"""
+        x_min, y_min, x_max, y_max = hand_bbox(landmarks, w, h)
+        side = max(x_max - x_min, y_max - y_min) * self.roi_scale
+        # Quantized to 32px so crops come in a handful of reusable buffer shapes
+        side = int(min(max(side, self.min_roi), max(w, h)))
+        side = min(max(w, h), -(-side // 32) * 32)
+        cx, cy = (x_min + x_max) // 2, (y_min + y_max) // 2
+        x0 = min(max(0, cx - side // 2), max(0, w - side))
+        y0 = min(max(0, cy - side // 2), max(0, h - side))
+        return x0, y0, min(w, x0 + side), min(h, y0 + side)
+    
+    def _detect_in_roi(self, frame):
+        """Hand landmarks from the tracked crop, in full-frame coordinates"""
+        h, w = frame.shape[:2]
+        x0, y0, x1, y1 = self._roi
+        crop = frame[y0:y1, x0:x1]
+        crop_w, crop_h = x1 - x0, y1 - y0
+        
+        scale = self.roi_size / max(crop_w, crop_h)
+        if scale < 1.0:
+            size = (max(1, int(crop_w * scale)), max(1, int(crop_h * scale)))
+            crop = cv2.resize(crop, size, dst=self._crops.next((size[1], size[0], 3)),
+                              interpolation=cv2.INTER_AREA)
+        
+        crop_rgb = cv2.cvtColor(crop, cv2.COLOR_BGR2RGB, dst=self._rgb.next(crop.shape))
+        results = self.roi_hands.process(crop_rgb)
+        if not results.multi_hand_landmarks:
+            return None
+        
+        # Normalized crop coordinates -> normalized frame coordinates (z scales with width)
+        hand_landmarks = results.multi_hand_landmarks[0]
+        for landmark in hand_landmarks.landmark:
+            landmark.x = (x0 + landmark.x * crop_w) / w
+            landmark.y = (y0 + landmark.y * crop_h) / h
+            landmark.z = landmark.z * crop_w / w
+        return hand_landmarks
+    
+    def _plan_skips(self, error):
+        """How many upcoming frames can be predicted instead of detected"""
+        if error is None:
+            return 0  # velocity not known yet
+        if error > self.max_drift:
+            self.forced_detections += 1
+            return 0
+        speed = self.predictor.speed()
+        if speed <= 0:
+            return self.skip_frames
+        # Constant-velocity drift grows with the unmodelled acceleration; budget on speed
+        return min(self.skip_frames, int(self.max_drift / speed))
+    
+    def _draw_predicted(self, frame, landmarks):
+        h, w = frame.shape[:2]
+        points = [(int(x * w), int(y * h)) for x, y, _ in landmarks.reshape(-1, 3)]
+        for start, end in self.mp_hands.HAND_CONNECTIONS:
+            cv2.line(frame, points[start], points[end], (255, 255, 255), 2)
+        for point in points:
+            cv2.circle(frame, point, 3, (0, 165, 255), -1)
+    
     def detect_hand(self, frame):
         """Detect hand in frame and return landmarks"""
-        # Initialize or reinitialize hands periodically to avoid handle buildup
-        if self.hands is None or self._frame_count >= self._reinit_interval:
-            if self.hands is not None:
-                self.hands.close()
-            self.hands = self.mp_hands.Hands(
-                static_image_mode=False,
-                max_num_hands=1,
-                min_detection_confidence=0.7,
-                min_tracking_confidence=0.5
-            )
+        self._frame_index += 1
+        if self._skip_budget > 0:
+            landmarks = self.predictor.predict(self._frame_index, out=self._landmarks.next((63,)))
+            self._skip_budget -= 1
+            self.predicted_frames += 1
+            if self.tracking:
+                self._roi = self._next_roi(landmarks, frame.shape[1], frame.shape[0])
+            self._draw_predicted(frame, landmarks)
+            return frame, landmarks, True
+        
+        if self._reinit_interval and self._frame_count >= self._reinit_interval:
+            self.close()  # legacy periodic rebuild
+        if self.hands is None:
+            spares = 0 if self._reinit_interval else 1
+            self.hands = HandsPool(self._create_hands, spares=spares)
+            if self.tracking:
+                self.roi_hands = HandsPool(self._create_hands, spares=spares)
             self._frame_count = 0
         
         self._frame_count += 1
         
-        # Convert BGR to RGB
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        hand_landmarks = None
+        if self.tracking and self._roi is not None:
+            self.roi_frames += 1
+            hand_landmarks = self._detect_in_roi(frame)
+            if hand_landmarks is None:
+                self.tracking_lost += 1
         
-        # Process frame
-        results = self.hands.process(frame_rgb)
+        if hand_landmarks is None:
+            # Convert BGR to RGB
+            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self._rgb.next(frame.shape))
+            
+            # Process frame
+            self.full_frames += 1
+            results = self.hands.process(frame_rgb)
+            if results.multi_hand_landmarks:
+                hand_landmarks = results.multi_hand_landmarks[0]
         
         landmarks = None
         hand_present = False
+        self._roi = None
         
-        if results.multi_hand_landmarks:
+        if hand_landmarks is not None:
             hand_present = True
-            hand_landmarks = results.multi_hand_landmarks[0]
             
             # Extract landmark coordinates
-            landmarks = []
-            for landmark in hand_landmarks.landmark:
-                landmarks.extend([landmark.x, landmark.y, landmark.z])
-            landmarks = np.array(landmarks)
+            landmarks = landmarks_into(hand_landmarks, self._landmarks.next((63,)))
+            
+            if self.tracking:
+                self._roi = self._next_roi(landmarks, frame.shape[1], frame.shape[0])
+            if self.skip_frames:
+                error = self.predictor.update(landmarks, self._frame_index)
+                self._skip_budget = self._plan_skips(error)
             
             # Draw landmarks on frame
             self.mp_drawing.draw_landmarks(
@@ -87,38 +464,53 @@ class HandDetector:
                 self.mp_drawing_styles.get_default_hand_connections_style()
             )
         
+        elif self.skip_frames:
+            self.predictor.reset()
+        
         return frame, landmarks, hand_present
     
-    def extract_hand_region(self, frame, landmarks_raw):
-        """Extract and isolate hand region with black background"""
+    def extract_hand_region(self, frame, landmarks_raw, out=None):
+        """Extract and isolate hand region with black background
+        
+        Pass a preallocated out (same shape as frame) to avoid allocating.
+        """
         if landmarks_raw is None:
             return frame
         
         h, w, _ = frame.shape
         
-        # Get bounding box from landmarks
-        x_coords = [landmarks_raw[i] for i in range(0, len(landmarks_raw), 3)]
-        y_coords = [landmarks_raw[i] for i in range(1, len(landmarks_raw), 3)]
-        
-        x_min = int(min(x_coords) * w) - 20
-        x_max = int(max(x_coords) * w) + 20
-        y_min = int(min(y_coords) * h) - 20
-        y_max = int(max(y_coords) * h) + 20
-        
-        # Ensure bounds are within frame
-        x_min = max(0, x_min)
-        x_max = min(w, x_max)
-        y_min = max(0, y_min)
-        y_max = min(h, y_max)
+        # Get bounding box from landmarks (within frame bounds)
+        x_min, y_min, x_max, y_max = hand_bbox(landmarks_raw, w, h, margin=20)
         
         # Create black background
-        black_frame = np.zeros_like(frame)
+        if out is None:
+            black_frame = np.zeros_like(frame)
+        else:
+            black_frame = out
+            black_frame.fill(0)
         
         # Copy hand region to black background
         black_frame[y_min:y_max, x_min:x_max] = frame[y_min:y_max, x_min:x_max]
         
         return black_frame
     
+    def stats(self):
+        """Tracking, frame-skipping and detector pool counters"""
+        return {
+            'tracking': self.tracking,
+            'roi_frames': self.roi_frames,
+            'full_frames': self.full_frames,
+            'tracking_lost': self.tracking_lost,
+            'predicted_frames': self.predicted_frames,
+            'forced_detections': self.forced_detections,
+            'pool': self.hands.stats() if self.hands is not None else None
+        }
+    
     def close(self):
         """Release resources"""
-        self.hands.close()
+        if self.hands is not None:
+            self.hands.close()
+            self.hands = None
+        if self.roi_hands is not None:
+            self.roi_hands.close()
+            self.roi_hands = None
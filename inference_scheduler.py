@@ -0,0 +1,229 @@
+"""
+Voxora.AI - Inference Scheduler Module
+Collects landmark vectors from all active streams and runs them through
+the classifier as one batch (micro-batching)
+"""
+
+import os
+import time
+import threading
+import numpy as np
+from numpy_inference import load_classifier
+
+
+class _PendingRequest:
+    __slots__ = ('landmarks', 'done', 'result', 'error')
+
+    def __init__(self, landmarks):
+        self.landmarks = landmarks
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class MicroBatchScheduler:
+    """Batches single-frame predictions from concurrent callers.
+
+    A batch is flushed when it reaches max_batch_size, when every stream
+    seen in the last second has a request queued, or when the oldest
+    request has waited max_delay_ms. Each caller gets back its own row.
+    """
+
+    def __init__(self, predict_fn, max_batch_size=16, max_delay_ms=3.0, stream_timeout=1.0):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay_ms / 1000.0
+        self.stream_timeout = stream_timeout
+
+        self._queue = []
+        self._oldest_time = 0.0
+        self._streams = {}  # thread id -> last submit time
+        self._condition = threading.Condition()
+        self._running = False
+        self._thread = None
+
+        # Stats
+        self.batches = 0
+        self.requests = 0
+        self.max_seen_batch = 0
+
+    def start(self):
+        """Start the background flush thread"""
+        with self._condition:
+            if self._running:
+                return self
+            self._running = True
+        self._thread = threading.Thread(target=self._run, name='micro-batch-scheduler', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop the flush thread; queued requests are still served"""
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def predict(self, landmarks):
+        """Blocking prediction for a single flat landmark vector"""
+        request = _PendingRequest(np.asarray(landmarks, dtype=np.float32).reshape(-1))
+        now = time.perf_counter()
+
+        with self._condition:
+            if not self._running:
+                raise RuntimeError("MicroBatchScheduler is not running")
+            if not self._queue:
+                self._oldest_time = now
+            self._queue.append(request)
+            self._streams[threading.get_ident()] = now
+            self._condition.notify()
+
+        request.done.wait()
+        if request.error is not None:
+            raise request.error
+        return request.result
+
+    def _active_streams(self, now):
+        stale = [ident for ident, last in self._streams.items() if now - last > self.stream_timeout]
+        for ident in stale:
+            del self._streams[ident]
+        return max(1, len(self._streams))
+
+    def _next_batch(self):
+        """Wait for a flush condition and take up to max_batch_size requests"""
+        with self._condition:
+            while True:
+                if not self._queue:
+                    if not self._running:
+                        return None
+                    self._condition.wait()
+                    continue
+
+                now = time.perf_counter()
+                waited = now - self._oldest_time
+                if (len(self._queue) >= self.max_batch_size or
+                        len(self._queue) >= self._active_streams(now) or
+                        waited >= self.max_delay or
+                        not self._running):
+                    break
+                self._condition.wait(self.max_delay - waited)
+
+            batch = self._queue[:self.max_batch_size]
+            del self._queue[:self.max_batch_size]
+            if self._queue:
+                self._oldest_time = time.perf_counter()
+            return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+
+            try:
+                inputs = np.stack([request.landmarks for request in batch])
+                outputs = np.asarray(self.predict_fn(inputs))
+                for request, row in zip(batch, outputs):
+                    request.result = row
+            except Exception as e:
+                for request in batch:
+                    request.error = e
+            finally:
+                for request in batch:
+                    request.done.set()
+
+            self.batches += 1
+            self.requests += len(batch)
+            self.max_seen_batch = max(self.max_seen_batch, len(batch))
+
+    def stats(self):
+        """Batching counters for the stats endpoint"""
+        return {
+            'batches': self.batches,
+            'requests': self.requests,
+            'mean_batch_size': self.requests / self.batches if self.batches else 0.0,
+            'max_batch_size_seen': self.max_seen_batch,
+            'queued': len(self._queue)
+        }
+
+
+def simulate_streams(predict, num_streams, duration=3.0, input_dim=63, frame_interval=0.0):
+    """Run num_streams threads calling predict() and collect latencies (ms)"""
+    latencies = [[] for _ in range(num_streams)]
+    stop_at = time.perf_counter() + duration
+    barrier = threading.Barrier(num_streams)
+
+    def stream(idx):
+        rng = np.random.default_rng(idx)
+        sample = rng.random(input_dim, dtype=np.float32)
+        barrier.wait()
+        while time.perf_counter() < stop_at:
+            start = time.perf_counter()
+            predict(sample)
+            latencies[idx].append((time.perf_counter() - start) * 1000)
+            if frame_interval:
+                time.sleep(frame_interval)
+
+    threads = [threading.Thread(target=stream, args=(i,)) for i in range(num_streams)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    all_latencies = np.concatenate([np.asarray(l) for l in latencies])
+    return {
+        'throughput': len(all_latencies) / duration,
+        'p50_ms': float(np.percentile(all_latencies, 50)),
+        'p99_ms': float(np.percentile(all_latencies, 99))
+    }
+
+
+def main():
+    """Throughput vs p99 latency for 1, 4, 16 and 64 simulated streams"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Micro-batching throughput/latency report")
+    parser.add_argument('--model', default=os.path.join('models', 'signity_model.h5'))
+    parser.add_argument('--streams', type=int, nargs='+', default=[1, 4, 16, 64])
+    parser.add_argument('--max-batch-size', type=int, default=16)
+    parser.add_argument('--max-delay-ms', type=float, default=3.0)
+    parser.add_argument('--duration', type=float, default=3.0)
+    args = parser.parse_args()
+
+    model = load_classifier(args.model)
+    predict_fn = lambda batch: model.predict(batch, verbose=0)
+    predict_lock = threading.Lock()
+
+    def direct_predict(sample):
+        # Today's behaviour: one serialized batch-of-one call per frame
+        with predict_lock:
+            return predict_fn(sample.reshape(1, -1))[0]
+
+    print("\n" + "="*70)
+    print("  MICRO-BATCHING REPORT")
+    print(f"  max_batch_size={args.max_batch_size}  max_delay_ms={args.max_delay_ms}")
+    print("="*70)
+    print(f"\n{'Streams':<9} {'Mode':<10} {'req/s':>10} {'p50':>10} {'p99':>10} {'batch':>7}")
+    print("-" * 60)
+
+    for num_streams in args.streams:
+        direct = simulate_streams(direct_predict, num_streams, args.duration)
+        print(f"{num_streams:<9} {'direct':<10} {direct['throughput']:>10.0f} "
+              f"{direct['p50_ms']:>8.2f}ms {direct['p99_ms']:>8.2f}ms {1:>7.1f}")
+
+        scheduler = MicroBatchScheduler(predict_fn, args.max_batch_size, args.max_delay_ms).start()
+        try:
+            batched = simulate_streams(scheduler.predict, num_streams, args.duration)
+        finally:
+            scheduler.stop()
+        print(f"{num_streams:<9} {'batched':<10} {batched['throughput']:>10.0f} "
+              f"{batched['p50_ms']:>8.2f}ms {batched['p99_ms']:>8.2f}ms "
+              f"{scheduler.stats()['mean_batch_size']:>7.1f}")
+
+    print("="*70)
+
+
+if __name__ == "__main__":
+    main()
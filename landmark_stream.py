@@ -0,0 +1,115 @@
+"""
+Voxora.AI - Landmark Stream Module
+Compact per-frame events (landmarks, prediction, confidence, word state)
+streamed as Server-Sent Events instead of MJPEG, so clients draw the
+skeleton over their own video
+"""
+
+import json
+import time
+import numpy as np
+
+
+def landmark_event(packet, state=None, precision=4):
+    """JSON-ready dict for one FramePacket.
+
+    Landmarks are the 63 normalized image coordinates of the mirrored
+    frame, rounded to `precision` decimals (None when no hand is visible).
+    state is a RecognitionSession.update() result; without one the raw
+    frame prediction is sent and the word fields are empty.
+    """
+    landmarks = None
+    if packet.landmarks is not None:
+        landmarks = np.round(np.asarray(packet.landmarks, dtype=np.float64), precision).tolist()
+    if state is None:
+        state = {'pred': packet.prediction, 'conf': packet.confidence}
+    return {
+        'hand': bool(packet.hand_present),
+        'lm': landmarks,
+        'pred': state.get('pred'),
+        'conf': round(float(state.get('conf', 0.0)), 3),
+        'word': state.get('word', ''),
+        'sentence': state.get('sentence', '')
+    }
+
+
+def format_sse(payload, event=None, event_id=None):
+    """One Server-Sent Event with a compact JSON data line"""
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    if event is not None:
+        lines.append(f"event: {event}")
+    lines.append("data: " + json.dumps(payload, separators=(',', ':')))
+    return ("\n".join(lines) + "\n\n").encode('utf-8')
+
+
+def main():
+    """Compare bytes/s and server CPU of the MJPEG and landmark streams"""
+    import argparse
+    import cv2
+    from frame_sources import open_source, detect_recorded
+    from frame_pipeline import FramePacket
+
+    parser = argparse.ArgumentParser(description="MJPEG vs landmark stream cost")
+    parser.add_argument('source', help="Video file or image directory (camera:0 also works)")
+    parser.add_argument('--frames', type=int, default=300)
+    parser.add_argument('--quality', type=int, default=80, help="JPEG quality used by /video_feed")
+    args = parser.parse_args()
+
+    source = open_source(args.source, realtime=False)
+    detector = source.create_detector()
+    if detector is None:
+        from hand_detector import HandDetector
+        detector = HandDetector()
+
+    encode_param = [int(cv2.IMWRITE_JPEG_QUALITY), args.quality]
+    jpeg_bytes, jpeg_cpu = 0, 0.0
+    event_bytes, event_cpu = 0, 0.0
+    frames = 0
+
+    try:
+        for frame, recorded in source.iter_recorded():
+            packet = FramePacket(cv2.flip(frame, 1))
+            packet.frame, packet.landmarks, packet.hand_present = detect_recorded(detector, packet.frame, recorded)
+
+            start = time.process_time()
+            _, buffer = cv2.imencode('.jpg', packet.frame, encode_param)
+            chunk = b'--frame\r\nContent-Type: image/jpeg\r\n\r\n' + buffer.tobytes() + b'\r\n'
+            jpeg_cpu += time.process_time() - start
+            jpeg_bytes += len(chunk)
+
+            start = time.process_time()
+            event = format_sse(landmark_event(packet))
+            event_cpu += time.process_time() - start
+            event_bytes += len(event)
+
+            frames += 1
+            if frames >= args.frames:
+                break
+    finally:
+        fps = source.fps
+        source.release()
+        detector.close()
+
+    if frames == 0:
+        print("❌ Source produced no frames")
+        return
+
+    print("\n" + "="*70)
+    print(f"  STREAM COST - {frames} frames at {fps:.0f} FPS")
+    print("="*70)
+    print(f"\n{'Stream':<16} {'Bytes/frame':>12} {'KB/s':>10} {'CPU ms/frame':>14} {'CPU %':>8}")
+    print("-" * 64)
+    for name, total_bytes, cpu in (('/video_feed', jpeg_bytes, jpeg_cpu),
+                                   ('/landmark_feed', event_bytes, event_cpu)):
+        per_frame_ms = cpu * 1000 / frames
+        print(f"{name:<16} {total_bytes / frames:>12.0f} {total_bytes / frames * fps / 1024:>10.1f} "
+              f"{per_frame_ms:>14.3f} {per_frame_ms * fps / 10:>7.1f}%")
+    print(f"\n   Bandwidth reduction: {jpeg_bytes / max(event_bytes, 1):.0f}x")
+    print("   (detection cost is the same for both streams and is excluded)")
+    print("="*70)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+"""
+Voxora.AI - Landmark Utilities
+Shared helpers for working with flat 63-value MediaPipe hand landmark vectors
+"""
+
+import numpy as np
+from config import NUM_LANDMARKS, LANDMARK_DIMS
+
+
+def normalize_landmarks(landmarks):
+    """Wrist-relative, scale-normalized copy of a flat landmark vector.
+
+    Translating the wrist to the origin and dividing by the largest
+    wrist-to-landmark distance makes the vector independent of where the
+    hand is in the frame and how close it is to the camera.
+    """
+    points = np.asarray(landmarks, dtype=np.float32).reshape(NUM_LANDMARKS, LANDMARK_DIMS)
+    points = points - points[0]
+    scale = np.sqrt((points[:, :2] ** 2).sum(axis=1).max())
+    if scale > 1e-6:
+        points /= scale
+    return points.reshape(-1)
+
+
+def landmark_distance(a, b):
+    """Mean per-landmark Euclidean distance between two flat vectors"""
+    diff = (np.asarray(a) - np.asarray(b)).reshape(-1, LANDMARK_DIMS)
+    return float(np.sqrt((diff ** 2).sum(axis=1)).mean())
@@ -0,0 +1,448 @@
+"""
+Voxora.AI - Lexicon Decoder Module
+CTC-style prefix beam search over the per-frame class probabilities,
+constrained to a prefix trie of a word list, so letters need no hold time:
+a word is emitted at the next word boundary (space sign or hand lowered)
+"""
+
+import math
+import os
+import time
+from collections import Counter
+import numpy as np
+
+NEG_INF = float('-inf')
+
+
+def _logaddexp(a, b):
+    if a == NEG_INF:
+        return b
+    if b == NEG_INF:
+        return a
+    if a > b:
+        return a + math.log1p(math.exp(b - a))
+    return b + math.log1p(math.exp(a - b))
+
+
+class _TrieNode:
+    __slots__ = ('children', 'is_word')
+
+    def __init__(self):
+        self.children = {}
+        self.is_word = False
+
+
+class PrefixTrie:
+    """Uppercase A-Z words; anything else in a word list is skipped"""
+
+    def __init__(self, words=()):
+        self.root = _TrieNode()
+        self.words = 0
+        for word in words:
+            self.add(word)
+
+    @classmethod
+    def load(cls, path):
+        """One word per line"""
+        with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+            return cls(line.strip() for line in f)
+
+    def add(self, word):
+        word = word.upper()
+        if not word or not all('A' <= letter <= 'Z' for letter in word):
+            return
+        node = self.root
+        for letter in word:
+            node = node.children.setdefault(letter, _TrieNode())
+        if not node.is_word:
+            node.is_word = True
+            self.words += 1
+
+    def find(self, prefix):
+        node = self.root
+        for letter in prefix:
+            node = node.children.get(letter)
+            if node is None:
+                return None
+        return node
+
+    def __contains__(self, word):
+        node = self.find(word.upper())
+        return node is not None and node.is_word
+
+
+class LexiconDecoder:
+    """Streaming prefix beam search for the word being signed.
+
+    Letter classes (single letters A-Z in the class mapping) are CTC
+    symbols. The classifier has no trained blank, so a frame's blank
+    probability is its non-letter mass ('nothing', 'space', 'del') or its
+    uncertainty (1 - top letter), whichever is larger: transitions
+    between letters are cheap to wait out. Letter probabilities are
+    mixed with `floor` of a uniform distribution so one misclassified
+    frame does not end a held letter.
+
+    A prefix is only extended by letters its trie node allows, so a stray
+    letter that cannot continue any word dies out of the beam instead of
+    being typed. Only letters with probability >= min_prob are tried, and
+    each new letter costs letter_penalty (log units). The same letter
+    twice needs a blank (a short pause) in between, as in CTC, and costs
+    repeat_penalty on top.
+
+    update() returns a word when one ends: after boundary_frames frames
+    in a row of 'space' or without a hand. The word is the best beam
+    that is a complete lexicon word, or the best prefix if none is.
+    Words outside the list can never be decoded, since every prefix
+    follows the trie.
+    """
+
+    def __init__(self, trie, beam_width=8, min_prob=1e-3, letter_penalty=-2.0, repeat_penalty=-4.0,
+                 floor=0.05, boundary_frames=6):
+        self.trie = trie
+        self.beam_width = beam_width
+        self.min_prob = min_prob
+        self.letter_penalty = letter_penalty
+        self.repeat_penalty = repeat_penalty
+        self.floor = floor
+        self.boundary_frames = boundary_frames
+        self._mapping = None
+        self._letters = []  # (letter, class index)
+        self._space = None
+        self.reset()
+
+        # Stats
+        self.frames = 0
+        self.words = 0
+        self.cpu_ms = 0.0
+
+    def reset(self):
+        self.clear_word()
+
+    def clear_word(self):
+        """Drop the word being signed"""
+        self._beams = {'': [0.0, NEG_INF, self.trie.root]}  # prefix -> [log p blank, log p non-blank, node]
+        self._boundary_run = 0
+
+    def _set_mapping(self, class_mapping):
+        self._mapping = class_mapping
+        self._letters = []
+        self._space = None
+        for index, name in class_mapping.items():
+            if len(name) == 1 and 'A' <= name <= 'Z':
+                self._letters.append((name, int(index)))
+            elif name == 'space':
+                self._space = int(index)
+
+    def update(self, probabilities, class_mapping=None):
+        """Advance by one frame (probabilities=None: no hand); the finished word or None"""
+        start = time.process_time()
+        self.frames += 1
+        try:
+            if probabilities is None:
+                return self._boundary()
+            if class_mapping is not None and class_mapping is not self._mapping:
+                self._set_mapping(class_mapping)
+
+            if self._space is not None and int(np.argmax(probabilities)) == self._space:
+                self._step(probabilities)
+                return self._boundary()
+            self._boundary_run = 0
+            self._step(probabilities)
+            return None
+        finally:
+            self.cpu_ms += (time.process_time() - start) * 1000
+
+    def _boundary(self):
+        self._boundary_run += 1
+        if self._boundary_run >= self.boundary_frames and self.hypothesis():
+            return self.end_word()
+        return None
+
+    def at_boundary(self):
+        """True on the frame a word boundary is reached, even with no word to emit"""
+        return self._boundary_run == self.boundary_frames
+
+    def _step(self, probabilities):
+        letter_probs = {}
+        for letter, index in self._letters:
+            letter_probs[letter] = float(probabilities[index])
+        letter_mass = sum(letter_probs.values())
+        blank = max(1.0 - letter_mass, 1.0 - max(letter_probs.values(), default=0.0), 1e-6)
+        log_blank = math.log(blank)
+        if self.floor and letter_probs:
+            uniform = self.floor * letter_mass / len(letter_probs)
+            letter_probs = {letter: (1.0 - self.floor) * p + uniform for letter, p in letter_probs.items()}
+        candidates = [(letter, math.log(p)) for letter, p in letter_probs.items() if p >= self.min_prob]
+
+        beams = {}
+
+        def add(prefix, node, blank_score, letter_score):
+            entry = beams.get(prefix)
+            if entry is None:
+                beams[prefix] = [blank_score, letter_score, node]
+            else:
+                entry[0] = _logaddexp(entry[0], blank_score)
+                entry[1] = _logaddexp(entry[1], letter_score)
+
+        for prefix, (p_blank, p_letter, node) in self._beams.items():
+            total = _logaddexp(p_blank, p_letter)
+            add(prefix, node, total + log_blank, NEG_INF)
+            if prefix:
+                # Holding the last letter keeps the prefix
+                last_prob = letter_probs.get(prefix[-1], 0.0)
+                if last_prob > 0:
+                    add(prefix, node, NEG_INF, p_letter + math.log(last_prob))
+            for letter, log_prob in candidates:
+                child = node.children.get(letter)
+                if child is None:
+                    continue
+                # A repeated letter only counts after a blank
+                if prefix and letter == prefix[-1]:
+                    source, penalty = p_blank, self.letter_penalty + self.repeat_penalty
+                else:
+                    source, penalty = total, self.letter_penalty
+                if source > NEG_INF:
+                    add(prefix + letter, child, NEG_INF, source + log_prob + penalty)
+
+        ranked = sorted(beams.items(), key=lambda item: _logaddexp(item[1][0], item[1][1]), reverse=True)
+        self._beams = dict(ranked[:self.beam_width])
+
+    def hypotheses(self, k=None):
+        """[(prefix, log score, is a complete word)], best first"""
+        ranked = sorted(((prefix, _logaddexp(p_blank, p_letter), node.is_word)
+                         for prefix, (p_blank, p_letter, node) in self._beams.items()),
+                        key=lambda item: item[1], reverse=True)
+        return ranked[:k] if k else ranked
+
+    def hypothesis(self):
+        """Best prefix of the word being signed"""
+        return self.hypotheses(1)[0][0]
+
+    def end_word(self):
+        """Emit the best word now (e.g. on a manual space) and start the next"""
+        ranked = self.hypotheses()
+        words = [prefix for prefix, _, is_word in ranked if is_word and prefix]
+        word = words[0] if words else ranked[0][0]
+        self.clear_word()
+        if not word:
+            return None
+        self.words += 1
+        return word
+
+    def stats(self):
+        return {
+            'frames': self.frames,
+            'words': self.words,
+            'cpu_us_per_frame': self.cpu_ms * 1000 / self.frames if self.frames else 0.0,
+            'hypothesis': self.hypothesis()
+        }
+
+
+def word_error_rate(reference, hypothesis):
+    """Word-level edit distance divided by the reference length"""
+    reference, hypothesis = reference.split(), hypothesis.split()
+    distances = list(range(len(hypothesis) + 1))
+    for i, ref_word in enumerate(reference, 1):
+        previous, distances[0] = distances[0], i
+        for j, hyp_word in enumerate(hypothesis, 1):
+            previous, distances[j] = distances[j], min(distances[j] + 1, distances[j - 1] + 1,
+                                                       previous + (ref_word != hyp_word))
+    return distances[-1] / max(len(reference), 1)
+
+
+def unmatched_letters(spelled, word):
+    """Letters of spelled that word cannot account for.
+
+    Runs of one letter are collapsed first (holding a letter too long
+    repeats it), then the longest common subsequence is matched, so
+    letters spelled too briefly to be held do not count.
+    """
+    def collapse(text):
+        return [letter for i, letter in enumerate(text) if i == 0 or letter != text[i - 1]]
+
+    spelled, word = collapse(spelled), collapse(word)
+    common = [0] * (len(word) + 1)
+    for letter in spelled:
+        previous = 0
+        for j, other in enumerate(word, 1):
+            previous, common[j] = common[j], previous + 1 if letter == other else max(common[j], common[j - 1])
+    return len(spelled) - common[-1]
+
+
+def synthetic_session(words, class_mapping, frames_per_letter, rng, transition=3, boundary=8,
+                      confusion=0.05):
+    """Per-frame probabilities of a signer spelling words, with noisy frames.
+
+    Letters are held for frames_per_letter frames, with transition frames
+    of a random letter in between and boundary frames of 'space' between
+    words; a fraction of held frames is confused with another letter.
+    """
+    index = {name: int(i) for i, name in class_mapping.items()}
+    letters = [name for name in index if len(name) == 1]
+    num_classes = len(class_mapping)
+
+    def frame(name, peak):
+        probabilities = rng.dirichlet(np.full(num_classes, 0.1)) * (1 - peak)
+        if name is not None:
+            probabilities[index[name]] += peak
+        return probabilities
+
+    frames = []
+    for word in words:
+        for position, letter in enumerate(word):
+            if position:
+                gap = letter == word[position - 1]  # the pause that separates double letters
+                for _ in range(transition):
+                    frames.append(frame(None if gap else str(rng.choice(letters)), rng.uniform(0.4, 0.8)))
+            for _ in range(frames_per_letter):
+                noisy = rng.random() < confusion
+                frames.append(frame(str(rng.choice(letters)) if noisy else letter, rng.uniform(0.8, 0.99)))
+        for _ in range(boundary):
+            frames.append(frame('space', rng.uniform(0.8, 0.99)))
+    return np.stack(frames)
+
+
+def replay(frames, class_mapping, session, fps=30.0):
+    """Feed a probability stream (None = no hand) through a RecognitionSession; final text"""
+    for i, probabilities in enumerate(frames):
+        if probabilities is None:
+            session.update(None, 0.0, frame_at=i, now=i / fps)
+            continue
+        class_idx = int(np.argmax(probabilities))
+        predicted_class = class_mapping.get(str(class_idx), str(class_idx))
+        session.update(predicted_class, float(probabilities[class_idx]), frame_at=i, now=i / fps,
+                       probabilities=probabilities, class_mapping=class_mapping)
+    current_word, sentence = session.text()
+    return (sentence + current_word).strip()
+
+
+def recorded_sessions(paths, model):
+    """(transcript, probability stream) for landmark recordings with a transcript.
+
+    The transcript is a .txt file next to each recording (take1.npz ->
+    take1.txt) holding the words that were signed; recordings without one
+    are skipped. Rows without a hand become None.
+    """
+    from prediction_cache import load_landmark_streams
+
+    sessions = []
+    for path in paths:
+        transcript_path = os.path.splitext(path)[0] + '.txt'
+        if not os.path.exists(transcript_path):
+            print(f"⚠️  No transcript for {path} (expected {transcript_path})")
+            continue
+        with open(transcript_path, 'r', encoding='utf-8') as f:
+            transcript = ' '.join(f.read().upper().split())
+        for _, landmarks in load_landmark_streams([path]):
+            landmarks = landmarks.astype(np.float32)
+            hand = ~np.isnan(landmarks).any(axis=1)
+            stream = [None] * len(landmarks)
+            if hand.any():
+                for i, probabilities in zip(np.flatnonzero(hand), model.predict(landmarks[hand], verbose=0)):
+                    stream[i] = probabilities
+            sessions.append((transcript, stream))
+    return sessions
+
+
+def main():
+    """Letters per minute, word error rate and CPU: hold-time state machine vs decoder"""
+    import argparse
+    import json
+    from recognition_session import RecognitionSession
+
+    parser = argparse.ArgumentParser(description="Lexicon decoder vs letter hold time on replayed sessions")
+    parser.add_argument('--words', required=True, help="Word list, one per line (e.g. the server's lexicon_path)")
+    parser.add_argument('--class-mapping', default=os.path.join('models', 'custom_class_mapping.json'))
+    parser.add_argument('--sessions', type=int, default=20)
+    parser.add_argument('--words-per-session', type=int, default=6)
+    parser.add_argument('--frames-per-letter', type=int, nargs='+', default=[45, 30, 15, 10, 6])
+    parser.add_argument('--beam-width', type=int, nargs='+', default=[4, 8, 16])
+    parser.add_argument('--oov', type=float, default=0.2, help="Share of spelled words that are not in the list")
+    parser.add_argument('--replay', nargs='+', default=None,
+                        help="Landmark recordings (.npz / .npy) with a .txt transcript each, run through --model "
+                             "instead of synthetic sessions")
+    parser.add_argument('--model', default=os.path.join('models', 'signity_custom_model.h5'),
+                        help="Classifier for --replay, matching --class-mapping")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.words):
+        print(f"❌ Word list not found: {args.words}")
+        return
+    trie = PrefixTrie.load(args.words)
+    with open(args.class_mapping, 'r') as f:
+        class_mapping = json.load(f)['model_to_class']
+    vocabulary = [line.strip().upper() for line in open(args.words, encoding='utf-8', errors='ignore')
+                  if line.strip().upper() in trie and 2 <= len(line.strip()) <= 8]
+    rng = np.random.default_rng(0)
+    alphabet = np.array([chr(ord('A') + i) for i in range(26)])
+
+    def oov_word():
+        while True:
+            word = ''.join(rng.choice(alphabet, rng.integers(3, 7)))
+            if word not in trie:
+                return word
+
+    def synthetic_sessions(frames_per_letter):
+        sessions = []
+        for _ in range(args.sessions):
+            words = [oov_word() if rng.random() < args.oov else str(rng.choice(vocabulary))
+                     for _ in range(args.words_per_session)]
+            sessions.append((' '.join(words), synthetic_session(words, class_mapping, frames_per_letter, rng)))
+        return sessions
+
+    if args.replay:
+        from numpy_inference import load_classifier
+        sessions = recorded_sessions(args.replay, load_classifier(args.model))
+        if not sessions:
+            print("❌ No recordings with a transcript")
+            return
+        conditions = [('recorded', sessions)]
+        title = f"{len(sessions)} recorded sessions"
+    else:
+        conditions = [(frames_per_letter, synthetic_sessions(frames_per_letter))
+                      for frames_per_letter in args.frames_per_letter]
+        title = f"{args.sessions} sessions x {args.words_per_session} words"
+
+    print("\n" + "="*70)
+    print(f"  LEXICON DECODER - {title}, {trie.words:,} lexicon words")
+    print("="*70)
+    print(f"\n{'Decoder':<14} {'frames/letter':>14} {'WER':>8} {'OOV WER':>8} {'letters/min':>12} {'CPU/frame':>11}")
+    print("-" * 73)
+
+    for frames_per_letter, sessions in conditions:
+        minutes = sum(len(frames) for _, frames in sessions) / 30.0 / 60.0
+
+        modes = [('hold 1.0s', lambda: RecognitionSession('benchmark'), None)]
+        modes += [(f"beam {width}", lambda width=width: RecognitionSession(
+                      'benchmark', decoder=LexiconDecoder(trie, beam_width=width)), width)
+                  for width in args.beam_width]
+        for name, factory, _ in modes:
+            errors, correct_letters, cpu_ms, frames = 0.0, 0, 0.0, 0
+            oov_words, oov_missed = 0, 0
+            for reference, stream in sessions:
+                session = factory()
+                text = replay(stream, class_mapping, session)
+                errors += word_error_rate(reference, text)
+                matched = Counter(reference.split()) & Counter(text.split())
+                correct_letters += sum(len(word) * count for word, count in matched.items())
+                oov = Counter(word for word in reference.split() if word not in trie)
+                oov_words += sum(oov.values())
+                oov_missed += sum((oov - matched).values())
+                if session.decoder is not None:
+                    cpu_ms += session.decoder.cpu_ms
+                    frames += session.decoder.frames
+            cpu = f"{cpu_ms * 1000 / frames:>9.1f}µs" if frames else f"{'-':>11}"
+            oov_wer = f"{oov_missed / oov_words * 100:>7.1f}%" if oov_words else f"{'-':>8}"
+            print(f"{name:<14} {frames_per_letter:>14} {errors / len(sessions) * 100:>7.1f}% {oov_wer} "
+                  f"{correct_letters / minutes:>12.1f} {cpu}")
+
+    print("\n   letters/min = letters of correctly decoded words per minute of signing (30 FPS)")
+    print("   WER = word error rate against the spelled words")
+    oov_share = "in the transcripts" if args.replay else f"{args.oov:.0%} of words"
+    print(f"   OOV WER = share of the words outside the list ({oov_share}) missing from the text;")
+    print("   the decoder can only type them through the hold-time fallback")
+    print("="*70)
+
+
+if __name__ == "__main__":
+    main()
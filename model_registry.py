@@ -0,0 +1,243 @@
+"""
+Voxora.AI - Model Registry Module
+Indexes the timestamped model_backups/ directories, preloads a candidate in
+the background and swaps it in atomically under live traffic
+"""
+
+import os
+import re
+import time
+import threading
+
+
+class ServingModel:
+    """Everything the hot path needs from one model version.
+
+    predict_sign reads the registry's active ServingModel once per frame,
+    so the classifier, its class mapping and its helpers always match.
+    """
+
+    def __init__(self, classifier, class_mapping, confusion_resolver=None, scheduler=None):
+        self.classifier = classifier
+        self.class_mapping = class_mapping
+        self.confusion_resolver = confusion_resolver
+        self.scheduler = scheduler
+
+    def close(self):
+        if self.scheduler is not None:
+            self.scheduler.stop()
+
+
+class ModelVersion:
+    def __init__(self, name, model_path, class_mapping_path=None, scaler_path=None,
+                 accuracy=None, created=None, fast_model_path=None, fast_class_mapping_path=None):
+        self.name = name
+        self.model_path = model_path
+        self.class_mapping_path = class_mapping_path
+        self.scaler_path = scaler_path
+        self.fast_model_path = fast_model_path  # cascade first stage
+        self.fast_class_mapping_path = fast_class_mapping_path  # saved when the fast model was trained
+        self.accuracy = accuracy
+        self.created = created
+
+        # Set by the registry
+        self.state = 'available'  # available | loading | ready | active | failed
+        self.load_time_ms = None
+        self.error = None
+        self.serving = None
+
+    def to_dict(self):
+        return {
+            'version': self.name,
+            'state': self.state,
+            'accuracy': self.accuracy,
+            'created': self.created,
+            'load_time_ms': self.load_time_ms,
+            'error': self.error
+        }
+
+
+def read_model_info(info_path):
+    """Parse the model_info.txt written by CustomModelTrainer.create_model_backup"""
+    info = {}
+    if not os.path.exists(info_path):
+        return info
+    with open(info_path, 'r') as f:
+        for line in f:
+            if ':' in line:
+                key, value = line.split(':', 1)
+                info[key.strip()] = value.strip()
+    return info
+
+
+class ModelRegistry:
+    """Versioned models with background preload, atomic swap and rollback.
+
+    loader(version) must return a ServingModel; it runs on a background
+    thread so live streams keep using the active model while it loads.
+    The previous version stays loaded for instant rollback; older ones are
+    closed after retire_delay so frames already in flight can finish.
+    """
+
+    def __init__(self, loader, backup_dir='model_backups', retire_delay=2.0, on_swap=None):
+        self.loader = loader
+        self.backup_dir = backup_dir
+        self.retire_delay = retire_delay
+        self.on_swap = on_swap  # called with the new ServingModel after each swap
+
+        self._versions = {}
+        self._lock = threading.Lock()
+        self._active = None
+        self._previous = None
+        self._activate_when_ready = None
+
+    @property
+    def active(self):
+        """ServingModel of the active version (a single attribute read)"""
+        version = self._active
+        return version.serving if version is not None else None
+
+    @property
+    def active_version(self):
+        return self._active.name if self._active is not None else None
+
+    def scan(self):
+        """Index model_backups/<name>/model.h5 directories"""
+        if not os.path.isdir(self.backup_dir):
+            return self.list_versions()
+
+        for name in sorted(os.listdir(self.backup_dir)):
+            directory = os.path.join(self.backup_dir, name)
+            model_path = os.path.join(directory, 'model.h5')
+            if not os.path.exists(model_path):
+                continue
+
+            with self._lock:
+                if name in self._versions:
+                    continue
+
+                info = read_model_info(os.path.join(directory, 'model_info.txt'))
+                accuracy = None
+                match = re.match(r'([\d.]+)', info.get('Test Accuracy', ''))
+                if match:
+                    accuracy = float(match.group(1))
+
+                mapping_path = os.path.join(directory, 'class_mapping.json')
+                scaler_path = os.path.join(directory, 'scaler.pkl')
+                # Backups made before the scaler was baked into the model need it applied
+                needs_scaler = os.path.exists(scaler_path) and 'raw' not in info.get('Input', '')
+                self._versions[name] = ModelVersion(
+                    name, model_path,
+                    class_mapping_path=mapping_path if os.path.exists(mapping_path) else None,
+                    scaler_path=scaler_path if needs_scaler else None,
+                    accuracy=accuracy,
+                    created=info.get('Created')
+                )
+        return self.list_versions()
+
+    def add(self, version):
+        """Register a version that is not in model_backups/ (e.g. the default model)"""
+        with self._lock:
+            self._versions[version.name] = version
+        return version
+
+    def get(self, name):
+        with self._lock:
+            version = self._versions.get(name)
+        if version is None:
+            raise KeyError(f"Unknown model version: {name}")
+        return version
+
+    def list_versions(self):
+        with self._lock:
+            return [version.to_dict() for version in self._versions.values()]
+
+    def _load(self, version, activate):
+        start = time.perf_counter()
+        try:
+            serving = self.loader(version)
+        except Exception as e:
+            with self._lock:
+                version.state = 'failed'
+                version.error = str(e)
+            print(f"❌ Failed to load model {version.name}: {e}")
+            return
+
+        with self._lock:
+            version.serving = serving
+            version.load_time_ms = (time.perf_counter() - start) * 1000
+            version.error = None
+            version.state = 'ready'
+            if self._activate_when_ready is version:
+                self._activate_when_ready = None
+                activate = True
+        print(f"✅ Model {version.name} ready ({version.load_time_ms:.0f}ms)")
+
+        if activate:
+            self._swap(version)
+
+    def preload(self, name, activate=False, background=True):
+        """Load a version without serving it yet"""
+        version = self.get(name)
+        with self._lock:
+            if version.state in ('ready', 'active'):
+                ready = True
+            elif version.state == 'loading':
+                if activate:
+                    self._activate_when_ready = version
+                return version
+            else:
+                ready = False
+                version.state = 'loading'
+
+        if ready:
+            if activate:
+                self._swap(version)
+            return version
+
+        if background:
+            threading.Thread(target=self._load, args=(version, activate),
+                             name=f"preload-{name}", daemon=True).start()
+        else:
+            self._load(version, activate)
+        return version
+
+    def activate(self, name, background=True):
+        """Serve a version; loads it first (in the background) if needed"""
+        return self.preload(name, activate=True, background=background)
+
+    def rollback(self):
+        """Swap back to the previously active version"""
+        previous = self._previous
+        if previous is None:
+            raise RuntimeError("No previous model version to roll back to")
+        return self.activate(previous.name)
+
+    def _swap(self, version):
+        with self._lock:
+            if version is self._active:
+                return
+            old = self._active
+            dropped = self._previous if self._previous not in (version, old) else None
+            version.state = 'active'
+            self._active = version  # the atomic switch: next frame sees the new model
+            if old is not None:
+                old.state = 'ready'
+                self._previous = old  # kept loaded for rollback
+
+        print(f"🔄 Serving model {version.name}")
+        if self.on_swap is not None:
+            self.on_swap(version.serving)
+        if dropped is not None and dropped.serving is not None:
+            # Unload once frames already in flight on it are done
+            threading.Timer(self.retire_delay, self._retire, args=(dropped,)).start()
+
+    def _retire(self, version):
+        with self._lock:
+            if version is self._active or version is self._previous:
+                return
+            serving = version.serving
+            version.serving = None
+            version.state = 'available'
+        if serving is not None:
+            serving.close()
@@ -0,0 +1,73 @@
+"""
+Voxora.AI - Motion Gate Module
+Skips the classifier while the hand is stationary and reuses the last
+probability vector
+"""
+
+from landmark_utils import landmark_distance
+
+
+class MotionGate:
+    """Reuses the previous prediction when the hand has barely moved.
+
+    One gate per stream: the cached prediction is only valid for the hand
+    that produced it.
+
+    The current normalized landmarks are compared to the vector that was
+    last sent to the classifier (not the previous frame), so slow drift
+    still triggers a fresh inference. A fresh inference is also forced
+    after max_skip_frames consecutive reuses.
+    """
+
+    def __init__(self, threshold=0.02, max_skip_frames=5):
+        self.threshold = threshold
+        self.max_skip_frames = max_skip_frames
+
+        self._last = None  # (normalized landmarks, probabilities), swapped as one reference
+        self._skipped_in_row = 0
+
+        # Stats
+        self.frames = 0
+        self.skipped = 0
+        self._inference_ms = 0.0  # running mean of real inference time
+
+    def lookup(self, normalized_landmarks):
+        """Return the cached probabilities, or None if inference is needed"""
+        self.frames += 1
+
+        # One read, so a reset() from another thread (model swap) cannot split the pair
+        last = self._last
+        if (last is None or
+                self._skipped_in_row >= self.max_skip_frames or
+                landmark_distance(normalized_landmarks, last[0]) >= self.threshold):
+            return None
+
+        self._skipped_in_row += 1
+        self.skipped += 1
+        return last[1]
+
+    def update(self, normalized_landmarks, probabilities, inference_ms=None):
+        """Record the result of a real inference"""
+        self._last = (normalized_landmarks, probabilities)
+        self._skipped_in_row = 0
+
+        if inference_ms is not None:
+            inferences = self.frames - self.skipped
+            if inferences <= 1:
+                self._inference_ms = inference_ms
+            else:
+                self._inference_ms += (inference_ms - self._inference_ms) / inferences
+
+    def reset(self):
+        """Forget the last vector (e.g. when the hand leaves the frame)"""
+        self._last = None
+        self._skipped_in_row = 0
+
+    def stats(self):
+        return {
+            'frames': self.frames,
+            'skipped': self.skipped,
+            'skip_ratio': self.skipped / self.frames if self.frames else 0.0,
+            'mean_inference_ms': self._inference_ms,
+            'cpu_saved_ms': self.skipped * self._inference_ms
+        }
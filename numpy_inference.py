@@ -0,0 +1,473 @@
+"""
+Voxora.AI - NumPy Inference Module
+Exports the Keras landmark classifiers to a compact weight bundle and runs
+the forward pass with NumPy only (no TensorFlow in the per-frame hot path)
+"""
+
+import os
+import json
+import time
+import numpy as np
+
+BUNDLE_FORMAT_VERSION = 1
+
+# Layers that are the identity at inference time
+_PASSTHROUGH_LAYERS = ('Dropout', 'InputLayer', 'SpatialDropout1D', 'GaussianNoise', 'ActivityRegularization')
+
+
+def _activation_name(layer):
+    """Return the activation name of a Keras layer ('linear' if none)"""
+    activation = getattr(layer, 'activation', None)
+    if activation is None:
+        return 'linear'
+    return getattr(activation, '__name__', str(activation))
+
+
+def _same_padding(kernel_size):
+    """Left/right padding used by Keras padding='same' for stride 1"""
+    total = kernel_size - 1
+    left = total // 2
+    return left, total - left
+
+
+def _apply_activation(x, name):
+    if name == 'relu':
+        np.maximum(x, 0, out=x)
+    elif name == 'softmax':
+        x -= x.max(axis=-1, keepdims=True)
+        np.exp(x, out=x)
+        x /= x.sum(axis=-1, keepdims=True)
+    elif name == 'sigmoid':
+        x = 1.0 / (1.0 + np.exp(-x))
+    elif name == 'tanh':
+        np.tanh(x, out=x)
+    elif name != 'linear':
+        raise ValueError(f"Unsupported activation: {name}")
+    return x
+
+
+def keras_to_ops(model):
+    """Translate a Sequential Keras model into a list of NumPy ops.
+
+    BatchNormalization layers become per-channel affine ops and Dropout is
+    dropped; fold_affine_ops() then merges the affines into neighbouring
+    Conv1D/Dense weights.
+    """
+    ops = []
+    shape = tuple(model.input_shape[1:])
+
+    for layer in model.layers:
+        kind = layer.__class__.__name__
+
+        if kind in _PASSTHROUGH_LAYERS:
+            continue
+
+        if kind == 'Reshape':
+            shape = tuple(layer.target_shape)
+            ops.append({'op': 'reshape', 'shape': list(shape)})
+
+        elif kind == 'Flatten':
+            shape = (int(np.prod(shape)),)
+            ops.append({'op': 'reshape', 'shape': list(shape)})
+
+        elif kind == 'Normalization':
+            mean = np.asarray(layer.mean, dtype=np.float64).reshape(-1)
+            variance = np.asarray(layer.variance, dtype=np.float64).reshape(-1)
+            scale = 1.0 / np.maximum(np.sqrt(variance), 1e-7)
+            ops.append({'op': 'affine', 'scale': scale, 'shift': -mean * scale})
+
+        elif kind == 'BatchNormalization':
+            weights = layer.get_weights()
+            gamma = weights[0] if layer.scale else np.ones_like(weights[-2])
+            beta = weights[1] if layer.center else np.zeros_like(weights[-2])
+            moving_mean, moving_var = weights[-2], weights[-1]
+            scale = gamma / np.sqrt(moving_var + layer.epsilon)
+            ops.append({'op': 'affine', 'scale': scale, 'shift': beta - moving_mean * scale})
+
+        elif kind == 'Conv1D':
+            if layer.strides[0] != 1 or layer.dilation_rate[0] != 1:
+                raise ValueError(f"Unsupported Conv1D configuration in layer {layer.name}")
+            weights = layer.get_weights()
+            kernel = weights[0].astype(np.float64)
+            bias = weights[1] if layer.use_bias else np.zeros(kernel.shape[-1])
+            ops.append({
+                'op': 'conv1d',
+                'kernel': kernel,
+                'bias': np.asarray(bias, dtype=np.float64),
+                'padding': layer.padding,
+                'activation': _activation_name(layer)
+            })
+            length = shape[0] if layer.padding == 'same' else shape[0] - kernel.shape[0] + 1
+            shape = (length, kernel.shape[-1])
+
+        elif kind == 'MaxPooling1D':
+            pool = layer.pool_size[0]
+            if layer.strides[0] != pool or layer.padding != 'valid':
+                raise ValueError(f"Unsupported MaxPooling1D configuration in layer {layer.name}")
+            ops.append({'op': 'maxpool1d', 'pool': pool})
+            shape = (shape[0] // pool, shape[1])
+
+        elif kind == 'GlobalAveragePooling1D':
+            ops.append({'op': 'gap1d'})
+            shape = (shape[-1],)
+
+        elif kind == 'Dense':
+            weights = layer.get_weights()
+            kernel = weights[0].astype(np.float64)
+            bias = weights[1] if layer.use_bias else np.zeros(kernel.shape[-1])
+            ops.append({
+                'op': 'dense',
+                'kernel': kernel,
+                'bias': np.asarray(bias, dtype=np.float64),
+                'activation': _activation_name(layer)
+            })
+            shape = shape[:-1] + (kernel.shape[-1],)
+
+        elif kind == 'Activation':
+            ops.append({'op': 'activation', 'activation': _activation_name(layer)})
+
+        else:
+            raise ValueError(f"Unsupported layer type for NumPy export: {kind} ({layer.name})")
+
+    return ops
+
+
+def _conv_bias_from_shift(kernel, shift, length, padding):
+    """Position-dependent bias contributed by a constant input shift.
+
+    With padding='same' the zero-padded border taps see the padding rather
+    than the shifted activations, so the folded bias differs per position.
+    """
+    taps = np.einsum('kio,i->ko', kernel, shift)  # (k, out)
+    k = kernel.shape[0]
+    if padding != 'same':
+        return np.broadcast_to(taps.sum(axis=0), (length - k + 1, kernel.shape[-1])).copy()
+
+    left, _ = _same_padding(k)
+    bias = np.zeros((length, kernel.shape[-1]))
+    for pos in range(length):
+        first = max(0, left - pos)
+        last = min(k, length + left - pos)
+        bias[pos] = taps[first:last].sum(axis=0)
+    return bias
+
+
+def fold_affine_ops(ops, input_shape):
+    """Fold per-channel affine ops (BatchNorm, input normalization) into the
+    next Conv1D/Dense layer. Affines that cannot be folded exactly are kept.
+    """
+    folded = []
+    pending = None  # (scale, shift) waiting for the next linear layer
+    shape = tuple(input_shape)
+
+    def flush():
+        nonlocal pending
+        if pending is not None:
+            folded.append({'op': 'affine', 'scale': pending[0], 'shift': pending[1]})
+            pending = None
+
+    for op in ops:
+        kind = op['op']
+
+        if kind == 'affine':
+            scale = np.asarray(op['scale'], dtype=np.float64)
+            shift = np.asarray(op['shift'], dtype=np.float64)
+            if pending is not None:
+                scale, shift = pending[0] * scale, pending[1] * scale + shift
+            pending = (scale, shift)
+            continue
+
+        if kind == 'conv1d':
+            kernel, bias = op['kernel'], op['bias']
+            length = shape[0]
+            if pending is not None and pending[0].shape[-1] == kernel.shape[1] and pending[0].ndim == 1:
+                scale, shift = pending
+                bias = bias + _conv_bias_from_shift(kernel, shift, length, op['padding'])
+                kernel = kernel * scale[None, :, None]
+                pending = None
+            flush()
+            folded.append(dict(op, kernel=kernel, bias=bias))
+            out_len = length if op['padding'] == 'same' else length - kernel.shape[0] + 1
+            shape = (out_len, kernel.shape[-1])
+
+        elif kind == 'dense':
+            kernel, bias = op['kernel'], op['bias']
+            if pending is not None and len(shape) == 1:
+                scale, shift = pending
+                bias = bias + shift @ kernel
+                kernel = kernel * scale[:, None]
+                pending = None
+            flush()
+            folded.append(dict(op, kernel=kernel, bias=bias))
+            shape = shape[:-1] + (kernel.shape[-1],)
+
+        elif kind == 'gap1d':
+            # Averaging commutes with a per-channel affine
+            folded.append(op)
+            shape = (shape[-1],)
+
+        elif kind == 'maxpool1d':
+            # Max commutes with a per-channel affine only for positive scales
+            if pending is not None and not np.all(pending[0] > 0):
+                flush()
+            folded.append(op)
+            shape = (shape[0] // op['pool'], shape[1])
+
+        elif kind == 'reshape':
+            flush()
+            folded.append(op)
+            shape = tuple(op['shape'])
+
+        else:
+            flush()
+            folded.append(op)
+
+    flush()
+    return folded
+
+
+class NumpyClassifier:
+    """NumPy-only forward pass for an exported landmark classifier.
+
+    predict() mirrors keras.Model.predict so it can be used as a drop-in
+    replacement in web_app.
+    """
+
+    def __init__(self, ops, input_shape, dtype=np.float32):
+        self.input_shape = tuple(input_shape)
+        self.dtype = np.dtype(dtype)
+        self.ops = []
+        shape = self.input_shape
+
+        # Pre-reshape weights into the layout used by the forward pass
+        for op in ops:
+            kind = op['op']
+            prepared = {'op': kind}
+            if kind == 'conv1d':
+                kernel = np.asarray(op['kernel'])
+                k, c_in, c_out = kernel.shape
+                # Window layout from sliding_window_view is (channels, taps)
+                prepared['kernel'] = kernel.transpose(1, 0, 2).reshape(c_in * k, c_out).astype(self.dtype)
+                prepared['bias'] = np.asarray(op['bias']).astype(self.dtype)
+                prepared['k'] = k
+                prepared['pad'] = _same_padding(k) if op['padding'] == 'same' else (0, 0)
+                prepared['activation'] = op['activation']
+                length = shape[0] if op['padding'] == 'same' else shape[0] - k + 1
+                shape = (length, c_out)
+            elif kind == 'dense':
+                prepared['kernel'] = np.asarray(op['kernel']).astype(self.dtype)
+                prepared['bias'] = np.asarray(op['bias']).astype(self.dtype)
+                prepared['activation'] = op['activation']
+                shape = shape[:-1] + (prepared['kernel'].shape[-1],)
+            elif kind == 'affine':
+                prepared['scale'] = np.asarray(op['scale']).astype(self.dtype)
+                prepared['shift'] = np.asarray(op['shift']).astype(self.dtype)
+            elif kind == 'reshape':
+                prepared['shape'] = tuple(op['shape'])
+                shape = prepared['shape']
+            elif kind == 'maxpool1d':
+                prepared['pool'] = int(op['pool'])
+                shape = (shape[0] // prepared['pool'], shape[1])
+            elif kind == 'gap1d':
+                shape = (shape[-1],)
+            elif kind == 'activation':
+                prepared['activation'] = op['activation']
+            else:
+                raise ValueError(f"Unknown op: {kind}")
+            self.ops.append(prepared)
+
+        self.output_shape = shape
+        self.num_params = sum(
+            op[key].size for op in self.ops for key in ('kernel', 'bias', 'scale', 'shift') if key in op
+        )
+
+    def predict(self, x, verbose=0, batch_size=None):
+        """Run the forward pass on a batch of flat landmark vectors"""
+        x = np.asarray(x, dtype=self.dtype)
+        if x.ndim == len(self.input_shape):
+            x = x[None]
+        n = x.shape[0]
+
+        for op in self.ops:
+            kind = op['op']
+            if kind == 'conv1d':
+                left, right = op['pad']
+                if left or right:
+                    x = np.pad(x, ((0, 0), (left, right), (0, 0)))
+                windows = np.lib.stride_tricks.sliding_window_view(x, op['k'], axis=1)
+                windows = windows.reshape(n, windows.shape[1], -1)
+                x = windows @ op['kernel']
+                x += op['bias']
+                x = _apply_activation(x, op['activation'])
+            elif kind == 'dense':
+                x = x @ op['kernel']
+                x += op['bias']
+                x = _apply_activation(x, op['activation'])
+            elif kind == 'affine':
+                x = x * op['scale'] + op['shift']
+            elif kind == 'reshape':
+                x = x.reshape((n,) + op['shape'])
+            elif kind == 'maxpool1d':
+                pool = op['pool']
+                length = (x.shape[1] // pool) * pool
+                x = x[:, :length].reshape(n, length // pool, pool, x.shape[2]).max(axis=2)
+            elif kind == 'gap1d':
+                x = x.mean(axis=1)
+            elif kind == 'activation':
+                x = _apply_activation(np.array(x), op['activation'])
+
+        return x
+
+    def __call__(self, x):
+        return self.predict(x)
+
+
+def export_model(model, bundle_path, input_affine=None):
+    """Export a Keras model to a NumPy weight bundle (.npz).
+
+    input_affine: optional (scale, shift) applied to the raw input before
+    the first layer, e.g. a StandardScaler baked into the model.
+    """
+    input_shape = tuple(model.input_shape[1:])
+    ops = keras_to_ops(model)
+    if input_affine is not None:
+        ops.insert(0, {'op': 'affine', 'scale': input_affine[0], 'shift': input_affine[1]})
+    ops = fold_affine_ops(ops, input_shape)
+    save_bundle(ops, input_shape, bundle_path)
+    return ops
+
+
+def save_bundle(ops, input_shape, bundle_path):
+    """Write ops to an .npz bundle: JSON spec plus one array per weight"""
+    spec = []
+    arrays = {}
+    for i, op in enumerate(ops):
+        entry = {}
+        for key, value in op.items():
+            if isinstance(value, np.ndarray):
+                name = f"op{i}_{key}"
+                arrays[name] = value.astype(np.float32)
+                entry[key] = {'array': name}
+            else:
+                entry[key] = value
+        spec.append(entry)
+
+    header = {
+        'format_version': BUNDLE_FORMAT_VERSION,
+        'input_shape': list(input_shape),
+        'ops': spec
+    }
+    np.savez_compressed(bundle_path, spec=np.array(json.dumps(header)), **arrays)
+
+
+def load_bundle(bundle_path, dtype=np.float32):
+    """Load an .npz bundle written by save_bundle()"""
+    with np.load(bundle_path, allow_pickle=False) as data:
+        header = json.loads(str(data['spec']))
+        if header.get('format_version') != BUNDLE_FORMAT_VERSION:
+            raise ValueError(f"Unsupported bundle version: {header.get('format_version')}")
+        ops = []
+        for entry in header['ops']:
+            op = {}
+            for key, value in entry.items():
+                if isinstance(value, dict) and 'array' in value:
+                    op[key] = data[value['array']]
+                else:
+                    op[key] = value
+            ops.append(op)
+    return NumpyClassifier(ops, header['input_shape'], dtype=dtype)
+
+
+def bundle_path_for(model_path):
+    """models/signity_model.h5 -> models/signity_model.npz"""
+    return os.path.splitext(model_path)[0] + '.npz'
+
+
+def load_classifier(model_path):
+    """Load a model for inference, preferring its NumPy bundle over Keras"""
+    bundle_path = bundle_path_for(model_path)
+    if os.path.exists(bundle_path):
+        print(f"📂 Using NumPy bundle: {bundle_path}")
+        return load_bundle(bundle_path)
+
+    from tensorflow import keras
+    print(f"📂 Using Keras model: {model_path}")
+    return keras.models.load_model(model_path)
+
+
+def benchmark_latency(predict_fn, input_dim, runs=500, warmup=20):
+    """Per-call latency (ms) of predict_fn on a single landmark vector"""
+    sample = np.random.rand(1, input_dim).astype(np.float32)
+    for _ in range(warmup):
+        predict_fn(sample)
+
+    timings = np.empty(runs)
+    for i in range(runs):
+        start = time.perf_counter()
+        predict_fn(sample)
+        timings[i] = (time.perf_counter() - start) * 1000
+    return {
+        'mean_ms': float(timings.mean()),
+        'p50_ms': float(np.percentile(timings, 50)),
+        'p99_ms': float(np.percentile(timings, 99))
+    }
+
+
+def verify_bundle(keras_model, numpy_model, num_samples=256, atol=1e-4):
+    """Compare NumPy and Keras outputs on random landmark-like inputs"""
+    input_dim = int(np.prod(keras_model.input_shape[1:]))
+    samples = np.random.rand(num_samples, input_dim).astype(np.float32)
+    expected = keras_model.predict(samples, verbose=0)
+    actual = numpy_model.predict(samples)
+    max_error = float(np.abs(expected - actual).max())
+    agreement = float(np.mean(expected.argmax(axis=1) == actual.argmax(axis=1)))
+    return max_error <= atol, max_error, agreement
+
+
+def main():
+    """Export a model, check it against Keras and compare per-frame latency"""
+    import argparse
+    from tensorflow import keras
+
+    parser = argparse.ArgumentParser(description="Export a Keras landmark model to a NumPy bundle")
+    parser.add_argument('model', nargs='?', default=os.path.join('models', 'signity_model.h5'))
+    parser.add_argument('--output', default=None, help="Bundle path (default: next to the model)")
+    parser.add_argument('--atol', type=float, default=1e-4)
+    parser.add_argument('--runs', type=int, default=500)
+    args = parser.parse_args()
+
+    print("\n" + "="*70)
+    print("  NUMPY INFERENCE EXPORT")
+    print("="*70)
+
+    keras_model = keras.models.load_model(args.model)
+    print(f"📂 Loaded Keras model: {args.model}")
+
+    bundle_path = args.output or bundle_path_for(args.model)
+    export_model(keras_model, bundle_path)
+    numpy_model = load_bundle(bundle_path)
+    print(f"💾 Bundle saved: {bundle_path} ({os.path.getsize(bundle_path) / 1024:.0f} KB, "
+          f"{numpy_model.num_params:,} parameters after folding)")
+
+    ok, max_error, agreement = verify_bundle(keras_model, numpy_model, atol=args.atol)
+    print(f"\n🔍 Max abs error vs Keras: {max_error:.2e} (tolerance {args.atol:.0e})")
+    print(f"   Top-1 agreement: {agreement*100:.2f}%")
+    if not ok:
+        print("❌ Bundle output does not match Keras within tolerance")
+
+    input_dim = int(np.prod(keras_model.input_shape[1:]))
+    keras_stats = benchmark_latency(lambda x: keras_model.predict(x, verbose=0), input_dim, runs=args.runs)
+    numpy_stats = benchmark_latency(numpy_model.predict, input_dim, runs=args.runs)
+
+    print(f"\n⏱️  Per-frame latency (batch of 1, {args.runs} runs):")
+    print(f"   {'Backend':<10} {'mean':>10} {'p50':>10} {'p99':>10}")
+    for name, stats in (('keras', keras_stats), ('numpy', numpy_stats)):
+        print(f"   {name:<10} {stats['mean_ms']:>8.3f}ms {stats['p50_ms']:>8.3f}ms {stats['p99_ms']:>8.3f}ms")
+    print(f"\n🚀 Speed-up: {keras_stats['mean_ms'] / numpy_stats['mean_ms']:.1f}x")
+    print("="*70)
+
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
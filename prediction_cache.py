@@ -0,0 +1,171 @@
+"""
+Voxora.AI - Prediction Cache Module
+Bounded LRU cache of classifier outputs keyed by coarsely quantized,
+wrist-relative landmark vectors
+"""
+
+import os
+import threading
+from collections import OrderedDict
+import numpy as np
+from landmark_utils import normalize_landmarks
+
+
+class LandmarkCache:
+    """LRU cache shared by all streams.
+
+    Keys are normalize_landmarks() vectors rounded to a grid of bin_size,
+    so the same hand shape maps to the same key regardless of where the
+    hand is in the frame, how large it appears or which user signs it.
+    """
+
+    def __init__(self, bin_size=0.05, capacity=4096):
+        self.bin_size = bin_size
+        self.capacity = capacity
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Stats
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def key(self, normalized_landmarks):
+        """Quantize a normalized landmark vector into a hashable key"""
+        bins = np.rint(np.asarray(normalized_landmarks) / self.bin_size)
+        return bins.astype(np.int16).tobytes()
+
+    def get(self, key):
+        """Cached probabilities for key, or None on a miss"""
+        with self._lock:
+            probabilities = self._entries.get(key)
+            if probabilities is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return probabilities
+
+    def put(self, key, probabilities):
+        with self._lock:
+            self._entries[key] = probabilities
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'capacity': self.capacity,
+            'bin_size': self.bin_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+
+
+def load_landmark_streams(paths):
+    """Load recorded landmark streams for replay.
+
+    Each path is either a .npy array of shape (frames, 63) where rows of
+    NaN mean "no hand", a .npz recording from frame_sources.LandmarkRecorder,
+    or a directory of per-frame .npy vectors (e.g. one
+    class folder of my_custom_dataset/landmarks). Returns (name, frames).
+    """
+    from frame_sources import load_landmark_recording
+
+    streams = []
+    for path in paths:
+        if os.path.isdir(path):
+            files = sorted(f for f in os.listdir(path) if f.endswith('.npy'))
+            sub_dirs = sorted(d for d in os.listdir(path) if os.path.isdir(os.path.join(path, d)))
+            if files:
+                frames = np.stack([np.load(os.path.join(path, f)).reshape(-1) for f in files])
+                streams.append((os.path.basename(os.path.normpath(path)), frames))
+            for sub_dir in sub_dirs:
+                streams.extend(load_landmark_streams([os.path.join(path, sub_dir)]))
+        else:
+            frames, _ = load_landmark_recording(path)
+            streams.append((os.path.splitext(os.path.basename(path))[0], frames))
+    return streams
+
+
+def replay_with_cache(frames, probabilities, bin_size, capacity):
+    """Replay one stream through a fresh cache.
+
+    Returns (hit_rate, changed) where changed is the fraction of frames
+    whose top-1 class differs from the uncached model output.
+    """
+    cache = LandmarkCache(bin_size=bin_size, capacity=capacity)
+    changed = 0
+    valid = 0
+
+    for vector, expected in zip(frames, probabilities):
+        if np.isnan(vector).any():
+            continue
+        valid += 1
+        key = cache.key(normalize_landmarks(vector))
+        cached = cache.get(key)
+        if cached is None:
+            cache.put(key, expected)
+        elif np.argmax(cached) != np.argmax(expected):
+            changed += 1
+
+    stats = cache.stats()
+    return stats['hit_rate'], changed / valid if valid else 0.0
+
+
+def main():
+    """Report hit rate vs accuracy loss at several quantization levels"""
+    import argparse
+    from numpy_inference import load_classifier
+
+    parser = argparse.ArgumentParser(description="Replay landmark recordings through the prediction cache")
+    parser.add_argument('recordings', nargs='*', default=[os.path.join('my_custom_dataset', 'landmarks')],
+                        help=".npy streams of shape (frames, 63) or directories of per-frame .npy files")
+    parser.add_argument('--model', default=os.path.join('models', 'signity_model.h5'))
+    parser.add_argument('--bins', type=float, nargs='+', default=[0.01, 0.02, 0.05, 0.1, 0.2])
+    parser.add_argument('--capacity', type=int, default=4096)
+    args = parser.parse_args()
+
+    streams = load_landmark_streams(args.recordings)
+    if not streams:
+        print("❌ No landmark recordings found")
+        return
+
+    model = load_classifier(args.model)
+
+    # Uncached model output for every frame, computed once
+    all_frames = np.concatenate([frames for _, frames in streams])
+    valid = ~np.isnan(all_frames).any(axis=1)
+    all_probabilities = np.zeros((len(all_frames), 1), dtype=np.float32)
+    if valid.any():
+        predicted = model.predict(all_frames[valid], verbose=0)
+        all_probabilities = np.zeros((len(all_frames), predicted.shape[1]), dtype=np.float32)
+        all_probabilities[valid] = predicted
+
+    print("\n" + "="*70)
+    print("  PREDICTION CACHE REPLAY")
+    print(f"  {len(streams)} streams, {int(valid.sum())} frames with a hand, capacity {args.capacity}")
+    print("="*70)
+    print(f"\n{'Bin size':<10} {'Hit rate':>10} {'Top-1 changed':>15}")
+    print("-" * 37)
+
+    for bin_size in args.bins:
+        # Streams are replayed back to back through one shared cache, like
+        # sessions arriving one after another on the server
+        hit_rate, changed = replay_with_cache(all_frames, all_probabilities, bin_size, args.capacity)
+        print(f"{bin_size:<10} {hit_rate*100:>9.1f}% {changed*100:>14.2f}%")
+
+    print("="*70)
+
+
+if __name__ == "__main__":
+    main()
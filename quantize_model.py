@@ -0,0 +1,225 @@
+"""
+Voxora.AI - Model Quantization Module
+Post-training int8 / float16 quantization of the landmark classifier for
+CPU-only deployment, with an accuracy and latency report against the
+float model
+"""
+
+import os
+import json
+import time
+import threading
+import numpy as np
+
+QUANTIZATION_MODES = ('int8', 'float16')
+
+
+class TFLiteClassifier:
+    """TFLite interpreter with a keras-like predict() for web_app"""
+
+    def __init__(self, model_path, num_threads=1):
+        import tensorflow as tf
+
+        self.model_path = model_path
+        self.interpreter = tf.lite.Interpreter(model_path=model_path, num_threads=num_threads)
+        self._input = self.interpreter.get_input_details()[0]
+        self._output = self.interpreter.get_output_details()[0]
+        self._batch_size = 1
+        self._lock = threading.Lock()  # the interpreter is not thread-safe
+        self.interpreter.allocate_tensors()
+
+        # Full-integer models take quantized input/output tensors
+        self._input_scale, self._input_zero = self._input['quantization']
+        self._output_scale, self._output_zero = self._output['quantization']
+
+    def _resize(self, batch_size):
+        if batch_size != self._batch_size:
+            shape = [batch_size] + list(self._input['shape'][1:])
+            self.interpreter.resize_tensor_input(self._input['index'], shape)
+            self.interpreter.allocate_tensors()
+            self._batch_size = batch_size
+
+    def predict(self, x, verbose=0, batch_size=None):
+        x = np.asarray(x, dtype=np.float32)
+        if x.ndim == 1:
+            x = x[None]
+
+        if self._input['dtype'] != np.float32:
+            x = np.round(x / self._input_scale + self._input_zero)
+            info = np.iinfo(self._input['dtype'])
+            x = np.clip(x, info.min, info.max).astype(self._input['dtype'])
+
+        with self._lock:
+            self._resize(len(x))
+            self.interpreter.set_tensor(self._input['index'], x)
+            self.interpreter.invoke()
+            output = self.interpreter.get_tensor(self._output['index'])
+
+        if self._output['dtype'] != np.float32:
+            output = (output.astype(np.float32) - self._output_zero) * self._output_scale
+        return output
+
+
+def quantized_model_path(model_path, mode):
+    """models/signity_model.h5 -> models/signity_model_int8.tflite"""
+    return f"{os.path.splitext(model_path)[0]}_{mode}.tflite"
+
+
+def load_calibration_data(max_samples=None):
+    """Landmarks, labels and the model_to_class mapping the labels index.
+
+    processed_data/ labels are remapped from original class indices to
+    model indices with processed_data/class_mapping.json; the
+    my_custom_dataset/landmarks fallback is already in the custom model's
+    28-class order.
+    """
+    from config import DATA_DIR
+
+    sequences_path = os.path.join(DATA_DIR, 'train_sequences.npy')
+    labels_path = os.path.join(DATA_DIR, 'train_labels.npy')
+    if os.path.exists(sequences_path) and os.path.exists(labels_path):
+        sequences = np.load(sequences_path).astype(np.float32)
+        labels = np.load(labels_path)
+        print(f"📂 Calibration data: {sequences_path} ({len(sequences)} samples)")
+
+        class_mapping = {}
+        mapping_path = os.path.join(DATA_DIR, 'class_mapping.json')
+        if os.path.exists(mapping_path):
+            with open(mapping_path, 'r') as f:
+                mapping = json.load(f)
+            class_mapping = mapping['model_to_class']
+            # Dataset labels use original class indices; the model uses remapped ones
+            remap = {original: i for i, original in enumerate(mapping['original_indices'])}
+            labels = np.array([remap.get(int(label), -1) for label in labels])
+            keep = labels >= 0
+            sequences, labels = sequences[keep], labels[keep]
+    else:
+        from train_custom_model import CustomModelTrainer
+        trainer = CustomModelTrainer()
+        sequences, labels = trainer.load_custom_dataset()
+        sequences = sequences.astype(np.float32)
+        class_mapping = {str(i): name for i, name in enumerate(trainer.classes)}
+
+    if max_samples is not None and len(sequences) > max_samples:
+        idx = np.random.default_rng(42).choice(len(sequences), max_samples, replace=False)
+        sequences, labels = sequences[idx], labels[idx]
+    return sequences, labels, class_mapping
+
+
+def split_calibration(sequences, labels, eval_fraction=0.5, seed=42):
+    """Disjoint (calibration, evaluation) sets, so the quantized model is not scored on its calibration samples"""
+    order = np.random.default_rng(seed).permutation(len(sequences))
+    n_eval = int(len(sequences) * eval_fraction)
+    calibration, evaluation = order[n_eval:], order[:n_eval]
+    return (sequences[calibration], labels[calibration]), (sequences[evaluation], labels[evaluation])
+
+
+def quantize(keras_model, mode, calibration_data, output_path, full_integer=True):
+    """Convert a Keras model to a quantized TFLite flatbuffer"""
+    import tensorflow as tf
+
+    converter = tf.lite.TFLiteConverter.from_keras_model(keras_model)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+
+    if mode == 'float16':
+        converter.target_spec.supported_types = [tf.float16]
+    elif mode == 'int8':
+        def representative_dataset():
+            for sample in calibration_data[:500]:
+                yield [sample.reshape(1, -1).astype(np.float32)]
+
+        converter.representative_dataset = representative_dataset
+        if full_integer:
+            converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+            converter.inference_input_type = tf.int8
+            converter.inference_output_type = tf.int8
+    else:
+        raise ValueError(f"Unknown quantization mode: {mode} (expected one of {QUANTIZATION_MODES})")
+
+    tflite_model = converter.convert()
+    with open(output_path, 'wb') as f:
+        f.write(tflite_model)
+    return output_path
+
+
+def per_class_accuracy(predictions, labels, num_classes):
+    predicted = predictions.argmax(axis=1)
+    result = {}
+    for class_idx in range(num_classes):
+        mask = labels == class_idx
+        if mask.any():
+            result[class_idx] = float(np.mean(predicted[mask] == class_idx))
+    return result
+
+
+def single_frame_latency(model, sample, runs=300):
+    """Mean per-frame latency (ms) for a batch of one"""
+    sample = sample.reshape(1, -1)
+    for _ in range(10):
+        model.predict(sample, verbose=0)
+    start = time.perf_counter()
+    for _ in range(runs):
+        model.predict(sample, verbose=0)
+    return (time.perf_counter() - start) * 1000 / runs
+
+
+def main():
+    """Quantize, then report per-class accuracy delta and latency in one run"""
+    import argparse
+    from tensorflow import keras
+
+    parser = argparse.ArgumentParser(description="Post-training quantization of the landmark classifier")
+    parser.add_argument('model', nargs='?', default=os.path.join('models', 'signity_model.h5'))
+    parser.add_argument('--mode', choices=QUANTIZATION_MODES, default='int8')
+    parser.add_argument('--max-samples', type=int, default=5000, help="Calibration + evaluation samples")
+    parser.add_argument('--hybrid', action='store_true',
+                        help="int8 weights with float input/output instead of full-integer")
+    args = parser.parse_args()
+
+    print("\n" + "="*70)
+    print(f"  {args.mode.upper()} POST-TRAINING QUANTIZATION")
+    print("="*70)
+
+    float_model = keras.models.load_model(args.model)
+    sequences, labels, class_names = load_calibration_data(args.max_samples)
+    (calibration, _), (sequences, labels) = split_calibration(sequences, labels)
+    print(f"📂 {len(calibration)} calibration / {len(sequences)} evaluation samples")
+
+    output_path = quantized_model_path(args.model, args.mode)
+    quantize(float_model, args.mode, calibration, output_path, full_integer=not args.hybrid)
+    quantized = TFLiteClassifier(output_path)
+    print(f"💾 Saved: {output_path} ({os.path.getsize(output_path) / 1024:.0f} KB, "
+          f"float model {os.path.getsize(args.model) / 1024:.0f} KB)")
+
+    float_predictions = float_model.predict(sequences, verbose=0)
+    quant_predictions = quantized.predict(sequences)
+    num_classes = float_predictions.shape[1]
+    if class_names and len(class_names) != num_classes:
+        print(f"⚠️  Labels use {len(class_names)} classes, the model predicts {num_classes}")
+
+    float_acc = per_class_accuracy(float_predictions, labels, num_classes)
+    quant_acc = per_class_accuracy(quant_predictions, labels, num_classes)
+
+    print(f"\n{'Class':<8} {'Float':>8} {args.mode:>8} {'Delta':>8}")
+    print("-" * 36)
+    for class_idx in sorted(float_acc):
+        name = class_names.get(str(class_idx), str(class_idx))
+        delta = quant_acc[class_idx] - float_acc[class_idx]
+        print(f"{name:<8} {float_acc[class_idx]*100:>7.2f}% {quant_acc[class_idx]*100:>7.2f}% {delta*100:>+7.2f}%")
+
+    float_overall = float(np.mean(float_predictions.argmax(axis=1) == labels))
+    quant_overall = float(np.mean(quant_predictions.argmax(axis=1) == labels))
+    agreement = float(np.mean(float_predictions.argmax(axis=1) == quant_predictions.argmax(axis=1)))
+    print("-" * 36)
+    print(f"{'Overall':<8} {float_overall*100:>7.2f}% {quant_overall*100:>7.2f}% "
+          f"{(quant_overall - float_overall)*100:>+7.2f}%")
+    print(f"\n🔍 Top-1 agreement with float model: {agreement*100:.2f}%")
+
+    float_ms = single_frame_latency(float_model, sequences[0])
+    quant_ms = single_frame_latency(quantized, sequences[0])
+    print(f"\n⏱️  Per-frame latency: float (keras) {float_ms:.3f}ms | {args.mode} (tflite) {quant_ms:.3f}ms")
+    print("="*70)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,421 @@
+"""
+Voxora.AI - Recognition Session Module
+Per-user recognition state (prediction buffer, letter state machine, word
+and sentence) keyed by session id, with idle eviction, so concurrent
+streams no longer share one set of globals
+"""
+
+import os
+import time
+import threading
+from collections import OrderedDict
+import numpy as np
+from config import STABILIZATION_FRAMES
+from text_events import TextEventChannel
+from stabilizer import PredictionStabilizer
+from lexicon_decoder import unmatched_letters
+
+
+class RecognitionSession:
+    """Stabilization and letter/word state for one user.
+
+    update() takes the shared per-frame prediction and returns this
+    session's view of it. Frames are deduplicated by capture time, so a
+    client watching both /video_feed and /landmark_feed counts each frame
+    once. With a LexiconDecoder, letters come from the decoder's beam search
+    over the full probability vectors, and words are added at each word
+    boundary. The hold-time state machine keeps running next to it as the
+    way to spell words outside the word list: when the decoder has no
+    complete lexicon word at a boundary, the held letters are used.
+    """
+
+    def __init__(self, session_id, confidence_threshold=0.85, letter_hold_time=1.0,
+                 buffer_size=STABILIZATION_FRAMES, min_votes=5, decay=1.0, decoder=None):
+        self.session_id = session_id
+        self.confidence_threshold = confidence_threshold
+        self.letter_hold_time = letter_hold_time
+
+        self.stabilizer = PredictionStabilizer(buffer_size, min_votes, decay=decay)
+        self.decoder = decoder
+        self.current_letter = None
+        self.last_letter_time = 0
+        self.typed_letter = None  # committed and still held; typed again only after a release
+        self.current_word = ""
+        self.sentence = ""
+        self.held_word = ""  # hold-time letters while decoding, for words outside the list
+        self.text_events = TextEventChannel()
+
+        self.lock = threading.Lock()
+        self.created = time.time()
+        self.last_seen = self.created
+        self.active_streams = 0
+        self.frames = 0
+        self._last_frame_at = None
+        self.last_time = None  # letter-clock time of the last frame
+        self.frame_clock = None  # /classify's batch_classify.FrameClock, created on the first batch
+        self.temporal = None  # /classify's TemporalRecognizer for J/Z, created on the first batch
+        self._state = {'pred': None, 'conf': 0.0, 'word': '', 'sentence': ''}
+
+    def touch(self):
+        self.last_seen = time.time()
+
+    def attach(self):
+        """A stream (feed or event channel) is open; never evicted meanwhile"""
+        with self.lock:
+            self.active_streams += 1
+        self.touch()
+
+    def detach(self):
+        with self.lock:
+            self.active_streams -= 1
+        self.touch()
+
+    def _stabilize(self, predicted_class, confidence):
+        if predicted_class is None:
+            self.stabilizer.clear()
+            return 'nothing', 1.0
+
+        # Every frame votes, weighted by its confidence
+        self.stabilizer.push(predicted_class, confidence)
+        stable = self.stabilizer.stable()
+        if stable is not None:
+            return stable
+        if len(self.stabilizer) >= self.stabilizer.min_votes:
+            return predicted_class, 0.0  # the window disagrees: show the frame, commit nothing
+
+        return predicted_class, confidence
+
+    def _publish(self):
+        self.text_events.publish(self.current_word, self.sentence)
+
+    def _held_letter(self, letter, current_time):
+        """The letter once it has been held for letter_hold_time, else None"""
+        if letter == self.typed_letter:
+            return None
+        if letter != self.current_letter:
+            self.current_letter = letter
+            self.last_letter_time = current_time
+            return None
+        if current_time - self.last_letter_time >= self.letter_hold_time:
+            self.typed_letter = letter
+            return letter
+        return None
+
+    def _release(self, predicted_class):
+        """A frame that shows anything but the typed letter releases it.
+
+        Holding a letter longer types it once; a double letter needs the
+        pause or movement between the two signs, which the stabilized
+        prediction smooths over, so the raw frame is checked.
+        """
+        if self.typed_letter is not None and predicted_class != self.typed_letter:
+            self.typed_letter = None
+            self.current_letter = None  # the hold time starts again
+
+    def process_letter(self, letter, now=None):
+        """Process detected letter and build words/sentences"""
+        current_time = time.time() if now is None else now
+
+        if letter == 'nothing':
+            return
+
+        if letter == 'space':
+            if self.current_word:
+                self.sentence += self.current_word + " "
+                self.current_word = ""
+                self._publish()
+            self.current_letter = None
+            return
+
+        if letter == 'del':
+            if self.current_word:
+                self.current_word = self.current_word[:-1]
+                self._publish()
+            self.current_letter = None
+            return
+
+        # Regular letter
+        letter = self._held_letter(letter, current_time)
+        if letter:
+            self.current_word += letter
+            self._publish()
+
+    def _finish_word(self, decoded):
+        """The word to add at a boundary.
+
+        The decoded lexicon word, unless at least two letters were held and
+        one of them is not in it: then the signer spelled a word the list
+        does not have, letter by letter.
+        """
+        held, self.held_word = self.held_word, ""
+        self.current_letter = None
+        if not decoded or decoded not in self.decoder.trie:
+            return held or decoded
+        if len(held) >= 2 and unmatched_letters(held, decoded):
+            return held
+        return decoded
+
+    def _decode(self, predicted_class, prediction, confidence, probabilities, class_mapping, now=None):
+        if predicted_class is not None and probabilities is None:
+            return  # caller without probability vectors: nothing to decode
+        if confidence >= self.confidence_threshold:
+            if prediction == 'del':
+                self.decoder.clear_word()
+                self.held_word = ""
+            elif prediction not in ('nothing', 'space'):
+                letter = self._held_letter(prediction, time.time() if now is None else now)
+                if letter:
+                    self.held_word += letter
+
+        word = self.decoder.update(probabilities if predicted_class is not None else None, class_mapping)
+        if word is not None or (self.held_word and self.decoder.at_boundary()):
+            word = self._finish_word(word)
+            if word:
+                self.sentence += word + " "
+        hypothesis = self.decoder.hypothesis()
+        if len(self.held_word) > len(hypothesis):
+            hypothesis = self.held_word  # spelling a word the list does not have
+        if word or hypothesis != self.current_word:
+            self.current_word = hypothesis
+            self._publish()
+
+    def update(self, predicted_class, confidence, frame_at=None, now=None,
+               probabilities=None, class_mapping=None):
+        """Feed one frame's prediction (None when no hand is visible).
+
+        probabilities / class_mapping are the frame's full class vector,
+        used by the decoder when there is one.
+        Returns {'pred', 'conf', 'word', 'sentence'} for this session.
+        """
+        with self.lock:
+            if frame_at is not None and self._last_frame_at is not None and frame_at <= self._last_frame_at:
+                return self._state
+            self._last_frame_at = frame_at
+            self.frames += 1
+            now = time.time() if now is None else now
+            self.last_time = now
+
+            self._release(predicted_class)
+            prediction, confidence = self._stabilize(predicted_class, confidence)
+            if self.decoder is not None:
+                self._decode(predicted_class, prediction, confidence, probabilities, class_mapping, now)
+            elif prediction and confidence >= self.confidence_threshold:
+                self.process_letter(prediction, now)
+            self._state = {'pred': prediction, 'conf': float(confidence),
+                           'word': self.current_word, 'sentence': self.sentence}
+        self.last_seen = time.time()
+        return self._state
+
+    def add_space(self):
+        with self.lock:
+            if self.decoder is not None:
+                self.current_word = self._finish_word(self.decoder.end_word()) or ""
+            if self.current_word:
+                self.sentence += self.current_word + " "
+                self.current_word = ""
+                self._publish()
+
+    def delete_letter(self):
+        with self.lock:
+            if self.decoder is not None:
+                self.decoder.clear_word()  # beam hypotheses cannot lose just one letter
+                self.held_word = ""
+                if self.current_word:
+                    self.current_word = ""
+                    self._publish()
+                return
+            if self.current_word:
+                self.current_word = self.current_word[:-1]
+                self._publish()
+
+    def reset(self):
+        with self.lock:
+            self.current_word = ""
+            self.sentence = ""
+            self.held_word = ""
+            self.current_letter = None
+            self.stabilizer.clear()
+            if self.decoder is not None:
+                self.decoder.reset()
+            self._publish()
+
+    def text(self):
+        with self.lock:
+            return self.current_word, self.sentence
+
+
+class SessionManager:
+    """Sessions by id, created on first use.
+
+    Sessions without an open stream are evicted after idle_timeout
+    seconds; past max_sessions the least recently used idle session goes.
+    Eviction runs lazily from get(), so no sweeper thread is needed.
+    """
+
+    def __init__(self, factory, idle_timeout=300.0, max_sessions=1000):
+        self.factory = factory  # session_id -> RecognitionSession
+        self.idle_timeout = idle_timeout
+        self.max_sessions = max_sessions
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+        self._last_sweep = time.time()
+        self.created = 0
+        self.evicted = 0
+
+    def get(self, session_id):
+        now = time.time()
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                session = self.factory(session_id)
+                self._sessions[session_id] = session
+                self.created += 1
+            self._sessions.move_to_end(session_id)
+            session.last_seen = now
+
+            if now - self._last_sweep >= self.idle_timeout / 4:
+                self._evict_idle_locked(now)
+            while len(self._sessions) > self.max_sessions and self._evict_lru_locked():
+                pass
+        return session
+
+    def _evict_idle_locked(self, now):
+        self._last_sweep = now
+        for session_id, session in list(self._sessions.items()):
+            if session.active_streams == 0 and now - session.last_seen > self.idle_timeout:
+                del self._sessions[session_id]
+                self.evicted += 1
+
+    def _evict_lru_locked(self):
+        for session_id, session in self._sessions.items():
+            if session.active_streams == 0:
+                del self._sessions[session_id]
+                self.evicted += 1
+                return True
+        return False
+
+    def evict_idle(self):
+        with self._lock:
+            self._evict_idle_locked(time.time())
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'active': len(self._sessions),
+                'streaming': sum(1 for s in self._sessions.values() if s.active_streams > 0),
+                'created': self.created,
+                'evicted': self.evicted,
+                'idle_timeout': self.idle_timeout
+            }
+
+
+def run_session(session, frames, predict, class_mapping, fps=30.0, realtime=True):
+    """Replay one landmark stream through a session; returns per-frame latencies (ms).
+
+    Letter timing uses the stream's own clock (frame / fps), so the final
+    text depends only on the frames, not on scheduling.
+    """
+    latencies = []
+    start = time.perf_counter()
+    for i, landmarks in enumerate(frames):
+        if realtime:
+            delay = start + i / fps - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+        t0 = time.perf_counter()
+        if np.isnan(landmarks).any():
+            predicted_class, confidence = None, 0.0
+        else:
+            probabilities = predict(landmarks)
+            class_idx = int(np.argmax(probabilities))
+            predicted_class = class_mapping.get(str(class_idx), str(class_idx))
+            confidence = float(probabilities[class_idx])
+        session.update(predicted_class, confidence, frame_at=i, now=i / fps)
+        latencies.append((time.perf_counter() - t0) * 1000)
+    return latencies
+
+
+def main():
+    """Load test: N concurrent sessions keep independent text at stable latency"""
+    import argparse
+    import json
+    from numpy_inference import load_classifier
+    from inference_scheduler import MicroBatchScheduler
+    from prediction_cache import load_landmark_streams
+
+    parser = argparse.ArgumentParser(description="Concurrent recognition session load test")
+    parser.add_argument('streams', nargs='*', default=[os.path.join('my_custom_dataset', 'landmarks')],
+                        help="Landmark recordings or per-frame landmark directories")
+    parser.add_argument('--model', default=os.path.join('models', 'signity_custom_model.h5'))
+    parser.add_argument('--class-mapping', default=os.path.join('models', 'custom_class_mapping.json'))
+    parser.add_argument('--sessions', type=int, nargs='+', default=[1, 10, 50, 100])
+    parser.add_argument('--frames', type=int, default=150, help="Frames per session (30 FPS)")
+    args = parser.parse_args()
+
+    recorded = load_landmark_streams(args.streams)
+    if not recorded:
+        print("❌ No landmark streams found")
+        return
+    # Session i signs the recordings in a rotated order, so every session
+    # builds different text from the same data
+    timeline = np.concatenate([frames for _, frames in recorded]).astype(np.float32)
+    hold = max(1, len(timeline) // max(len(recorded), 1))
+
+    def session_frames(i):
+        return np.roll(timeline, -(i * hold) % len(timeline), axis=0)[:args.frames]
+
+    model = load_classifier(args.model)
+    with open(args.class_mapping, 'r') as f:
+        class_mapping = json.load(f)['model_to_class']
+    direct = lambda landmarks: model.predict(landmarks.reshape(1, -1), verbose=0)[0]
+
+    scheduler = MicroBatchScheduler(lambda batch: model.predict(batch, verbose=0)).start()
+
+    print("\n" + "="*70)
+    print(f"  SESSION LOAD TEST - {args.frames} frames per session at 30 FPS")
+    print("="*70)
+    print(f"\n{'Sessions':<10} {'p50':>9} {'p99':>9} {'max':>9} {'independent':>13}")
+    print("-" * 54)
+
+    try:
+        for num_sessions in args.sessions:
+            expected = {}
+            for i in range(num_sessions):
+                key = (i * hold) % len(timeline)
+                if key not in expected:
+                    reference = RecognitionSession(f"reference-{i}")
+                    run_session(reference, session_frames(i), direct, class_mapping, realtime=False)
+                    expected[key] = reference.text()
+
+            manager = SessionManager(lambda session_id: RecognitionSession(session_id))
+            latencies = [None] * num_sessions
+
+            def worker(i):
+                session = manager.get(f"user-{i}")
+                latencies[i] = run_session(session, session_frames(i), scheduler.predict, class_mapping)
+
+            threads = [threading.Thread(target=worker, args=(i,)) for i in range(num_sessions)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            matches = sum(manager.get(f"user-{i}").text() == expected[(i * hold) % len(timeline)]
+                          for i in range(num_sessions))
+            all_latencies = np.concatenate(latencies)
+            print(f"{num_sessions:<10} {np.percentile(all_latencies, 50):>7.3f}ms "
+                  f"{np.percentile(all_latencies, 99):>7.3f}ms {all_latencies.max():>7.2f}ms "
+                  f"{matches:>6}/{num_sessions:<6}")
+    finally:
+        scheduler.stop()
+
+    print("\n   independent = sessions whose final word/sentence matches a solo replay")
+    print("="*70)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Voxora.AI - Scaler Folding Module
+Bakes the StandardScaler from models/scaler.pkl into the model so the
+shipped model takes raw landmarks (no sklearn or transform at serve time)
+"""
+
+import os
+import pickle
+import numpy as np
+
+
+def scaler_to_affine(scaler):
+    """StandardScaler -> (scale, shift) with scaler.transform(x) == x * scale + shift"""
+    n_features = scaler.n_features_in_
+    mean = scaler.mean_ if scaler.with_mean and scaler.mean_ is not None else np.zeros(n_features)
+    std = scaler.scale_ if scaler.with_std and scaler.scale_ is not None else np.ones(n_features)
+    scale = 1.0 / np.asarray(std, dtype=np.float64)
+    return scale, -np.asarray(mean, dtype=np.float64) * scale
+
+
+def has_baked_scaler(model):
+    """True if the model already normalizes its own input"""
+    layers = [layer for layer in model.layers if layer.__class__.__name__ != 'InputLayer']
+    return bool(layers) and layers[0].__class__.__name__ == 'Normalization'
+
+
+def bake_scaler(model, scaler):
+    """Return a model that applies the scaler itself.
+
+    If the first layer is Dense the scaler is folded into its weights (no
+    extra op at all); otherwise a Normalization layer is prepended.
+    """
+    from tensorflow import keras
+
+    if has_baked_scaler(model):
+        return model
+
+    scale, shift = scaler_to_affine(scaler)
+    input_shape = model.input_shape[1:]
+    layers = list(model.layers)
+
+    if layers[0].__class__.__name__ == 'Dense':
+        first = layers[0]
+        config = first.get_config()
+        config['name'] = f"{first.name}_scaled"
+        folded = keras.layers.Dense.from_config(config)
+        folded.build((None,) + tuple(input_shape))
+        kernel, *rest = first.get_weights()
+        bias = rest[0] if first.use_bias else np.zeros(kernel.shape[1])
+        weights = [kernel * scale[:, None]]
+        if first.use_bias:
+            weights.append(bias + shift @ kernel)
+        elif np.any(shift):
+            raise ValueError("Cannot fold a mean shift into a Dense layer without bias")
+        folded.set_weights(weights)
+        new_layers = [folded] + layers[1:]
+    else:
+        normalization = keras.layers.Normalization(
+            axis=-1,
+            mean=-shift / scale,
+            variance=(1.0 / scale) ** 2,
+            name='input_scaler'
+        )
+        new_layers = [normalization] + layers
+
+    baked = keras.Sequential([keras.layers.Input(shape=input_shape)] + new_layers)
+    return baked
+
+
+def load_scaler(scaler_path):
+    with open(scaler_path, 'rb') as f:
+        return pickle.load(f)
+
+
+def prepare_raw_input_model(model_path, scaler_path):
+    """Path of a raw-input version of model_path, baking the scaler if needed"""
+    from tensorflow import keras
+
+    raw_path = f"{os.path.splitext(model_path)[0]}_raw.h5"
+    if os.path.exists(raw_path) and os.path.getmtime(raw_path) >= os.path.getmtime(model_path):
+        return raw_path
+
+    model = keras.models.load_model(model_path)
+    if has_baked_scaler(model):
+        return model_path
+    bake_scaler(model, load_scaler(scaler_path)).save(raw_path)
+    return raw_path
+
+
+def verify_baked_model(original, baked, scaler, samples):
+    """Max abs difference between baked(raw) and original(scaler(raw))"""
+    expected = original.predict(scaler.transform(samples), verbose=0)
+    actual = baked.predict(samples, verbose=0)
+    return float(np.abs(expected - actual).max())
+
+
+def main():
+    """Bake models/scaler.pkl into a model and export its NumPy bundle"""
+    import argparse
+    from tensorflow import keras
+    from numpy_inference import export_model, bundle_path_for
+
+    parser = argparse.ArgumentParser(description="Fold the StandardScaler into the model")
+    parser.add_argument('model', nargs='?', default=os.path.join('models', 'signity_custom_model.h5'))
+    parser.add_argument('--scaler', default=os.path.join('models', 'scaler.pkl'))
+    parser.add_argument('--output', default=None,
+                        help="Output model path (default: <model>_raw.h5)")
+    args = parser.parse_args()
+
+    print("\n" + "="*70)
+    print("  SCALER FOLDING")
+    print("="*70)
+
+    model = keras.models.load_model(args.model)
+    if has_baked_scaler(model):
+        print(f"✅ {args.model} already takes raw landmarks")
+        return
+
+    scaler = load_scaler(args.scaler)
+    baked = bake_scaler(model, scaler)
+
+    samples = np.random.rand(256, model.input_shape[1]).astype(np.float32)
+    max_error = verify_baked_model(model, baked, scaler, samples)
+    print(f"🔍 Max abs error vs scaler + model: {max_error:.2e}")
+
+    output_path = args.output or f"{os.path.splitext(args.model)[0]}_raw.h5"
+    baked.save(output_path)
+    print(f"💾 Raw-input model saved: {output_path}")
+
+    bundle_path = bundle_path_for(output_path)
+    export_model(baked, bundle_path)
+    print(f"💾 NumPy bundle saved: {bundle_path}")
+    print("="*70)
+
+
+if __name__ == "__main__":
+    main()
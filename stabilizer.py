@@ -0,0 +1,167 @@
+"""
+Voxora.AI - Prediction Stabilizer Module
+Sliding-window, confidence-weighted vote over per-frame predictions with
+O(1) updates, so the window can grow without per-frame CPU cost
+"""
+
+import time
+from collections import deque
+
+# Running sums are kept in growing units when decaying; rescale before they overflow
+_RESCALE_AT = 1e100
+
+
+class PredictionStabilizer:
+    """Confidence-weighted majority over the last `window` frames.
+
+    Every frame votes for its predicted class with its confidence as the
+    weight; with decay < 1 a vote k frames old counts decay**k as much.
+    push() updates the per-class sums in O(1) (the leader is recomputed
+    over the classes only when the leading class loses weight), and
+    stable() is the commit decision: the leading class once at least
+    min_votes frames are in the window and it holds min_share of the
+    weight.
+    """
+
+    def __init__(self, window=10, min_votes=5, min_share=0.5, decay=1.0):
+        if window < 1 or not 0 < decay <= 1:
+            raise ValueError("window must be >= 1 and decay in (0, 1]")
+        self.window = window
+        self.min_votes = min(min_votes, window)
+        self.min_share = min_share
+        self.decay = decay
+        self.clear()
+
+    def clear(self):
+        self._votes = deque()  # (label, confidence, weight in current units)
+        self._sums = {}
+        self._counts = {}
+        self._confidences = {}
+        self._total = 0.0
+        self._unit = 1.0  # weight of a fresh vote; grows by 1/decay per frame
+        self._leader = None
+
+    def __len__(self):
+        return len(self._votes)
+
+    def push(self, label, confidence=1.0):
+        """Add one frame's prediction"""
+        if self.decay < 1.0:
+            self._unit /= self.decay
+            if self._unit > _RESCALE_AT:
+                self._rescale()
+
+        weight = confidence * self._unit
+        self._votes.append((label, confidence, weight))
+        self._sums[label] = self._sums.get(label, 0.0) + weight
+        self._counts[label] = self._counts.get(label, 0) + 1
+        self._confidences[label] = self._confidences.get(label, 0.0) + confidence
+        self._total += weight
+        if self._leader is None or self._sums[label] > self._sums[self._leader]:
+            self._leader = label
+
+        if len(self._votes) > self.window:
+            self._drop_oldest()
+
+    def _drop_oldest(self):
+        label, confidence, weight = self._votes.popleft()
+        self._total -= weight
+        self._counts[label] -= 1
+        if self._counts[label] == 0:
+            del self._counts[label]
+            del self._sums[label]
+            del self._confidences[label]
+        else:
+            self._sums[label] -= weight
+            self._confidences[label] -= confidence
+        if label == self._leader:
+            # Only the leader losing weight can change the leader
+            self._leader = max(self._sums, key=self._sums.get) if self._sums else None
+
+    def _rescale(self):
+        scale = 1.0 / self._unit
+        self._votes = deque((label, confidence, weight * scale) for label, confidence, weight in self._votes)
+        for label in self._sums:
+            self._sums[label] *= scale
+        self._total *= scale
+        self._unit = 1.0
+
+    def leader(self):
+        """(leading class, its share of the window's weight), (None, 0.0) when empty"""
+        if self._leader is None or self._total <= 0:
+            return self._leader, 0.0
+        return self._leader, self._sums[self._leader] / self._total
+
+    def confidence(self, label):
+        """Mean confidence of the votes for label in the window"""
+        count = self._counts.get(label)
+        if not count:
+            return 0.0
+        return self._confidences[label] / count
+
+    def stable(self):
+        """(class, mean confidence) once the window agrees, else None"""
+        if len(self._votes) < self.min_votes:
+            return None
+        label, share = self.leader()
+        if label is None or share < self.min_share:
+            return None
+        return label, self.confidence(label)
+
+
+def legacy_vote(buffer):
+    """The old per-frame majority: O(window^2) counting"""
+    return max(set(buffer), key=buffer.count)
+
+
+def main():
+    """Per-frame cost of the old majority vote vs the incremental stabilizer"""
+    import argparse
+    import numpy as np
+
+    parser = argparse.ArgumentParser(description="Stabilizer cost vs window size")
+    parser.add_argument('--windows', type=int, nargs='+', default=[5, 10, 15, 30, 60, 120])
+    parser.add_argument('--frames', type=int, default=20000)
+    parser.add_argument('--classes', type=int, default=29)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    # Mostly one letter per second with noisy frames in between, like live signing
+    letters = np.repeat(rng.integers(0, args.classes, args.frames // 30 + 1), 30)[:args.frames]
+    noise = rng.random(args.frames) < 0.2
+    labels = np.where(noise, rng.integers(0, args.classes, args.frames), letters)
+    labels = [f"class_{label}" for label in labels]
+    confidences = rng.uniform(0.5, 1.0, args.frames).tolist()
+
+    print("\n" + "="*70)
+    print(f"  STABILIZER COST - {args.frames} frames, {args.classes} classes")
+    print("="*70)
+    print(f"\n{'Window':<8} {'max(set)':>12} {'incremental':>13} {'decay 0.9':>12} {'speedup':>9}")
+    print("-" * 58)
+
+    for window in args.windows:
+        buffer = deque(maxlen=window)
+        start = time.perf_counter()
+        for label in labels:
+            buffer.append(label)
+            legacy_vote(buffer)
+        legacy_us = (time.perf_counter() - start) / args.frames * 1e6
+
+        timings = []
+        for decay in (1.0, 0.9):
+            stabilizer = PredictionStabilizer(window, min_votes=window // 2, decay=decay)
+            start = time.perf_counter()
+            for label, confidence in zip(labels, confidences):
+                stabilizer.push(label, confidence)
+                stabilizer.stable()
+            timings.append((time.perf_counter() - start) / args.frames * 1e6)
+
+        print(f"{window:<8} {legacy_us:>10.2f}µs {timings[0]:>11.2f}µs {timings[1]:>10.2f}µs "
+              f"{legacy_us / timings[0]:>8.1f}x")
+
+    print("\n   per-frame time for push + commit decision")
+    print("="*70)
+
+
+if __name__ == "__main__":
+    main()
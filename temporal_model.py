@@ -0,0 +1,429 @@
+"""
+Voxora.AI - Temporal Model Module
+Causal dilated-convolution model over the last SEQUENCE_LENGTH frames for
+the motion letters J and Z. At serving time it runs in streaming mode:
+every layer caches its recent inputs, so each frame costs one output step
+per layer instead of recomputing the whole window.
+"""
+
+import os
+import time
+from collections import deque
+import numpy as np
+from config import SEQUENCE_LENGTH, NUM_LANDMARKS, LANDMARK_DIMS
+
+LANDMARK_SIZE = NUM_LANDMARKS * LANDMARK_DIMS
+FEATURE_SIZE = 2 * LANDMARK_SIZE  # hand shape + per-frame motion
+MOTION_CLASSES = ['J', 'Z']
+OTHER_CLASS = 'other'  # everything the static classifier handles
+# Kernel 3 with these dilations sees the last 29 frames, inside SEQUENCE_LENGTH,
+# so streaming and whole-window outputs are identical
+KERNEL_SIZE = 3
+DILATIONS = (1, 2, 4, 7)
+DEFAULT_MODEL_PATH = os.path.join('models', 'temporal_model.npz')
+
+
+def _hand_scale(points):
+    scale = np.sqrt(((points[:, :2] - points[0, :2]) ** 2).sum(axis=1).max())
+    return scale if scale > 1e-6 else 1.0
+
+
+def frame_features(landmarks, previous=None):
+    """(126,) features of one frame: wrist-relative shape and motion since previous.
+
+    Both halves are in hand-size units, so they do not depend on where the
+    hand is or how close it is to the camera; the motion half keeps the
+    hand's own translation, which is what J and Z are drawn with.
+    """
+    points = np.asarray(landmarks, dtype=np.float32).reshape(NUM_LANDMARKS, LANDMARK_DIMS)
+    scale = _hand_scale(points)
+    features = np.zeros(FEATURE_SIZE, dtype=np.float32)
+    features[:LANDMARK_SIZE] = ((points - points[0]) / scale).reshape(-1)
+    if previous is not None:
+        delta = points - np.asarray(previous, dtype=np.float32).reshape(NUM_LANDMARKS, LANDMARK_DIMS)
+        features[LANDMARK_SIZE:] = (delta / scale).reshape(-1)
+    return features
+
+
+def motion_energy(features):
+    """Mean x/y landmark displacement of a frame in hand-size units"""
+    motion = features[LANDMARK_SIZE:].reshape(NUM_LANDMARKS, LANDMARK_DIMS)[:, :2]
+    return float(np.sqrt((motion ** 2).sum(axis=1)).mean())
+
+
+def sequence_features(frames):
+    """(frames, 126) features of a landmark stream; NaN rows ("no hand") become zeros"""
+    features = np.zeros((len(frames), FEATURE_SIZE), dtype=np.float32)
+    previous = None
+    for i, landmarks in enumerate(frames):
+        if np.isnan(landmarks).any():
+            previous = None
+            continue
+        features[i] = frame_features(landmarks, previous)
+        previous = landmarks
+    return features
+
+
+class _StreamingConv:
+    """One causal conv layer that keeps its last (kernel-1)*dilation+1 inputs"""
+
+    def __init__(self, kernel, bias, dilation):
+        kernel_size, in_channels, _ = kernel.shape
+        self.kernel = np.ascontiguousarray(kernel.reshape(kernel_size * in_channels, -1), dtype=np.float32)
+        self.bias = bias.astype(np.float32)
+        self.length = (kernel_size - 1) * dilation + 1
+        lags = np.arange(kernel_size)[::-1] * dilation  # tap i reads the input from lags[i] frames ago
+        self._taps = [(position - lags) % self.length for position in range(self.length)]
+        self.history = np.zeros((self.length, in_channels), dtype=np.float32)
+        self.position = 0
+
+    def reset(self):
+        self.history.fill(0)  # same as the zero padding of the whole-window model
+        self.position = 0
+
+    def step(self, x):
+        self.position = (self.position + 1) % self.length
+        self.history[self.position] = x
+        y = self.history[self._taps[self.position]].reshape(-1) @ self.kernel
+        y += self.bias
+        return np.maximum(y, 0, out=y)
+
+
+class TemporalModel:
+    """NumPy weights of the trained model: causal ReLU convs + softmax head"""
+
+    def __init__(self, convs, dense_kernel, dense_bias, classes):
+        self.convs = convs  # [(kernel (k, in, out), bias, dilation)]
+        self.dense_kernel = dense_kernel.astype(np.float32)
+        self.dense_bias = dense_bias.astype(np.float32)
+        self.classes = list(classes)
+        self.receptive_field = 1 + sum((kernel.shape[0] - 1) * dilation for kernel, _, dilation in convs)
+
+    @classmethod
+    def load(cls, path=DEFAULT_MODEL_PATH):
+        with np.load(path) as data:
+            convs = [(data[f'conv_{i}_kernel'], data[f'conv_{i}_bias'], int(dilation))
+                     for i, dilation in enumerate(data['dilations'])]
+            return cls(convs, data['dense_kernel'], data['dense_bias'], [str(c) for c in data['classes']])
+
+    def save(self, path):
+        arrays = {f'conv_{i}_kernel': kernel for i, (kernel, _, _) in enumerate(self.convs)}
+        arrays.update({f'conv_{i}_bias': bias for i, (_, bias, _) in enumerate(self.convs)})
+        np.savez(path, dilations=np.array([d for _, _, d in self.convs]),
+                 dense_kernel=self.dense_kernel, dense_bias=self.dense_bias,
+                 classes=np.array(self.classes), **arrays)
+
+    def head(self, hidden):
+        logits = hidden @ self.dense_kernel + self.dense_bias
+        logits -= logits.max(axis=-1, keepdims=True)
+        np.exp(logits, out=logits)
+        return logits / logits.sum(axis=-1, keepdims=True)
+
+    def predict_window(self, features):
+        """Probabilities for the last frame of a (frames, 126) window, recomputed from scratch"""
+        x = np.asarray(features, dtype=np.float32)
+        for kernel, bias, dilation in self.convs:
+            pad = (kernel.shape[0] - 1) * dilation
+            padded = np.concatenate([np.zeros((pad, x.shape[1]), dtype=np.float32), x])
+            y = bias.astype(np.float32) + sum(padded[i * dilation:i * dilation + len(x)] @ kernel[i]
+                                              for i in range(kernel.shape[0]))
+            x = np.maximum(y, 0)
+        return self.head(x[-1])
+
+    def stream(self):
+        return TemporalStream(self)
+
+
+class TemporalStream:
+    """Per-stream state: push one frame's features, read the cached output"""
+
+    def __init__(self, model):
+        self.model = model
+        self.layers = [_StreamingConv(kernel, bias, dilation) for kernel, bias, dilation in model.convs]
+        self.frames = 0
+        self._hidden = None
+
+    def reset(self):
+        for layer in self.layers:
+            layer.reset()
+        self.frames = 0
+        self._hidden = None
+
+    def push(self, features):
+        x = features
+        for layer in self.layers:
+            x = layer.step(x)
+        self._hidden = x
+        self.frames += 1
+
+    def probabilities(self):
+        """Class probabilities after the last pushed frame (None before the first)"""
+        return None if self._hidden is None else self.model.head(self._hidden)
+
+
+class TemporalRecognizer:
+    """Runs next to the static classifier and speaks up for J and Z.
+
+    update() is called for every frame of one stream. The conv caches are
+    advanced every frame (a few small matrix-vector products); the head is
+    only consulted while the hand's motion energy, averaged over
+    energy_frames, is above motion_threshold, and only a motion class at
+    or above confidence_threshold replaces the static prediction. A frame
+    without a hand breaks the sequence and resets the state.
+    """
+
+    def __init__(self, model, motion_threshold=0.03, energy_frames=8, confidence_threshold=0.8):
+        self.model = model
+        self.motion_threshold = motion_threshold
+        self.confidence_threshold = confidence_threshold
+        self.stream = model.stream()
+        self._previous = None
+        self._energy = deque(maxlen=energy_frames)
+        self._energy_sum = 0.0
+
+        # Stats
+        self.frames = 0
+        self.consulted = 0
+        self.overrides = 0
+
+    def reset(self):
+        self.stream.reset()
+        self._previous = None
+        self._energy.clear()
+        self._energy_sum = 0.0
+
+    def energy(self):
+        return self._energy_sum / len(self._energy) if self._energy else 0.0
+
+    def update(self, landmarks):
+        """(motion letter, confidence) to use instead of the static prediction, or None"""
+        if landmarks is None:
+            self.reset()
+            return None
+        self.frames += 1
+
+        features = frame_features(landmarks, self._previous)
+        self._previous = np.array(landmarks, dtype=np.float32)  # detector buffers are reused
+        self.stream.push(features)
+
+        if len(self._energy) == self._energy.maxlen:
+            self._energy_sum -= self._energy[0]
+        energy = motion_energy(features)
+        self._energy.append(energy)
+        self._energy_sum += energy
+
+        if self.energy() < self.motion_threshold:
+            return None
+        self.consulted += 1
+        probabilities = self.stream.probabilities()
+        best = int(np.argmax(probabilities))
+        label = self.model.classes[best]
+        if label == OTHER_CLASS or probabilities[best] < self.confidence_threshold:
+            return None
+        self.overrides += 1
+        return label, float(probabilities[best])
+
+    def stats(self):
+        return {
+            'frames': self.frames,
+            'consulted': self.consulted,
+            'consult_ratio': self.consulted / self.frames if self.frames else 0.0,
+            'overrides': self.overrides,
+            'motion_energy': self.energy()
+        }
+
+
+def load_temporal_model(path=DEFAULT_MODEL_PATH):
+    """The exported model, or None when it has not been trained yet"""
+    if not os.path.exists(path):
+        return None
+    return TemporalModel.load(path)
+
+
+def build_keras_model(num_classes, channels=64):
+    """Causal dilated Conv1D stack; the output of the last frame goes to the head"""
+    from tensorflow import keras
+
+    layers = [keras.layers.Input(shape=(SEQUENCE_LENGTH, FEATURE_SIZE))]
+    for dilation in DILATIONS:
+        layers.append(keras.layers.Conv1D(channels, KERNEL_SIZE, dilation_rate=dilation,
+                                          padding='causal', activation='relu'))
+        layers.append(keras.layers.Dropout(0.1))
+    layers += [
+        keras.layers.Cropping1D((SEQUENCE_LENGTH - 1, 0)),  # last time step only: what streaming computes
+        keras.layers.Flatten(),
+        keras.layers.Dropout(0.3),
+        keras.layers.Dense(num_classes, activation='softmax')
+    ]
+    return keras.Sequential(layers)
+
+
+def export_keras_model(model, classes):
+    """TemporalModel with the weights of a model from build_keras_model()"""
+    convs = []
+    dense = None
+    for layer in model.layers:
+        kind = layer.__class__.__name__
+        if kind == 'Conv1D':
+            if layer.padding != 'causal' or layer.strides[0] != 1 or layer.activation.__name__ != 'relu':
+                raise ValueError(f"Layer {layer.name} must be a causal, stride-1 ReLU Conv1D")
+            kernel, bias = layer.get_weights()
+            convs.append((kernel, bias, int(layer.dilation_rate[0])))
+        elif kind == 'Dense':
+            dense = layer.get_weights()
+        elif kind not in ('Dropout', 'Cropping1D', 'Flatten', 'InputLayer'):
+            raise ValueError(f"Unsupported layer type for temporal export: {kind} ({layer.name})")
+    return TemporalModel(convs, dense[0], dense[1], classes)
+
+
+def load_training_windows(sequences_dir, landmarks_dir, stride=2, min_energy=0.02,
+                          static_windows=2000, seed=0):
+    """(windows (N, SEQUENCE_LENGTH, 63) raw landmarks, labels) for training.
+
+    Recordings in sequences_dir/<class>/ (.npz/.npy from
+    `frame_sources.py --record`) are cut into windows; J and Z windows are
+    kept only while the hand is moving, windows from any other folder are
+    negatives. Static letters from the per-frame dataset are added as held
+    or slowly translated hands, so motion alone does not mean J or Z.
+    """
+    from frame_sources import load_landmark_recording
+
+    classes = MOTION_CLASSES + [OTHER_CLASS]
+    windows, labels = [], []
+    rng = np.random.default_rng(seed)
+
+    for class_name in sorted(os.listdir(sequences_dir)) if os.path.isdir(sequences_dir) else []:
+        class_dir = os.path.join(sequences_dir, class_name)
+        if not os.path.isdir(class_dir):
+            continue
+        label = classes.index(class_name) if class_name in MOTION_CLASSES else classes.index(OTHER_CLASS)
+        for filename in sorted(os.listdir(class_dir)):
+            if not filename.endswith(('.npz', '.npy')):
+                continue
+            frames, _ = load_landmark_recording(os.path.join(class_dir, filename))
+            for start in range(0, len(frames) - SEQUENCE_LENGTH + 1, stride):
+                window = frames[start:start + SEQUENCE_LENGTH]
+                if np.isnan(window).any(axis=1).mean() > 0.2:
+                    continue
+                if label != classes.index(OTHER_CLASS):
+                    energy = np.mean([motion_energy(f) for f in sequence_features(window)[1:]])
+                    if energy < min_energy:
+                        continue  # holding still before or after the letter
+                windows.append(window)
+                labels.append(label)
+
+    statics = []
+    for class_name in sorted(os.listdir(landmarks_dir)) if os.path.isdir(landmarks_dir) else []:
+        if class_name in MOTION_CLASSES:
+            continue
+        class_dir = os.path.join(landmarks_dir, class_name)
+        statics += [os.path.join(class_dir, f) for f in os.listdir(class_dir) if f.endswith('.npy')]
+    for path in rng.choice(statics, size=min(static_windows, len(statics)), replace=False) if statics else []:
+        hand = np.load(path).astype(np.float32).reshape(NUM_LANDMARKS, LANDMARK_DIMS)
+        drift = rng.normal(0, 0.004, 2) * rng.integers(0, 2)  # half held, half moved across the frame
+        window = np.repeat(hand[None], SEQUENCE_LENGTH, axis=0)
+        window[:, :, :2] += np.arange(SEQUENCE_LENGTH)[:, None, None] * drift
+        window += rng.normal(0, 0.002, window.shape).astype(np.float32)
+        windows.append(window.reshape(SEQUENCE_LENGTH, LANDMARK_SIZE))
+        labels.append(classes.index(OTHER_CLASS))
+
+    if not windows:
+        return np.zeros((0, SEQUENCE_LENGTH, LANDMARK_SIZE), dtype=np.float32), np.zeros(0, dtype=int), classes
+    return np.stack(windows).astype(np.float32), np.asarray(labels), classes
+
+
+def augment_windows(windows, labels, seed=0):
+    """Mirrored (other hand / unflipped recordings), rescaled and jittered copies"""
+    rng = np.random.default_rng(seed)
+    mirrored = windows.copy()
+    mirrored[:, :, 0::3] = 1.0 - mirrored[:, :, 0::3]
+    augmented = [windows, mirrored]
+    for source in (windows, mirrored):
+        scale = rng.uniform(0.9, 1.1, (len(source), 1, 1)).astype(np.float32)
+        augmented.append(source * scale + rng.normal(0, 0.002, source.shape).astype(np.float32))
+    return np.concatenate(augmented), np.tile(labels, len(augmented))
+
+
+def main():
+    """Train the J/Z temporal model, export it and compare streaming vs window cost"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Temporal J/Z model")
+    parser.add_argument('--sequences', default=os.path.join('my_custom_dataset', 'sequences'),
+                        help="Landmark recordings in <class>/ folders (J, Z, anything else = negatives)")
+    parser.add_argument('--landmarks', default=os.path.join('my_custom_dataset', 'landmarks'),
+                        help="Per-frame dataset used for static negatives")
+    parser.add_argument('--output', default=DEFAULT_MODEL_PATH)
+    parser.add_argument('--epochs', type=int, default=40)
+    parser.add_argument('--benchmark', action='store_true', help="Only benchmark an existing --output model")
+    args = parser.parse_args()
+
+    if not args.benchmark:
+        from tensorflow import keras
+        from sklearn.model_selection import train_test_split
+
+        windows, labels, classes = load_training_windows(args.sequences, args.landmarks)
+        counts = {name: int((labels == i).sum()) for i, name in enumerate(classes)}
+        print(f"\n📂 Training windows: {counts}")
+        if len(windows) == 0 or min(counts[name] for name in MOTION_CLASSES) == 0:
+            print(f"❌ Need J and Z recordings in {args.sequences}/J and {args.sequences}/Z "
+                  f"(python frame_sources.py camera:0 --record <file>.npz)")
+            return
+
+        X_train, X_val, y_train, y_val = train_test_split(windows, labels, test_size=0.2,
+                                                          random_state=42, stratify=labels)
+        X_train, y_train = augment_windows(X_train, y_train)
+        X_train = np.stack([sequence_features(w) for w in X_train])
+        X_val = np.stack([sequence_features(w) for w in X_val])
+        class_weight = {i: len(y_train) / (len(classes) * max((y_train == i).sum(), 1))
+                        for i in range(len(classes))}
+
+        model = build_keras_model(len(classes))
+        model.compile(optimizer=keras.optimizers.Adam(learning_rate=0.001),
+                      loss='sparse_categorical_crossentropy', metrics=['accuracy'])
+        model.fit(X_train, y_train, validation_data=(X_val, y_val), epochs=args.epochs, batch_size=64,
+                  class_weight=class_weight, verbose=2,
+                  callbacks=[keras.callbacks.EarlyStopping(monitor='val_loss', patience=8,
+                                                           restore_best_weights=True, verbose=1)])
+        _, accuracy = model.evaluate(X_val, y_val, verbose=0)
+        print(f"\n🎯 Validation accuracy: {accuracy*100:.2f}%")
+
+        temporal = export_keras_model(model, classes)
+        keras_probabilities = model.predict(X_val[:64], verbose=0)
+        numpy_probabilities = np.stack([temporal.predict_window(x) for x in X_val[:64]])
+        print(f"   NumPy export max error vs Keras: {np.abs(keras_probabilities - numpy_probabilities).max():.2e}")
+        temporal.save(args.output)
+        print(f"💾 Temporal model saved: {args.output}")
+
+    temporal = TemporalModel.load(args.output)
+    rng = np.random.default_rng(0)
+    features = rng.normal(0, 0.5, (300, FEATURE_SIZE)).astype(np.float32)
+
+    stream = temporal.stream()
+    max_error = 0.0
+    streaming_ms, window_ms = [], []
+    for i in range(len(features)):
+        start = time.perf_counter()
+        stream.push(features[i])
+        streamed = stream.probabilities()
+        streaming_ms.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        windowed = temporal.predict_window(features[max(0, i - SEQUENCE_LENGTH + 1):i + 1])
+        window_ms.append((time.perf_counter() - start) * 1000)
+        max_error = max(max_error, float(np.abs(streamed - windowed).max()))
+
+    print("\n" + "="*70)
+    print(f"  TEMPORAL MODEL - receptive field {temporal.receptive_field} frames, "
+          f"window {SEQUENCE_LENGTH}")
+    print("="*70)
+    print(f"\n{'Mode':<22} {'mean':>10} {'p95':>10}")
+    print("-" * 44)
+    print(f"{'whole window':<22} {np.mean(window_ms):>8.3f}ms {np.percentile(window_ms, 95):>8.3f}ms")
+    print(f"{'streaming (cached)':<22} {np.mean(streaming_ms):>8.3f}ms {np.percentile(streaming_ms, 95):>8.3f}ms")
+    print(f"\n   streaming vs window max difference: {max_error:.2e}")
+    print("="*70)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Voxora.AI - Text Events Module
+Pushes word/sentence changes to clients as Server-Sent Events with
+sequence IDs, so a reconnecting client resumes from Last-Event-ID
+instead of polling /get_text
+"""
+
+import threading
+from collections import deque
+from landmark_stream import format_sse
+
+
+class TextEventChannel:
+    """Sequence-numbered word/sentence updates fanned out to SSE clients.
+
+    publish() is cheap and ignores calls that change nothing, so it can be
+    called after every edit. Each event carries the full state, so a client
+    that fell further behind than `history` events still resumes correctly
+    from the latest one.
+    """
+
+    def __init__(self, history=256, heartbeat=15.0):
+        self.heartbeat = heartbeat
+        self._events = deque(maxlen=history)  # (seq, payload)
+        self._condition = threading.Condition()
+        self._seq = 0
+        self._state = ('', '')
+        self.published = 0
+
+    @property
+    def seq(self):
+        return self._seq
+
+    def publish(self, word, sentence):
+        with self._condition:
+            if (word, sentence) == self._state:
+                return self._seq
+            self._state = (word, sentence)
+            self._seq += 1
+            self._events.append((self._seq, {'seq': self._seq, 'word': word, 'sentence': sentence}))
+            self.published += 1
+            self._condition.notify_all()
+            return self._seq
+
+    def snapshot(self):
+        with self._condition:
+            return self._snapshot_locked()
+
+    def events_since(self, last_id):
+        """Events after last_id; the latest state alone if history has moved on"""
+        with self._condition:
+            if last_id is None or last_id > self._seq:
+                # New client (or the server restarted): start from the current state
+                return [(self._seq, self._snapshot_locked())]
+            if last_id == self._seq:
+                return []
+            if not self._events or self._events[0][0] > last_id + 1:
+                return [(self._seq, self._snapshot_locked())]
+            return [(seq, payload) for seq, payload in self._events if seq > last_id]
+
+    def _snapshot_locked(self):
+        word, sentence = self._state
+        return {'seq': self._seq, 'word': word, 'sentence': sentence}
+
+    def stream(self, last_id=None):
+        """SSE byte chunks for one client; blocks between updates"""
+        yield b"retry: 1000\n\n"
+        while True:
+            events = self.events_since(last_id)
+            for seq, payload in events:
+                yield format_sse(payload, event='text', event_id=seq)
+                last_id = seq
+            with self._condition:
+                if self._seq == last_id:
+                    notified = self._condition.wait(self.heartbeat)
+                else:
+                    notified = True
+            if not notified:
+                yield b": keepalive\n\n"  # also lets the server notice closed connections
@@ -12,6 +12,8 @@ from tensorflow import keras
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
 import pickle
+from scaler_folding import bake_scaler
+from cascade import evaluate_cascade, print_cascade_report
 
 class CustomModelTrainer:
     def __init__(self):
@@ -144,6 +146,46 @@ class CustomModelTrainer:
         
         return model
     
+    def create_fast_model(self, input_shape, num_classes):
+        """Create tiny 2-layer MLP used as the first stage of the cascade"""
+        print("\n🔨 Building FAST cascade model...")
+        
+        model = keras.Sequential([
+            keras.layers.Input(shape=input_shape),
+            keras.layers.Dense(128, activation='relu'),
+            keras.layers.Dropout(0.2),
+            keras.layers.Dense(64, activation='relu'),
+            keras.layers.Dense(num_classes, activation='softmax')
+        ])
+        
+        print(f"✅ Fast model created ({model.count_params():,} parameters)")
+        return model
+    
+    def train_fast_model(self, X_train, y_train, X_val, y_val):
+        """Train the cascade's first stage on the same (normalized) split"""
+        model = self.create_fast_model((X_train.shape[1],), len(self.classes))
+        model.compile(
+            optimizer=keras.optimizers.Adam(learning_rate=0.001),
+            loss='sparse_categorical_crossentropy',
+            metrics=['accuracy']
+        )
+        
+        print("\n🚀 Training fast model...")
+        model.fit(
+            X_train, y_train,
+            validation_data=(X_val, y_val),
+            epochs=60,
+            batch_size=64,
+            callbacks=[keras.callbacks.EarlyStopping(
+                monitor='val_loss',
+                patience=8,
+                restore_best_weights=True,
+                verbose=1
+            )],
+            verbose=2
+        )
+        return model
+    
     def train_model(self, sequences, labels):
         """Train the model with best practices"""
         print("\n" + "="*70)
@@ -245,10 +287,16 @@ class CustomModelTrainer:
         print(f"      Accuracy: {test_results[1]*100:.2f}%")
         print(f"      Top-3 Accuracy: {test_results[2]*100:.2f}%")
         
+        # Bake the scaler into the shipped model so it takes raw landmarks
+        raw_model = bake_scaler(model, scaler)
+        raw_test = scaler.inverse_transform(X_test)
+        fold_error = np.abs(raw_model.predict(raw_test, verbose=0) - model.predict(X_test, verbose=0)).max()
+        print(f"\n🔗 Scaler baked into model (max deviation {fold_error:.2e})")
+        
         # Save final model
         model_path = os.path.join(self.model_dir, 'signity_custom_model.h5')
-        model.save(model_path)
-        print(f"\n💾 Model saved: {model_path}")
+        raw_model.save(model_path)
+        print(f"\n💾 Model saved: {model_path} (takes raw landmarks)")
         
         # Save class mapping
         class_mapping = {
@@ -262,10 +310,25 @@ class CustomModelTrainer:
             json.dump(class_mapping, f, indent=2)
         print(f"💾 Class mapping saved: {mapping_path}")
         
+        # Cascade first stage
+        fast_model = bake_scaler(self.train_fast_model(X_train, y_train, X_val, y_val), scaler)
+        fast_model_path = os.path.join(self.model_dir, 'signity_fast_model.h5')
+        fast_model.save(fast_model_path)
+        print(f"\n💾 Fast model saved: {fast_model_path}")
+        
+        # The fast model's own mapping, so serving can check it against the heavy model's
+        fast_mapping_path = os.path.join(self.model_dir, 'signity_fast_class_mapping.json')
+        with open(fast_mapping_path, 'w') as f:
+            json.dump(class_mapping, f, indent=2)
+        print(f"💾 Fast model class mapping saved: {fast_mapping_path}")
+        
+        print("\n📊 Cascade vs single model (test set):")
+        print_cascade_report(evaluate_cascade(fast_model, raw_model, raw_test, y_test))
+        
         # Create backup
         self.create_model_backup(model_path, test_results[1])
         
-        return model, history, test_results[1]
+        return raw_model, history, test_results[1]
     
     def create_model_backup(self, model_path, accuracy):
         """Create timestamped backup of trained model"""
@@ -296,6 +359,7 @@ class CustomModelTrainer:
             f.write(f"Created: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
             f.write(f"Test Accuracy: {accuracy*100:.2f}%\n")
             f.write(f"Classes: {len(self.classes)}\n")
+            f.write(f"Input: raw landmarks (scaler baked in)\n")
         
         print(f"💾 Model backup created: {backup_path}")
     
@@ -336,7 +400,8 @@ class CustomModelTrainer:
         print(f"\n📁 Files created:")
         print(f"   - models/signity_custom_model.h5 (main model)")
         print(f"   - models/best_custom_model.h5 (best checkpoint)")
-        print(f"   - models/scaler.pkl (data normalizer)")
+        print(f"   - models/signity_fast_model.h5 (cascade first stage)")
+        print(f"   - models/scaler.pkl (data normalizer, already baked into the model)")
         print(f"   - models/custom_class_mapping.json (class mapping)")
         print(f"   - model_backups/ (timestamped backups)")
         print(f"\n🚀 Next step: Test your model")
@@ -8,12 +8,30 @@ from flask import Flask, Response, jsonify, request
 from flask_cors import CORS
 import cv2
 import numpy as np
-from tensorflow import keras
 import os
 import json
 import time
-from collections import deque
 from hand_detector import HandDetector
+from numpy_inference import load_bundle, export_model, verify_bundle, bundle_path_for
+from quantize_model import TFLiteClassifier, quantized_model_path
+from inference_scheduler import MicroBatchScheduler
+from motion_gate import MotionGate
+from prediction_cache import LandmarkCache
+from confusion_resolver import ConfusionResolver
+from cascade import CascadeClassifier, check_cascade
+from frame_pipeline import FramePipeline, FramePacket, FrameBroadcaster
+from frame_sources import open_source, detect_recorded
+from frame_buffers import FrameRing
+from detector_workers import DetectorWorkerPool
+from batch_classify import decode_landmark_batch, classify_frames, FrameClock, stabilize_batch
+from landmark_stream import landmark_event, format_sse
+from recognition_session import RecognitionSession, SessionManager
+from temporal_model import TemporalRecognizer, load_temporal_model
+from lexicon_decoder import PrefixTrie, LexiconDecoder
+from model_registry import ModelRegistry, ModelVersion, ServingModel
+from scaler_folding import prepare_raw_input_model
+from landmark_utils import normalize_landmarks
+from config import NUM_LANDMARKS, LANDMARK_DIMS, STABILIZATION_FRAMES
 import threading
 from openai import OpenAI
 
@@ -21,17 +39,59 @@ app = Flask(__name__)
 CORS(app)  # Enable CORS for React frontend
 
 # Global variables
-camera = None
-hand_detector = None
-model = None
-class_mapping = None
-current_letter = None
-current_word = ""
-sentence = ""
-prediction_buffer = deque(maxlen=10)  # Reduced for faster response
-last_letter_time = 0
 letter_hold_time = 1.0  # Reduced from 1.5 to 1.0 seconds
 confidence_threshold = 0.85  # Slightly lower for faster recognition
+model_path = os.path.join('models', 'signity_model.h5')
+class_mapping_path = os.path.join('processed_data', 'class_mapping.json')
+use_numpy_inference = True  # NumPy forward pass instead of keras predict per frame
+model_variant = 'float'  # 'float', or 'int8' / 'float16' after running quantize_model.py
+use_cascade = False  # Small MLP first, full model only for uncertain frames
+fast_model_path = os.path.join('models', 'signity_fast_model.h5')
+fast_class_mapping_path = os.path.join('models', 'signity_fast_class_mapping.json')
+# The fast model is trained alongside the custom model, on its 28-class mapping
+cascade_model_path = os.path.join('models', 'signity_custom_model.h5')
+cascade_class_mapping_path = os.path.join('models', 'custom_class_mapping.json')
+cascade_margin = 0.9
+use_batch_scheduler = True  # Batch predictions across all active streams
+max_batch_size = 16
+max_batch_delay_ms = 3.0
+use_motion_gate = True  # Reuse last prediction while the hand is stationary
+motion_gate_threshold = 0.02
+motion_gate_max_skip = 5
+motion_gates = {}  # frame source -> MotionGate of its capture loop
+use_prediction_cache = True  # Reuse predictions for recurring hand shapes
+prediction_cache = LandmarkCache(bin_size=0.05, capacity=4096)
+use_roi_tracking = True  # Search for the hand in a crop around its last position
+detector_skip_frames = 0  # >0: run MediaPipe at most every N+1 frames, predict landmarks in between
+detector_processes = 0  # >0: run MediaPipe for all streams in this many worker processes
+detector_pool = None
+frame_source = 'camera:0'  # or a video file, image directory or landmark recording (.npz)
+pipeline_queue_size = 2  # Frames buffered between stages before the oldest is dropped
+active_pipelines = set()
+broadcasters = {}  # frame source -> FrameBroadcaster shared by all its /video_feed clients
+broadcasters_lock = threading.Lock()
+stabilization_window = STABILIZATION_FRAMES  # Frames in the confidence-weighted vote (updates are O(1), so it can grow)
+stabilization_min_votes = 5  # Frames needed before the vote can commit a letter
+stabilization_decay = 1.0  # <1: older frames in the window count less
+use_lexicon_decoder = False  # Beam search over a word list instead of holding each letter
+lexicon_path = os.path.join('models', 'lexicon.txt')  # One word per line
+lexicon = None
+decoder_beam_width = 8
+session_idle_timeout = 300.0  # Seconds before a session without open streams is dropped
+
+def create_session(session_id):
+    decoder = LexiconDecoder(lexicon, beam_width=decoder_beam_width) if lexicon is not None else None
+    return RecognitionSession(session_id, confidence_threshold, letter_hold_time,
+                              stabilization_window, stabilization_min_votes,
+                              stabilization_decay, decoder=decoder)
+
+sessions = SessionManager(create_session, idle_timeout=session_idle_timeout)
+use_confusion_resolver = True  # O/C, E/S, N/M pair classifiers as a second stage
+use_temporal_model = True  # J/Z sequence model next to the static classifier (after temporal_model.py)
+temporal_model_path = os.path.join('models', 'temporal_model.npz')
+temporal_model = None
+temporal_motion_threshold = 0.03  # Motion energy (hand sizes per frame) before the sequence model is asked
+temporal_recognizers = {}  # frame source -> TemporalRecognizer of its capture loop
 
 # OpenAI client
 try:
@@ -43,91 +103,210 @@ except Exception as e:
     print(f"⚠️  OpenAI client warning: {e}")
     openai_client = None
 
-def load_model():
-    """Load the trained model"""
-    global model, class_mapping
+def load_classifier(path):
+    """Load one classifier, preferring the quantized or NumPy variant"""
+    bundle_path = bundle_path_for(path)
+    bundle_is_current = (os.path.exists(bundle_path) and
+                         (not os.path.exists(path) or
+                          os.path.getmtime(bundle_path) >= os.path.getmtime(path)))
     
-    model_path = os.path.join('models', 'signity_model.h5')
-    model = keras.models.load_model(model_path)
-    print(f"✅ Model loaded: {model_path}")
+    if model_variant != 'float':
+        quantized_path = quantized_model_path(path, model_variant)
+        classifier = TFLiteClassifier(quantized_path)
+        print(f"✅ Model loaded ({model_variant}): {quantized_path}")
+    elif use_numpy_inference and bundle_is_current:
+        classifier = load_bundle(bundle_path)
+        print(f"✅ Model loaded (NumPy): {bundle_path}")
+    else:
+        from tensorflow import keras
+        classifier = keras.models.load_model(path)
+        print(f"✅ Model loaded: {path}")
+        
+        if use_numpy_inference:
+            # Export once; later starts skip TensorFlow entirely
+            export_model(classifier, bundle_path)
+            numpy_model = load_bundle(bundle_path)
+            ok, max_error, _ = verify_bundle(classifier, numpy_model)
+            if ok:
+                classifier = numpy_model
+                print(f"💾 NumPy bundle exported: {bundle_path}")
+            else:
+                os.remove(bundle_path)
+                print(f"⚠️  NumPy bundle mismatch ({max_error:.2e}), keeping Keras model")
     
-    # Load class mapping
-    mapping_path = os.path.join('processed_data', 'class_mapping.json')
-    if os.path.exists(mapping_path):
-        with open(mapping_path, 'r') as f:
+    return classifier
+
+def load_class_mapping(path):
+    """Model index -> class name mapping"""
+    if path is not None and os.path.exists(path):
+        with open(path, 'r') as f:
             mapping = json.load(f)
-        class_mapping = mapping['model_to_class']
-    else:
-        # Default mapping
-        classes = ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H', 'I', 'J', 'K', 'L', 'M',
-                  'N', 'O', 'P', 'Q', 'R', 'S', 'T', 'U', 'V', 'W', 'X', 'Y', 'Z',
-                  'del', 'nothing', 'space']
-        class_mapping = {str(i): classes[i] for i in range(len(classes))}
-
-def predict_sign(landmarks):
-    """Predict sign from landmarks"""
-    if landmarks is None:
-        return 'nothing', 0.0
+        return mapping['model_to_class']
     
-    landmarks_input = landmarks.reshape(1, -1)
-    predictions = model.predict(landmarks_input, verbose=0)[0]
-    class_idx = np.argmax(predictions)
-    confidence = predictions[class_idx]
+    # Default mapping
+    classes = ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H', 'I', 'J', 'K', 'L', 'M',
+              'N', 'O', 'P', 'Q', 'R', 'S', 'T', 'U', 'V', 'W', 'X', 'Y', 'Z',
+              'del', 'nothing', 'space']
+    return {str(i): classes[i] for i in range(len(classes))}
+
+def load_serving_model(version):
+    """Load a registry version with its class mapping and helpers"""
+    path = version.model_path
+    if version.scaler_path is not None:
+        path = prepare_raw_input_model(path, version.scaler_path)
     
-    class_name = class_mapping.get(str(class_idx), f"Unknown_{class_idx}")
+    classifier = load_classifier(path)
+    class_mapping = load_class_mapping(version.class_mapping_path)
+    if version.fast_model_path is not None:
+        fast_model = load_classifier(version.fast_model_path)
+        try:
+            if version.fast_class_mapping_path is None or not os.path.exists(version.fast_class_mapping_path):
+                raise ValueError("fast model has no class mapping to check against")
+            check_cascade(fast_model, classifier, load_class_mapping(version.fast_class_mapping_path),
+                          class_mapping, NUM_LANDMARKS * LANDMARK_DIMS)
+        except ValueError as e:
+            print(f"⚠️  Cascade disabled: {e}")
+        else:
+            classifier = CascadeClassifier(fast_model, classifier, margin=cascade_margin)
+            print(f"✅ Cascade mode: fast model first, escalating below {cascade_margin:.2f}")
+    
+    confusion_resolver = None
+    if use_confusion_resolver:
+        confusion_resolver = ConfusionResolver.from_files(class_mapping)
+        if confusion_resolver is not None:
+            print(f"✅ Confusion resolver loaded: {', '.join(confusion_resolver.pairs)}")
+    
+    scheduler = None
+    if use_batch_scheduler:
+        scheduler = MicroBatchScheduler(
+            lambda batch: classifier.predict(batch, verbose=0),
+            max_batch_size=max_batch_size,
+            max_delay_ms=max_batch_delay_ms
+        ).start()
     
-    return class_name, confidence
+    return ServingModel(classifier, class_mapping, confusion_resolver, scheduler)
 
-def get_stable_prediction(landmarks):
-    """Get stabilized prediction - OPTIMIZED"""
-    global prediction_buffer
+def on_model_swap(serving):
+    """Cached predictions belong to the old model"""
+    prediction_cache.clear()
+    for gate in list(motion_gates.values()):
+        gate.reset()
+
+model_registry = ModelRegistry(load_serving_model, backup_dir='model_backups', on_swap=on_model_swap)
+
+def load_model():
+    """Load the trained model"""
+    model_registry.add(ModelVersion('default', model_path, class_mapping_path=class_mapping_path))
+    serving_version = 'default'
+    if use_cascade and os.path.exists(fast_model_path) and os.path.exists(cascade_model_path):
+        model_registry.add(ModelVersion('cascade', cascade_model_path,
+                                        class_mapping_path=cascade_class_mapping_path,
+                                        fast_model_path=fast_model_path,
+                                        fast_class_mapping_path=fast_class_mapping_path))
+        serving_version = 'cascade'
+    model_registry.activate(serving_version, background=False)
+    if model_registry.active is None:
+        raise RuntimeError(f"Could not load {model_registry.get(serving_version).model_path}")
     
-    if landmarks is None:
-        prediction_buffer.clear()
-        return 'nothing', 1.0
+    versions = model_registry.scan()
+    print(f"📦 Model registry: {len(versions)} versions ({len(versions) - 1} in model_backups/)")
     
-    predicted_class, confidence = predict_sign(landmarks)
+    global lexicon
+    if use_lexicon_decoder and os.path.exists(lexicon_path):
+        lexicon = PrefixTrie.load(lexicon_path)
+        print(f"✅ Lexicon loaded: {lexicon.words:,} words (beam width {decoder_beam_width})")
     
-    if confidence >= confidence_threshold:
-        prediction_buffer.append(predicted_class)
+    global temporal_model
+    if use_temporal_model:
+        temporal_model = load_temporal_model(temporal_model_path)
+        if temporal_model is not None:
+            print(f"✅ Temporal model loaded: {', '.join(temporal_model.classes)}")
+
+def run_model(landmarks, serving):
+    """Run the classifier on a single landmark vector"""
+    if serving.scheduler is not None:
+        return serving.scheduler.predict(landmarks)
+    return serving.classifier.predict(landmarks.reshape(1, -1), verbose=0)[0]
+
+def predict_probabilities(landmarks, serving, motion_gate=None):
+    """Class probabilities for a single landmark vector (motion_gate: the stream's gate)"""
+    if motion_gate is None and not use_prediction_cache:
+        return run_model(landmarks, serving)
     
-    # Faster stabilization - need only 5 frames
-    if len(prediction_buffer) >= 5:
-        most_common = max(set(prediction_buffer), key=prediction_buffer.count)
-        return most_common, confidence
+    normalized = normalize_landmarks(landmarks)
+    if motion_gate is not None:
+        cached = motion_gate.lookup(normalized)
+        if cached is not None:
+            return cached
     
-    return predicted_class, confidence
+    start = time.perf_counter()
+    if use_prediction_cache:
+        cache_key = prediction_cache.key(normalized)
+        predictions = prediction_cache.get(cache_key)
+        if predictions is None:
+            predictions = run_model(landmarks, serving)
+            prediction_cache.put(cache_key, predictions)
+    else:
+        predictions = run_model(landmarks, serving)
+    
+    if motion_gate is not None:
+        motion_gate.update(normalized, predictions, (time.perf_counter() - start) * 1000)
+    return predictions
 
-def process_letter(letter):
-    """Process detected letter and build words/sentences"""
-    global current_letter, last_letter_time, current_word, sentence
+def predict_sign(landmarks, motion_gate=None):
+    """Predict sign from landmarks
     
-    current_time = time.time()
+    Returns (class name, confidence, probabilities, class mapping); the
+    last two are None when there is no hand.
+    """
+    if landmarks is None:
+        return 'nothing', 0.0, None, None
     
-    if letter == 'nothing':
-        return
+    # One snapshot per frame: a model swap takes effect between frames
+    serving = model_registry.active
     
-    if letter == 'space':
-        if current_word:
-            sentence += current_word + " "
-            current_word = ""
-        current_letter = None
-        return
+    predictions = predict_probabilities(landmarks, serving, motion_gate)
+    if serving.confusion_resolver is not None:
+        predictions = serving.confusion_resolver.resolve(predictions, landmarks)
+    class_idx = np.argmax(predictions)
+    confidence = predictions[class_idx]
     
-    if letter == 'del':
-        if current_word:
-            current_word = current_word[:-1]
-        current_letter = None
-        return
+    class_name = serving.class_mapping.get(str(class_idx), f"Unknown_{class_idx}")
     
-    # Regular letter
-    if letter != current_letter:
-        current_letter = letter
-        last_letter_time = current_time
-    else:
-        if current_time - last_letter_time >= letter_hold_time:
-            current_word += letter
-            current_letter = None
+    return class_name, confidence, predictions, serving.class_mapping
+
+def with_motion_letter(probabilities, class_mapping, letter, confidence):
+    """Probabilities with the temporal model's letter mixed in, for the decoder"""
+    for index, name in class_mapping.items():
+        if name == letter:
+            probabilities = probabilities * (1.0 - confidence)
+            probabilities[int(index)] += confidence
+            break
+    return probabilities
+
+def apply_motion_letters(recognizer, frames, hand, probabilities, class_mapping):
+    """Run a /classify batch through the session's TemporalRecognizer, mixing in J/Z"""
+    for i in range(len(frames)):
+        motion_letter = recognizer.update(frames[i] if hand[i] else None)
+        if motion_letter is not None:
+            probabilities[i] = with_motion_letter(probabilities[i], class_mapping, *motion_letter)
+
+def current_session():
+    """Recognition session of this request (?session=<id> or X-Session-ID)"""
+    session_id = request.args.get('session') or request.headers.get('X-Session-ID') or 'default'
+    return sessions.get(session_id)
+
+def session_stream(session, kind):
+    """Shared frames for one client, with this session's recognition applied"""
+    session.attach()
+    try:
+        for packet in get_broadcaster(frame_source).stream(kind=kind):
+            prediction = packet.prediction if packet.hand_present else None
+            yield packet, session.update(prediction, packet.confidence, frame_at=packet.captured_at,
+                                         probabilities=packet.probabilities,
+                                         class_mapping=packet.class_mapping)
+    finally:
+        session.detach()
 
 def correct_sentence_with_gpt(text):
     """Correct sentence using GPT"""
@@ -155,70 +334,154 @@ def correct_sentence_with_gpt(text):
         print(f"GPT Error: {e}")
         return text.capitalize()
 
-def generate_frames():
-    """Generate frames for video streaming - OPTIMIZED"""
-    global camera, hand_detector
+def draw_hud(packet):
+    """Draw the frame's prediction and hand status (the word is per session)"""
+    frame_with_hand = packet.frame
+    h, w = frame_with_hand.shape[:2]
     
-    camera = cv2.VideoCapture(0)
-    # Reduce resolution for faster processing
-    camera.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-    camera.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
-    camera.set(cv2.CAP_PROP_FPS, 30)
-    camera.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+    # Simple dark rectangle (faster than overlay)
+    cv2.rectangle(frame_with_hand, (0, 0), (w, 60), (0, 0, 0), -1)
     
-    hand_detector = HandDetector()
+    # Current prediction
+    if packet.prediction:
+        color = (0, 255, 0) if packet.confidence >= confidence_threshold else (0, 165, 255)
+        cv2.putText(frame_with_hand, f"{packet.prediction} {packet.confidence*100:.0f}%", 
+                   (20, 35), cv2.FONT_HERSHEY_SIMPLEX, 0.9, color, 2)
+    
+    # Hand status indicator (smaller)
+    if packet.hand_present:
+        cv2.circle(frame_with_hand, (w - 30, 30), 20, (0, 255, 0), -1)
+    else:
+        cv2.circle(frame_with_hand, (w - 30, 30), 20, (0, 0, 255), -1)
+
+def get_detector_pool():
+    """Worker processes shared by every stream, started on first use"""
+    global detector_pool
+    with broadcasters_lock:
+        if detector_pool is None:
+            detector_pool = DetectorWorkerPool(detector_processes, detector_kwargs={
+                'tracking': use_roi_tracking,
+                'skip_frames': detector_skip_frames
+            })
+            print(f"✅ Detector worker pool: {detector_processes} processes")
+        return detector_pool
+
+def run_video_pipeline(source):
+    """Capture + inference loop for one source - PIPELINED
+    
+    Capture, detection, classification and HUD + JPEG encoding run on
+    their own threads, so throughput is bounded by the slowest stage
+    rather than the sum of all stages. Yields finished FramePackets.
+    """
+    # Reduced resolution for faster processing; replayed sources loop at their own fps
+    camera = open_source(source, realtime=True, loop=True, width=640, height=480)
+    
+    # Landmark recordings bring their own detector instead of MediaPipe
+    hand_detector = camera.create_detector()
+    if hand_detector is None:
+        if detector_processes:
+            hand_detector = get_detector_pool().client(source)
+        else:
+            hand_detector = HandDetector(tracking=use_roi_tracking, skip_frames=detector_skip_frames)
+    
+    # The cached prediction belongs to this stream's hand
+    motion_gate = None
+    if use_motion_gate:
+        motion_gate = MotionGate(threshold=motion_gate_threshold, max_skip_frames=motion_gate_max_skip)
+        motion_gates[source] = motion_gate
+    
+    # Sequence state for J/Z lives with the stream, like the detector's tracking
+    temporal = None
+    if temporal_model is not None:
+        temporal = TemporalRecognizer(temporal_model, motion_threshold=temporal_motion_threshold)
+        temporal_recognizers[source] = temporal
     
     # JPEG encoding parameters for faster compression
     encode_param = [int(cv2.IMWRITE_JPEG_QUALITY), 80]
     
-    frame_count = 0
+    # Decode into one reused image and flip into a ring with a buffer for
+    # every frame that can be queued or inside a stage at the same time
+    frames = FrameRing((pipeline_queue_size + 1) * 4 + 1)
+    decoded = [None]
     
-    while True:
-        success, frame = camera.read()
+    def capture():
+        success, frame, recorded = camera.read_recorded(decoded[0])
         if not success:
-            break
-        
-        frame_count += 1
-        frame = cv2.flip(frame, 1)
-        
-        # Process every frame for smooth video
-        frame_with_hand, landmarks, hand_present = hand_detector.detect_hand(frame)
-        
-        # Get prediction (fast)
-        predicted_letter, confidence = get_stable_prediction(landmarks)
-        
-        # Process letter
-        if predicted_letter and confidence >= confidence_threshold:
-            process_letter(predicted_letter)
-        
-        # Draw UI on frame (simplified for speed)
-        h, w = frame_with_hand.shape[:2]
-        
-        # Simple dark rectangle (faster than overlay)
-        cv2.rectangle(frame_with_hand, (0, 0), (w, 100), (0, 0, 0), -1)
-        
-        # Current prediction
-        if predicted_letter:
-            color = (0, 255, 0) if confidence >= confidence_threshold else (0, 165, 255)
-            cv2.putText(frame_with_hand, f"{predicted_letter} {confidence*100:.0f}%", 
-                       (20, 35), cv2.FONT_HERSHEY_SIMPLEX, 0.9, color, 2)
-        
-        # Current word (smaller text)
-        cv2.putText(frame_with_hand, f"Word: {current_word[:20]}", 
-                   (20, 70), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
-        
-        # Hand status indicator (smaller)
-        if hand_present:
-            cv2.circle(frame_with_hand, (w - 30, 30), 20, (0, 255, 0), -1)
-        else:
-            cv2.circle(frame_with_hand, (w - 30, 30), 20, (0, 0, 255), -1)
-        
-        # Fast JPEG encoding
-        ret, buffer = cv2.imencode('.jpg', frame_with_hand, encode_param)
-        frame = buffer.tobytes()
-        
-        yield (b'--frame\r\n'
-               b'Content-Type: image/jpeg\r\n\r\n' + frame + b'\r\n')
+            return None
+        decoded[0] = frame
+        return FramePacket(cv2.flip(frame, 1, dst=frames.next(frame.shape)), recorded)
+    
+    def detect(packet):
+        packet.frame, packet.landmarks, packet.hand_present = detect_recorded(
+            hand_detector, packet.frame, packet.recorded)
+        return packet
+    
+    def classify(packet):
+        # Per-frame prediction only; each session stabilizes it and builds its own text
+        if packet.landmarks is None and motion_gate is not None:
+            motion_gate.reset()
+        (packet.prediction, packet.confidence,
+         packet.probabilities, packet.class_mapping) = predict_sign(packet.landmarks, motion_gate)
+        if temporal is not None:
+            motion_letter = temporal.update(packet.landmarks)
+            if motion_letter is not None:
+                packet.prediction, packet.confidence = motion_letter
+                packet.probabilities = with_motion_letter(packet.probabilities, packet.class_mapping,
+                                                          *motion_letter)
+        return packet
+    
+    def encode(packet):
+        if get_broadcaster(source).subscriber_count('mjpeg') == 0:
+            return packet  # only landmark clients: skip the HUD and JPEG entirely
+        draw_hud(packet)
+        ret, buffer = cv2.imencode('.jpg', packet.frame, encode_param)
+        packet.jpeg = buffer.tobytes()
+        return packet
+    
+    pipeline = FramePipeline(capture, [
+        ('detect', detect),
+        ('classify', classify),
+        ('encode', encode)
+    ], queue_size=pipeline_queue_size, name=f"video_feed:{source}")
+    active_pipelines.add(pipeline)
+    pipeline.start()
+    
+    try:
+        for packet in pipeline:
+            yield packet
+    finally:
+        pipeline.stop()
+        active_pipelines.discard(pipeline)
+        camera.release()
+        hand_detector.close()
+        if motion_gate is not None and motion_gates.get(source) is motion_gate:
+            del motion_gates[source]
+        if temporal is not None and temporal_recognizers.get(source) is temporal:
+            del temporal_recognizers[source]
+
+def get_broadcaster(source):
+    """The shared capture loop for a source, created on first use"""
+    with broadcasters_lock:
+        broadcaster = broadcasters.get(source)
+        if broadcaster is None:
+            broadcaster = FrameBroadcaster(lambda: run_video_pipeline(source),
+                                           queue_size=pipeline_queue_size, name=source)
+            broadcasters[source] = broadcaster
+        return broadcaster
+
+def generate_frames(session):
+    """MJPEG stream for one subscriber of the shared capture loop"""
+    for packet, _ in session_stream(session, 'mjpeg'):
+        if packet.jpeg is None:
+            continue  # encoded before this client subscribed
+        # One chunk: every yielded chunk is its own write (and chunk framing) on
+        # the socket, which costs more than copying the JPEG (frame_buffers.py)
+        yield b'--frame\r\nContent-Type: image/jpeg\r\n\r\n' + packet.jpeg + b'\r\n'
+
+def generate_landmark_events(session):
+    """SSE stream of per-frame landmarks, prediction and word state"""
+    for packet, state in session_stream(session, 'landmarks'):
+        yield format_sse(landmark_event(packet, state))
 
 @app.route('/')
 def index():
@@ -230,6 +493,8 @@ def index():
         'endpoints': {
             'video_feed': '/video_feed',
             'get_text': '/get_text',
+            'stats': '/stats',
+            'models': '/models',
             'add_space': '/add_space',
             'delete_letter': '/delete_letter',
             'correct': '/correct',
@@ -240,30 +505,148 @@ def index():
 @app.route('/video_feed')
 def video_feed():
     """Video streaming route"""
-    return Response(generate_frames(),
+    return Response(generate_frames(current_session()),
                    mimetype='multipart/x-mixed-replace; boundary=frame')
 
+@app.route('/landmark_feed')
+def landmark_feed():
+    """Landmark streaming route - a few hundred bytes per frame instead of a JPEG"""
+    return Response(generate_landmark_events(current_session()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/classify', methods=['POST'])
+def classify():
+    """Classify a batch of client-extracted landmark frames in one model call
+    
+    Body: float32 frames (application/octet-stream) or {"landmarks": [...]}
+    JSON. Frames also advance the session's letter state machine, timed by
+    "timestamps" (seconds, any epoch) or spaced at ?fps= (default 30) ending
+    now, and always after the session's previous frame (FrameClock).
+    """
+    try:
+        frames, timestamps = decode_landmark_batch(request.get_data(), request.content_type)
+        fps = float(request.args.get('fps', 30))
+        if not 0 < fps < float('inf'):
+            raise ValueError("fps must be a positive number")
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    serving = model_registry.active
+    probabilities, hand = classify_frames(serving, frames)
+    session = current_session()
+    with session.lock:
+        if session.frame_clock is None:
+            session.frame_clock = FrameClock()
+        times = session.frame_clock.times(len(frames), timestamps, fps, after=session.last_time)
+        # J/Z need the sequence, which continues from this session's previous batch
+        if temporal_model is not None:
+            if session.temporal is None:
+                session.temporal = TemporalRecognizer(temporal_model, motion_threshold=temporal_motion_threshold)
+            apply_motion_letters(session.temporal, frames, hand, probabilities, serving.class_mapping)
+    letters = stabilize_batch(session, probabilities, hand, serving.class_mapping, times)
+    current_word, sentence = session.text()
+    
+    response = {
+        'letters': letters,
+        'word': current_word,
+        'sentence': sentence
+    }
+    if request.args.get('probabilities', '1') != '0':
+        response['classes'] = [serving.class_mapping.get(str(i), str(i)) for i in range(probabilities.shape[1])]
+        response['probabilities'] = np.round(probabilities, 4).tolist()
+    return jsonify(response)
+
 @app.route('/get_text')
 def get_text():
     """Get current word and sentence"""
+    current_word, sentence = current_session().text()
     return jsonify({
         'word': current_word,
         'sentence': sentence
     })
 
+def session_text_events(session, last_id):
+    session.attach()
+    try:
+        yield from session.text_events.stream(last_id)
+    finally:
+        session.detach()
+
+@app.route('/text_events')
+def text_event_stream():
+    """Push word/sentence changes; reconnecting clients resume from Last-Event-ID"""
+    last_id = request.headers.get('Last-Event-ID') or request.args.get('last_id')
+    try:
+        last_id = int(last_id) if last_id is not None else None
+    except ValueError:
+        last_id = None
+    return Response(session_text_events(current_session(), last_id), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/stats')
+def stats():
+    """Inference performance counters"""
+    serving = model_registry.active
+    return jsonify({
+        'model_version': model_registry.active_version,
+        'motion_gate': {source: gate.stats() for source, gate in list(motion_gates.items())},
+        'prediction_cache': prediction_cache.stats() if use_prediction_cache else None,
+        'confusion_resolver': serving.confusion_resolver.stats() if serving.confusion_resolver is not None else None,
+        'cascade': serving.classifier.stats() if isinstance(serving.classifier, CascadeClassifier) else None,
+        'batch_scheduler': serving.scheduler.stats() if serving.scheduler is not None else None,
+        'pipelines': [pipeline.stats() for pipeline in list(active_pipelines)],
+        'broadcasters': [broadcaster.stats() for broadcaster in list(broadcasters.values())],
+        'sessions': sessions.stats(),
+        'detector_pool': detector_pool.stats() if detector_pool is not None else None,
+        'temporal_model': {source: recognizer.stats() for source, recognizer in list(temporal_recognizers.items())}
+    })
+
+@app.route('/models')
+def list_models():
+    """Model versions with accuracy, load time and state"""
+    model_registry.scan()
+    return jsonify({
+        'active': model_registry.active_version,
+        'versions': model_registry.list_versions()
+    })
+
+@app.route('/models/<version>/preload', methods=['POST'])
+def preload_model(version):
+    """Load a version in the background without serving it"""
+    try:
+        model_registry.preload(version)
+    except KeyError as e:
+        return jsonify({'error': str(e)}), 404
+    return jsonify(model_registry.get(version).to_dict())
+
+@app.route('/models/<version>/activate', methods=['POST'])
+def activate_model(version):
+    """Swap to a version as soon as it is loaded"""
+    try:
+        model_registry.activate(version)
+    except KeyError as e:
+        return jsonify({'error': str(e)}), 404
+    return jsonify(model_registry.get(version).to_dict())
+
+@app.route('/models/rollback', methods=['POST'])
+def rollback_model():
+    """Swap back to the previously active version"""
+    try:
+        model_registry.rollback()
+    except RuntimeError as e:
+        return jsonify({'error': str(e)}), 409
+    return jsonify({'active': model_registry.active_version})
+
 @app.route('/reset', methods=['POST'])
 def reset():
     """Reset word and sentence"""
-    global current_word, sentence, current_letter
-    current_word = ""
-    sentence = ""
-    current_letter = None
+    current_session().reset()
     return jsonify({'status': 'success'})
 
 @app.route('/correct', methods=['POST'])
 def correct():
     """Correct and return sentence"""
-    global sentence, current_word
+    current_word, sentence = current_session().text()
     
     full_text = sentence + current_word
     if full_text.strip():
@@ -277,18 +660,13 @@ def correct():
 @app.route('/add_space', methods=['POST'])
 def add_space():
     """Add space (complete word)"""
-    global current_word, sentence
-    if current_word:
-        sentence += current_word + " "
-        current_word = ""
+    current_session().add_space()
     return jsonify({'status': 'success'})
 
 @app.route('/delete_letter', methods=['POST'])
 def delete_letter():
     """Delete last letter"""
-    global current_word
-    if current_word:
-        current_word = current_word[:-1]
+    current_session().delete_letter()
     return jsonify({'status': 'success'})
 
 if __name__ == '__main__':